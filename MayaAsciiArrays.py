@@ -0,0 +1,174 @@
+# Maya Ascii Arrays
+# Description: Bulk decoding of setAttr numeric payloads into contiguous typed buffers. Uses the
+# standard library array module so it runs inside Maya's python and headless without numpy.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiScene, MayaAsciiArrays
+scene = MayaAsciiScene.parseFile('C:/scenes/cube.ma')
+mesh = scene.findNode('pCubeShape1')
+points = MayaAsciiArrays.gatherSegments([a for a in mesh.attributes if a.leaf == 'vt'],3)
+'''
+
+from array import array
+
+FLOAT = 'f'
+DOUBLE = 'd'
+INT = 'i'
+
+_converters = {FLOAT: float, DOUBLE: float, INT: int}
+_chunkSize = 1 << 20
+_whitespace = frozenset(' \t\r\n')
+_byteWhitespace = frozenset(b' \t\r\n')
+
+
+def decode(payload,typecode=FLOAT):
+	'''
+		Decodes a whitespace separated list of numbers in one call.
+
+		@param[in]: setAttr payload "0.5 -0.5 0.5 ..." as text or a bytes like buffer (AttrRecord.rawPayload)
+		@param[in]: (Optional) array typecode of the result, FLOAT DOUBLE or INT
+		@param[out]: Returns array
+	'''
+	converter = _converters[typecode]
+	length = len(payload)
+	if length <= _chunkSize:
+		if not isinstance(payload,(str,bytes)):
+			# memoryview of a mapped file, only this payload is copied
+			payload = bytes(payload)
+		return array(typecode,map(converter,payload.split()))
+	# large payloads are split a chunk at a time so the tokens of the whole payload never exist at once
+	whitespace = _whitespace if isinstance(payload,str) else _byteWhitespace
+	result = array(typecode)
+	start = 0
+	while start < length:
+		end = min(start+_chunkSize,length)
+		while end < length and payload[end] not in whitespace:
+			end += 1
+		chunk = payload[start:end]
+		if not isinstance(chunk,(str,bytes)):
+			chunk = bytes(chunk)
+		result.extend(map(converter,chunk.split()))
+		start = end
+	return result
+
+
+def allocate(length,typecode=FLOAT):
+	'''
+		Creates a zero filled array.
+
+		@param[in]: Number of elements
+		@param[in]: (Optional) array typecode
+		@param[out]: Returns array
+	'''
+	return array(typecode,bytes(length*array(typecode).itemsize))
+
+
+def gatherSegments(attrs,width,typecode=FLOAT,count=None,component=-1):
+	'''
+		Decodes a multi element attribute that may be written across several setAttr statements
+		ie ".vt[0:999]" followed by ".vt[1000:1499]" into one flat buffer ordered by element index.
+
+		@param[in]: Array of AttrRecords of the same attribute
+		@param[in]: Number of values per element (3 for float3, 2 for float2, 1 for plain arrays)
+		@param[in]: (Optional) array typecode of the result
+		@param[in]: (Optional) Element count (setAttr -s), grows to fit the written indices
+		@param[in]: (Optional) Position of the path component holding the [a:b] range
+		@param[out]: Returns array of count*width values
+	'''
+	segments = []
+	end = 0
+	for attr in attrs:
+		if not attr.hasValue:
+			continue
+		values = decode(attr.rawPayload,typecode)
+		indices = attr.indexRange(component)
+		start = indices[0] if indices is not None else 0
+		segments.append( (start,values) )
+		end = max(end,start*width+len(values))
+	if count is not None:
+		end = max(end,count*width)
+	if len(segments) == 1 and segments[0][0] == 0 and len(segments[0][1]) == end:
+		# single segment covering the whole attribute, no copy needed
+		return segments[0][1]
+	buffer = allocate(end,typecode)
+	for start,values in segments:
+		offset = start*width
+		buffer[offset:offset+len(values)] = values
+	return buffer
+
+
+def concatenate(attrs,typecode=FLOAT):
+	'''
+		Decodes the payloads of setAttr records back to back, in the order they were written.
+
+		@param[in]: Array of AttrRecords
+		@param[in]: (Optional) array typecode of the result
+		@param[out]: Returns array
+	'''
+	buffer = array(typecode)
+	for attr in attrs:
+		if attr.hasValue:
+			buffer.extend(decode(attr.rawPayload,typecode))
+	return buffer
+
+
+def group(buffer,width):
+	'''
+		Views a flat buffer as tuples of width values, the form the OpenMaya array
+		constructors accept ie MFloatPointArray(group(points,3))
+
+		@param[in]: Flat buffer
+		@param[in]: Number of values per element
+		@param[out]: Returns Array of tuples
+	'''
+	values = iter(buffer)
+	return list(zip(*[values]*width))
+
+
+def sparseRows(buffer):
+	'''
+		Splits rows written as {count} {column} {value} {column} {value}... (the skinCluster weightList
+		layout) into compressed sparse rows.
+
+		@param[in]: Flat buffer of the rows
+		@param[out]: Returns INT array of row offsets into columns/values, one more than the number of rows
+		@param[out]: Returns INT array of columns
+		@param[out]: Returns DOUBLE array of values
+	'''
+	offsets = array(INT,[0])
+	columns = array(INT)
+	values = array(DOUBLE)
+	w = 0
+	length = len(buffer)
+	while w < length:
+		count = int(buffer[w])
+		entries = buffer[w+1:w+1+count*2]
+		columns.extend([int(c) for c in entries[0::2]])
+		values.extend([float(v) for v in entries[1::2]])
+		offsets.append(len(columns))
+		w += 1+count*2
+	return offsets,columns,values
+
+
+def denseRows(offsets,columns,values,first,last,columnOrder):
+	'''
+		Expands a range of compressed sparse rows into a row major dense buffer.
+
+		@param[in]: INT array of row offsets
+		@param[in]: INT array of columns
+		@param[in]: DOUBLE array of values
+		@param[in]: First row
+		@param[in]: Row after the last one
+		@param[in]: Array of the columns of the dense layout, values of other columns are left out
+		@param[out]: Returns DOUBLE array of (last-first)*len(columnOrder) values
+	'''
+	width = len(columnOrder)
+	position = dict((columnOrder[c],c) for c in range(width))
+	dense = allocate((last-first)*width,DOUBLE)
+	for row in range(first,last):
+		base = (row-first)*width
+		for e in range(offsets[row],offsets[row+1]):
+			c = position.get(columns[e])
+			if c is not None:
+				dense[base+c] = values[e]
+	return dense
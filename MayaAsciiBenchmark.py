@@ -0,0 +1,428 @@
+# Maya Ascii Benchmark
+# Description: Headless timings of the parser stages on generated data and generated scenes, with
+# the results written as JSON to track them over time. Does not need maya, the stages that look nodes
+# and plugs up run against the MayaAsciiStub modules.
+'''
+Example code:
+python MayaAsciiBenchmark.py --faces 10000 100000 1000000
+python MayaAsciiBenchmark.py --scene C:/scenes/city.ma
+python MayaAsciiBenchmark.py --names 1000 5000
+python MayaAsciiBenchmark.py --normals 10000 100000
+python MayaAsciiBenchmark.py --synthetic --meshes 50 --mesh-faces 20000 --json results.json
+'''
+
+import argparse
+import json
+import re
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+from array import array
+
+if __name__ == '__main__':
+	# run from inside the package folder, import the package instead of the MayaAsciiParser.py module
+	sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from MayaAsciiParser import MayaAsciiStub
+# outside of maya the importer modules load against the stand-in modules
+MayaAsciiStub.install()
+from MayaAsciiParser import MayaAsciiArrays
+from MayaAsciiParser import MayaAsciiChecks
+from MayaAsciiParser import MayaAsciiMesh
+from MayaAsciiParser import MayaAsciiNames
+from MayaAsciiParser import MayaAsciiNodes
+from MayaAsciiParser import MayaAsciiParser
+from MayaAsciiParser import MayaAsciiScene
+from MayaAsciiParser import MayaAsciiTokenizer
+
+
+def gridTopology(faceCount):
+	'''
+		Builds the edge array and polyFaces payload of a quad strip grid.
+
+		@param[in]: Number of faces
+		@param[out]: Returns flat edge array of (vertexA vertexB smooth) triples
+		@param[out]: Returns polyFaces payload with one "f" and one "mu" record per face
+	'''
+	# strip of 2 rows of vertices, vertex i on top and i+columns below
+	columns = faceCount+1
+	edges = MayaAsciiArrays.allocate(0,MayaAsciiArrays.INT)
+	for c in range(columns):
+		edges.extend((c,c+columns,0))					# vertical edge c
+	for c in range(faceCount):
+		edges.extend((c,c+1,0))							# top edge
+		edges.extend((c+columns,c+columns+1,0))			# bottom edge
+	records = []
+	for c in range(faceCount):
+		top = columns+c*2
+		bottom = top+1
+		records.append("f 4 {0} {1} {2} {3}".format(top,c+1,-bottom-1,-c-1))
+		records.append("mu 0 4 {0} {1} {2} {3}".format(c,c+1,c+columns+1,c+columns))
+	return edges,"\n".join(records)
+
+
+def _writeValues(output,values,perLine=24):
+	'''
+		Writes a setAttr payload a line at a time, the way maya wraps long value lists.
+	'''
+	for i in range(0,len(values),perLine):
+		output.write("\t\t"+" ".join(values[i:i+perLine])+"\n")
+
+
+def generateScene(asciipath,meshes=10,faces=1000,uvSets=1,colorSets=0,holes=0,influences=0,shadingGroups=1,connections=0):
+	'''
+		Writes a synthetic maya ascii scene of quad strip meshes.
+
+		@param[in]: File Path of the maya.ma file to write
+		@param[in]: (Optional) Number of meshes
+		@param[in]: (Optional) Faces per mesh
+		@param[in]: (Optional) uv sets per mesh
+		@param[in]: (Optional) Color sets per mesh
+		@param[in]: (Optional) Faces with a triangle hole per mesh
+		@param[in]: (Optional) Joints, every mesh gets a skinCluster over all of them when not 0
+		@param[in]: (Optional) Shading groups, the meshes are assigned to them in turn
+		@param[in]: (Optional) Extra connections between the mesh transforms
+		@param[out]: Returns the size of the file in bytes
+	'''
+	columns = faces+1
+	vertCount = columns*2+holes*3
+	edges,payload = gridTopology(faces)
+	edges = list(edges)
+	records = payload.split("\n")
+	with open(asciipath,"w") as output:
+		output.write("//Maya ASCII 2025 scene\n//Name: {0}\nrequires maya \"2025\";\n".format(os.path.basename(asciipath)))
+		output.write("currentUnit -l centimeter -a degree -t film;\n")
+		for j in range(influences):
+			parent = ' -p "joint{0}"'.format(j-1) if j > 0 else ""
+			output.write('createNode joint -n "joint{0}"{1};\n\tsetAttr ".t" -type "double3" 0 1 0 ;\n'.format(j,parent))
+		for g in range(shadingGroups):
+			output.write('createNode lambert -n "lambert{0}";\n\tsetAttr ".c" -type "float3" 0.5 0.5 0.5 ;\n'.format(g+2))
+			output.write('createNode shadingEngine -n "lambert{0}SG";\n\tsetAttr ".ihi" 0;\n\tsetAttr ".ro" yes;\n'.format(g+2))
+		for m in range(meshes):
+			output.write('createNode transform -n "mesh{0}";\n\tsetAttr ".t" -type "double3" {0} 0 0 ;\n'.format(m))
+			output.write('createNode mesh -n "meshShape{0}" -p "mesh{0}";\n\tsetAttr -k off ".v";\n'.format(m))
+			points = []
+			for v in range(vertCount):
+				points.append("{0} {1} 0".format(v%columns,v//columns))
+			uvs = []
+			for v in range(vertCount):
+				uvs.append("{0:.4f} {1:.4f}".format((v%columns)/float(columns),v//columns/2.0))
+			for u in range(uvSets):
+				output.write('\tsetAttr ".uvst[{0}].uvsn" -type "string" "{1}";\n'.format(u,"map1" if u == 0 else "uvSet{0}".format(u)))
+				output.write('\tsetAttr -s {0} ".uvst[{1}].uvsp[0:{2}]" -type "float2"\n'.format(vertCount,u,vertCount-1))
+				_writeValues(output,uvs,12)
+				output.write("\t\t;\n")
+			if uvSets > 0:
+				output.write('\tsetAttr ".cuvs" -type "string" "map1";\n')
+			for c in range(colorSets):
+				output.write('\tsetAttr ".clst[{0}].clsn" -type "string" "colorSet{0}";\n'.format(c))
+				output.write('\tsetAttr -s {0} ".clst[{1}].clsp[0:{2}]"\n'.format(vertCount,c,vertCount-1))
+				_writeValues(output,["{0:.3f} 0.5 0.25 1".format((v%7)/7.0) for v in range(vertCount)],6)
+				output.write("\t\t;\n")
+			output.write('\tsetAttr -s {0} ".vt[0:{1}]"\n'.format(vertCount,vertCount-1))
+			_writeValues(output,points,8)
+			output.write("\t\t;\n")
+			meshEdges = list(edges)
+			for h in range(holes):
+				first = columns*2+h*3
+				meshEdges += [first,first+1,0, first+1,first+2,0, first+2,first,0]
+			edgeCount = len(meshEdges)//3
+			output.write('\tsetAttr -s {0} ".ed[0:{1}]"\n'.format(edgeCount,edgeCount-1))
+			_writeValues(output,[str(e) for e in meshEdges],24)
+			output.write("\t\t;\n")
+			output.write('\tsetAttr -s {0} ".fc[0:{1}]" -type "polyFaces"\n'.format(faces,faces-1))
+			firstHoleEdge = len(edges)//3
+			for f in range(faces):
+				output.write("\t\t"+records[f*2]+"\n")
+				uvIds = records[f*2+1][len("mu 0 4 "):]
+				for u in range(uvSets):
+					output.write("\t\tmu {0} 4 {1}\n".format(u,uvIds))
+				for c in range(colorSets):
+					output.write("\t\tmc {0} 4 {1}\n".format(c,uvIds))
+				if f < holes:
+					e = firstHoleEdge+f*3
+					output.write("\t\th 3 {0} {1} {2}\n".format(e,e+1,e+2))
+			output.write("\t\t;\n")
+			if influences > 0:
+				output.write('createNode skinCluster -n "skinCluster{0}";\n'.format(m))
+				output.write('\tsetAttr -s {0} ".wl";\n\tsetAttr ".wl[0:{1}].w"\n'.format(vertCount,vertCount-1))
+				rows = []
+				for v in range(vertCount):
+					first = v%influences
+					second = (v+1)%influences
+					if first == second:
+						rows.append("1 {0} 1".format(first))
+					else:
+						rows.append("2 {0} 0.75 {1} 0.25".format(first,second))
+				_writeValues(output,rows,4)
+				output.write("\t\t;\n")
+		for m in range(meshes):
+			if shadingGroups > 0:
+				output.write('connectAttr "meshShape{0}.iog" "lambert{1}SG.dsm" -na;\n'.format(m,m%shadingGroups+2))
+			for j in range(influences):
+				output.write('connectAttr "joint{0}.wm" "skinCluster{1}.ma[{0}]";\n'.format(j,m))
+			if influences > 0:
+				output.write('connectAttr "skinCluster{0}.og[0]" "meshShape{0}.i";\n'.format(m))
+		for g in range(shadingGroups):
+			output.write('connectAttr "lambert{0}.oc" "lambert{0}SG.ss";\n'.format(g+2))
+		for c in range(connections):
+			output.write('connectAttr "mesh{0}.tx" "mesh{1}.ty";\n'.format(c%meshes,(c+1)%meshes))
+	return os.path.getsize(asciipath)
+
+
+def benchmarkStages(asciipath,workers=0):
+	'''
+		Times the stages of an import that run without maya on a scene: tokenizing, building the
+		scene model, sorting the nodes (filterNodes), the closure of half the meshes (an import with roots),
+		decoding the polyFaces records, decoding the meshes, decoding the skin weights, renaming the
+		connections and queuing and making them with a ConnectionBatch. With out maya the nodes and
+		plugs come from MayaAsciiStub, the lookups and bookkeeping are timed and not maya's own work.
+
+		@param[in]: File Path of maya.ma file
+		@param[in]: (Optional) Processes decoding the meshes
+		@param[out]: Returns Dictionary of stage name -> seconds
+	'''
+	stages = dict()
+	start = time.perf_counter()
+	statementCount = sum(1 for statement in MayaAsciiTokenizer.mapFile(asciipath))
+	stages['tokenize'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	scene = MayaAsciiScene.parseFile(asciipath)
+	stages['parse'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	MayaAsciiParser.MayaAsciiParser().filterNodes(scene)
+	stages['filter'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	meshes = [n for n in scene.nodes if n.nodeType == 'mesh']
+	scene.closure([m.name for m in meshes[:max(1,int(len(meshes)/2))]])
+	stages['closure'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	for node in meshes:
+		edges = MayaAsciiArrays.gatherSegments([a for a in node.attributes if a.leaf in ('ed','edge')],3,MayaAsciiArrays.INT)
+		MayaAsciiMesh.decodePolyFaces([a.rawPayload for a in node.attributes if a.leaf in ('fc','face')],edges)
+	stages['topology'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	MayaAsciiMesh.decodeMeshes(meshes,workers)
+	stages['meshDecode'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	for node in scene.nodes:
+		if node.nodeType == 'skinCluster':
+			weights = MayaAsciiArrays.concatenate([a for a in node.attributes if a.root in ('wl','weightList') and a.hasValue],MayaAsciiArrays.DOUBLE)
+			MayaAsciiArrays.sparseRows(weights)
+	stages['skinWeights'] = time.perf_counter()-start
+
+	start = time.perf_counter()
+	renamed = dict((n.name,n.name+"1") for n in scene.nodes)
+	resolver = MayaAsciiNames.NameResolver(renamed)
+	for connection in scene.connections:
+		resolver.command(connection.command())
+	stages['rename'] = time.perf_counter()-start
+
+	if MayaAsciiStub.install():
+		MayaAsciiStub.register(scene)
+	start = time.perf_counter()
+	connections = MayaAsciiNodes.ConnectionBatch()
+	for connection in scene.connections:
+		connections.add(connection.source,connection.destination,connection.nextAvailable,connection.command())
+	connections.doIt()
+	stages['connections'] = time.perf_counter()-start
+
+	for stage,seconds in stages.items():
+		print("stage {0:>12} {1:>9.3f}s".format(stage,seconds))
+	print("{0} statements {1} nodes {2} connections {3} failed".format(statementCount,len(scene.nodes),len(scene.connections),len(connections.failures)))
+	return stages
+
+
+def benchmarkTopology(faceCounts,segment=500):
+	'''
+		Times decodePolyFaces on grids of increasing size. The payload is split in setAttr sized
+		segments like maya writes them, the time per face should stay flat as the grid grows.
+
+		@param[in]: Array of face counts
+		@param[in]: (Optional) Faces per setAttr segment
+		@param[out]: Returns Array of (faces, seconds) tuples
+	'''
+	results = []
+	for faceCount in faceCounts:
+		edges,payload = gridTopology(faceCount)
+		lines = payload.split("\n")
+		step = segment*2
+		payloads = ["\n".join(lines[i:i+step]) for i in range(0,len(lines),step)]
+		start = time.perf_counter()
+		topology = MayaAsciiMesh.decodePolyFaces(payloads,edges,faceCount)
+		elapsed = time.perf_counter()-start
+		if topology.faceCount != faceCount:
+			raise Exception("decoded {0} faces expected {1}".format(topology.faceCount,faceCount))
+		results.append( (faceCount,elapsed) )
+		print("topology {0:>9} faces {1:>9.3f}s {2:>9.1f} ns/face".format(faceCount,elapsed,elapsed*1e9/faceCount))
+	return results
+
+
+def benchmarkRead(asciipath):
+	'''
+		Compares the line reader and the memory mapped reader on a scene, parsing the scene and
+		decoding every mesh. Memory is the python heap peak, mapped pages are not counted.
+
+		@param[in]: File Path of maya.ma file
+		@param[out]: Returns Array of (reader, seconds, peak bytes) tuples
+	'''
+	results = []
+	readers = (("lines",MayaAsciiTokenizer.tokenizeFile),("mmap",MayaAsciiTokenizer.mapFile))
+	for readerName,reader in readers:
+		tracemalloc.start()
+		start = time.perf_counter()
+		scene = MayaAsciiScene.parseStatements(reader(asciipath))
+		for node in scene.nodes:
+			if node.nodeType == 'mesh':
+				MayaAsciiMesh.decodeMesh(node)
+		elapsed = time.perf_counter()-start
+		current,peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		del scene
+		results.append( (readerName,elapsed,peak) )
+		print("read {0:>6} {1:>9.3f}s {2:>9.1f} MB peak".format(readerName,elapsed,peak/1048576.0))
+	print("file size {0:.1f} MB".format(os.path.getsize(asciipath)/1048576.0))
+	return results
+
+
+def benchmarkNormals(faceCounts):
+	'''
+		Times pairing face-vertex normals with their face and vertex ids on grids where every third
+		normal is left for maya to compute, against MayaAsciiChecks.referenceNormals. The correctness
+		checks on holes and split normals are in MayaAsciiChecks.
+
+		@param[in]: Array of face counts
+		@param[out]: Returns Array of (faces, reference seconds, bulk seconds) tuples
+	'''
+	results = []
+	for faceCount in faceCounts:
+		edges,payload = gridTopology(faceCount)
+		topology = MayaAsciiMesh.decodePolyFaces([payload],edges,faceCount)
+		normals = MayaAsciiArrays.allocate(len(topology.faceConnects)*3)
+		for i in range(len(topology.faceConnects)):
+			normals[i*3:i*3+3] = array(MayaAsciiArrays.FLOAT,(1e20,1e20,1e20) if i%3 == 0 else (0,i%2,1))
+		start = time.perf_counter()
+		expected = MayaAsciiChecks.referenceNormals(normals,topology)
+		reference = time.perf_counter()-start
+		start = time.perf_counter()
+		faceNormals,faces,vertices = MayaAsciiMesh.faceVertexNormals(normals,topology)
+		bulk = time.perf_counter()-start
+		paired = list(zip(faces,vertices,MayaAsciiArrays.group(faceNormals,3)))
+		if paired != expected:
+			raise Exception("faceVertexNormals paired the normals of {0} faces differently".format(faceCount))
+		results.append( (faceCount,reference,bulk) )
+		print("normals {0:>9} faces {1:>9.3f}s reference {2:>9.3f}s bulk".format(faceCount,reference,bulk))
+	return results
+
+
+def retargetLinear(renamed,strings):
+	'''
+		The plug renaming the importer did before NameResolver, kept as the reference for
+		benchmarkRename. Walks the whole dictionary for every part of every plug.
+	'''
+	strings = strings.split(" ")
+	for a in range(len(strings)):
+		if '"' in strings[a] :
+			quoteds = re.findall('"([^"]*)"', strings[a])
+			quoteds = quoteds[0].split(".")
+			for q in range(len(quoteds)):
+				for i, key in enumerate(renamed):
+					if renamed[key] != key and  key == quoteds[q]:
+						quoteds[q] = renamed[key]
+			strings[a] = '"'+ ".".join(quoteds) + '"'
+		else:
+			subattributes = strings[a].split(".")
+			for q in range(len(subattributes)):
+				for i, key in enumerate(renamed):
+					if renamed[key] != key and  key == subattributes[q]:
+						subattributes[q] = renamed[key]
+			strings[a] = ".".join(subattributes)
+	return " ".join(strings)
+
+
+def benchmarkRename(nodeCounts):
+	'''
+		Times rewriting the connections of a scene where every other node was renamed, with the
+		dictionary walk and with NameResolver. Both must give the same connections.
+
+		@param[in]: Array of node counts, the scene has two connections per node
+		@param[out]: Returns Array of (nodes, linear seconds, resolver seconds) tuples
+	'''
+	results = []
+	for nodeCount in nodeCounts:
+		renamed = dict()
+		for n in range(nodeCount):
+			name = "node{0}".format(n)
+			renamed[name] = name+"_1" if n%2 else name
+		commands = []
+		for n in range(nodeCount):
+			commands.append("node{0}.worldMatrix[0] node{1}.inputMatrix".format(n,(n+1)%nodeCount))
+			commands.append('"node{0}.message" "node{1}.target[0].targetParentMatrix" -na'.format(n,(n+7)%nodeCount))
+		start = time.perf_counter()
+		expected = [retargetLinear(renamed,c) for c in commands]
+		linear = time.perf_counter()-start
+		start = time.perf_counter()
+		resolver = MayaAsciiNames.NameResolver(renamed)
+		rewritten = [resolver.command(c) for c in commands]
+		resolved = time.perf_counter()-start
+		if rewritten != expected:
+			raise Exception("NameResolver rewrote the connections differently")
+		results.append( (nodeCount,linear,resolved) )
+		print("rename {0:>9} nodes {1:>9.3f}s linear {2:>9.3f}s resolver".format(nodeCount,linear,resolved))
+	return results
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description="Maya Ascii Parser benchmarks")
+	parser.add_argument("--faces",type=int,nargs="*",default=[],help="face counts of the generated grids ie 10000 100000 1000000")
+	parser.add_argument("--scene",help="maya ascii file to compare the readers on")
+	parser.add_argument("--normals",type=int,nargs="*",default=[],help="face counts of the grids to pair normals on")
+	parser.add_argument("--names",type=int,nargs="*",default=[],help="node counts of the renamed connection scenes")
+	parser.add_argument("--synthetic",action="store_true",help="time the import stages on a generated scene")
+	parser.add_argument("--meshes",type=int,default=10,help="synthetic scene meshes")
+	parser.add_argument("--mesh-faces",type=int,default=10000,help="synthetic scene faces per mesh")
+	parser.add_argument("--uv-sets",type=int,default=2,help="synthetic scene uv sets per mesh")
+	parser.add_argument("--color-sets",type=int,default=1,help="synthetic scene color sets per mesh")
+	parser.add_argument("--holes",type=int,default=10,help="synthetic scene faces with holes per mesh")
+	parser.add_argument("--influences",type=int,default=8,help="synthetic scene joints skinning every mesh")
+	parser.add_argument("--shading-groups",type=int,default=4,help="synthetic scene shading groups")
+	parser.add_argument("--connections",type=int,default=1000,help="synthetic scene extra connections")
+	parser.add_argument("--workers",type=int,default=0,help="processes decoding the synthetic scene meshes")
+	parser.add_argument("--keep",help="write the synthetic scene to this path instead of a temporary file")
+	parser.add_argument("--json",help="write the results to this file")
+	args = parser.parse_args()
+	results = {'python':sys.version.split()[0],'time':time.strftime("%Y-%m-%dT%H:%M:%S")}
+	if args.faces:
+		results['topology'] = [{'faces':f,'seconds':t} for f,t in benchmarkTopology(args.faces)]
+	if args.scene:
+		results['read'] = [{'reader':r,'seconds':t,'peak':p} for r,t,p in benchmarkRead(args.scene)]
+	if args.normals:
+		results['normals'] = [{'faces':f,'reference':r,'bulk':b} for f,r,b in benchmarkNormals(args.normals)]
+	if args.names:
+		results['rename'] = [{'nodes':n,'linear':l,'resolver':r} for n,l,r in benchmarkRename(args.names)]
+	if args.synthetic:
+		scale = {'meshes':args.meshes,'faces':args.mesh_faces,'uvSets':args.uv_sets,'colorSets':args.color_sets,
+				'holes':args.holes,'influences':args.influences,'shadingGroups':args.shading_groups,'connections':args.connections}
+		asciipath = args.keep
+		if asciipath is None:
+			handle,asciipath = tempfile.mkstemp(suffix='.ma')
+			os.close(handle)
+		try:
+			start = time.perf_counter()
+			size = generateScene(asciipath,**scale)
+			print("generated {0:.1f} MB in {1:.3f}s".format(size/1048576.0,time.perf_counter()-start))
+			results['synthetic'] = {'scale':scale,'fileSize':size,'workers':args.workers,'stages':benchmarkStages(asciipath,args.workers)}
+		finally:
+			if args.keep is None:
+				os.remove(asciipath)
+	if args.json:
+		with open(args.json,"w") as output:
+			json.dump(results,output,indent=1)
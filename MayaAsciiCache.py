@@ -0,0 +1,270 @@
+# Maya Ascii Cache
+# Description: On disk cache of parsed scenes. The scene model, the decoded mesh arrays and skin
+# weights of a file are pickled once, later imports of the same file skip the text parsing.
+# Entries are keyed by path, modification time, size and content hash and evicted least
+# recently used first once the cache grows over its size limit. Does not import maya.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiCache, MayaAsciiScene
+cache = MayaAsciiCache.MayaAsciiCache()
+parsed = cache.load('C:/scenes/cube.ma')
+if parsed is None:
+	parsed = MayaAsciiCache.ParsedScene(MayaAsciiScene.parseFile('C:/scenes/cube.ma'))
+	parsed.decode()
+	cache.store('C:/scenes/cube.ma',parsed)
+print(len(parsed.scene.nodes))
+
+# the cache directory and size limit can be set with environment variables
+# MAYA_ASCII_PARSER_CACHE=D:/cache  MAYA_ASCII_PARSER_CACHE_SIZE=4096 (MB)
+'''
+
+import os
+import mmap
+import pickle
+import hashlib
+import tempfile
+from MayaAsciiParser import MayaAsciiScene
+from MayaAsciiParser import MayaAsciiArrays
+from MayaAsciiParser import MayaAsciiMesh
+
+# bump when the pickled layout changes, older entries are ignored
+CACHE_VERSION = 5
+CACHE_EXTENSION = '.mapc'
+DEFAULT_SIZE = 2048 # MB
+
+cacheDirEnvironment = 'MAYA_ASCII_PARSER_CACHE'
+cacheSizeEnvironment = 'MAYA_ASCII_PARSER_CACHE_SIZE'
+
+
+def defaultCacheDir():
+	'''
+		Cache directory from the environment, or the user's local cache folder.
+
+		@param[out]: Returns a directory path
+	'''
+	folder = os.environ.get(cacheDirEnvironment)
+	if folder:
+		return folder
+	if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+		return os.path.join(os.environ['LOCALAPPDATA'],'MayaAsciiParser','cache')
+	return os.path.join(os.path.expanduser('~'),'.cache','MayaAsciiParser')
+
+
+def contentHash(asciipath):
+	'''
+		sha1 of the file content, read through a memory map.
+
+		@param[in]: File Path of maya.ma file
+		@param[out]: Returns hex digest string
+	'''
+	digest = hashlib.sha1()
+	with open(asciipath,"rb") as handle:
+		if os.fstat(handle.fileno()).st_size > 0:
+			with mmap.mmap(handle.fileno(),0,access=mmap.ACCESS_READ) as buffer:
+				digest.update(buffer)
+	return digest.hexdigest()
+
+
+class ParsedScene():
+	'''
+		A scene model with the decoded arrays of its meshes and skin weights. When pickled the setAttr
+		records that were decoded are left out of the nodes, the arrays replace them.
+
+		meshes    node index -> MeshData
+		weights   node index -> array of skinCluster weightList values
+	'''
+
+	def __init__(self,scene):
+		self.scene = scene
+		self.meshes = dict()
+		self.weights = dict()
+		self.fromCache = False
+		self.buildIndex()
+
+	def buildIndex(self):
+		self.meshesByNode = dict((id(self.scene.nodes[i]),data) for i,data in self.meshes.items())
+		self.weightsByNode = dict((id(self.scene.nodes[i]),data) for i,data in self.weights.items())
+
+	def decode(self,workers=0,nodes=None):
+		'''
+			Decodes every mesh and skinCluster of the scene, or of some of its nodes.
+
+			@param[in]: (Optional) Number of processes decoding the meshes in parallel
+			@param[in]: (Optional) Array of NodeRecords to decode ie SceneModel.closure(), defaults to every node
+		'''
+		wanted = None if nodes is None else set(id(n) for n in nodes)
+		candidates = [(i,node) for i,node in enumerate(self.scene.nodes) if wanted is None or id(node) in wanted]
+		meshIndices = [i for i,node in candidates if node.nodeType == 'mesh']
+		decoded = MayaAsciiMesh.decodeMeshes([self.scene.nodes[i] for i in meshIndices],workers)
+		self.meshes = dict(zip(meshIndices,decoded))
+		self.weights = dict()
+		for i,node in candidates:
+			if node.nodeType == 'skinCluster':
+				self.weights[i] = MayaAsciiArrays.concatenate(weightAttributes(node),MayaAsciiArrays.DOUBLE)
+		self.buildIndex()
+
+	def meshData(self,node):
+		'''
+			@param[in]: NodeRecord of a mesh
+			@param[out]: Returns MeshData or None when the mesh was not decoded
+		'''
+		return self.meshesByNode.get(id(node))
+
+	def skinWeights(self,node):
+		'''
+			@param[in]: NodeRecord of a skinCluster
+			@param[out]: Returns array of weightList values or None when the skin was not decoded
+		'''
+		return self.weightsByNode.get(id(node))
+
+	def __getstate__(self):
+		nodes = []
+		for i,node in enumerate(self.scene.nodes):
+			if i in self.meshes or i in self.weights:
+				# MeshData holds every attribute of a mesh, skins only lose their weights
+				stripped = MayaAsciiScene.NodeRecord(node.nodeType,node.name,node.parent,node.flags)
+				stripped.addAttributes = node.addAttributes
+				if i in self.weights:
+					weights = set(id(a) for a in weightAttributes(node))
+					stripped.attributes = [a for a in node.attributes if id(a) not in weights]
+				node = stripped
+			nodes.append(node)
+		scene = MayaAsciiScene.SceneModel()
+		scene.nodes = nodes
+		scene.connections = self.scene.connections
+		scene.requires = self.scene.requires
+		scene.fileInfo = self.scene.fileInfo
+		return (CACHE_VERSION,scene,self.meshes,self.weights)
+
+	def __setstate__(self,state):
+		version,self.scene,self.meshes,self.weights = state
+		if version != CACHE_VERSION:
+			raise ValueError("parse cache version {0} expected {1}".format(version,CACHE_VERSION))
+		self.fromCache = True
+		self.buildIndex()
+
+
+def weightAttributes(node):
+	'''
+		@param[in]: NodeRecord of a skinCluster
+		@param[out]: Returns Array of the weightList setAttr records holding values
+	'''
+	return [a for a in node.attributes if a.root in ('wl','weightList') and a.hasValue]
+
+
+class MayaAsciiCache():
+	'''
+		Directory of pickled ParsedScenes. Loading an entry refreshes its modification time, which is
+		the recency used for eviction.
+	'''
+
+	def __init__(self,folder=None,maxSize=None):
+		'''
+			@param[in]: (Optional) Cache directory, see defaultCacheDir()
+			@param[in]: (Optional) Size limit in MB, defaults to MAYA_ASCII_PARSER_CACHE_SIZE or 2048
+		'''
+		self.folder = folder or defaultCacheDir()
+		if maxSize is None:
+			maxSize = int(os.environ.get(cacheSizeEnvironment,DEFAULT_SIZE))
+		self.maxSize = maxSize*1024*1024
+
+	def key(self,asciipath):
+		'''
+			@param[in]: File Path of maya.ma file
+			@param[out]: Returns the cache key of the current content of the file
+		'''
+		asciipath = os.path.normcase(os.path.abspath(asciipath))
+		stat = os.stat(asciipath)
+		fields = "{0}|{1}|{2}|{3}".format(asciipath,stat.st_mtime_ns,stat.st_size,contentHash(asciipath))
+		return hashlib.sha1(fields.encode('utf-8')).hexdigest()
+
+	def entryPath(self,key):
+		return os.path.join(self.folder,key+CACHE_EXTENSION)
+
+	def load(self,asciipath,key=None):
+		'''
+			@param[in]: File Path of maya.ma file
+			@param[in]: (Optional) Key returned by key(), saves hashing the file again
+			@param[out]: Returns ParsedScene or None on a cache miss
+		'''
+		entry = self.entryPath(key or self.key(asciipath))
+		if not os.path.isfile(entry):
+			return None
+		try:
+			with open(entry,"rb") as handle:
+				parsed = pickle.load(handle)
+		except Exception as e:
+			# stale layout or a partial write, drop the entry
+			print("Discarding parse cache entry ",entry,e)
+			self.remove(entry)
+			return None
+		os.utime(entry,None)
+		return parsed
+
+	def store(self,asciipath,parsed,key=None):
+		'''
+			Writes a ParsedScene, then evicts the least recently used entries over the size limit.
+
+			@param[in]: File Path of maya.ma file
+			@param[in]: ParsedScene
+			@param[in]: (Optional) Key returned by key(), saves hashing the file again
+			@param[out]: Returns the path of the entry
+		'''
+		if not os.path.isdir(self.folder):
+			os.makedirs(self.folder)
+		entry = self.entryPath(key or self.key(asciipath))
+		# write next to the entry and swap so readers never see a partial file
+		handle,temporary = tempfile.mkstemp(suffix='.tmp',dir=self.folder)
+		try:
+			with os.fdopen(handle,"wb") as output:
+				pickle.dump(parsed,output,pickle.HIGHEST_PROTOCOL)
+			os.replace(temporary,entry)
+		except:
+			self.remove(temporary)
+			raise
+		self.evict()
+		return entry
+
+	def entries(self):
+		'''
+			@param[out]: Returns Array of (modification time, size, path) of every entry, oldest first
+		'''
+		if not os.path.isdir(self.folder):
+			return []
+		results = []
+		for filename in os.listdir(self.folder):
+			if not filename.endswith(CACHE_EXTENSION):
+				continue
+			path = os.path.join(self.folder,filename)
+			try:
+				stat = os.stat(path)
+			except OSError:
+				continue
+			results.append( (stat.st_mtime,stat.st_size,path) )
+		results.sort()
+		return results
+
+	def evict(self):
+		'''
+			Removes the least recently used entries until the cache fits its size limit.
+		'''
+		entries = self.entries()
+		total = sum(e[1] for e in entries)
+		for modified,size,path in entries:
+			if total <= self.maxSize:
+				break
+			self.remove(path)
+			total -= size
+
+	def clear(self):
+		'''
+			Removes every entry of the cache.
+		'''
+		for modified,size,path in self.entries():
+			self.remove(path)
+
+	def remove(self,path):
+		try:
+			os.remove(path)
+		except OSError:
+			pass
@@ -0,0 +1,273 @@
+# Maya Ascii Checks
+# Description: Headless correctness checks of the decoders on the scenes of the fixtures folder,
+# against hand checked expectations and the plain reference implementations. Stops at the first
+# mismatch and exits non-zero when run as a script. Does not need maya.
+'''
+Example code:
+python MayaAsciiChecks.py
+python MayaAsciiChecks.py --fixtures D:/scenes/regressions
+
+from MayaAsciiParser import MayaAsciiChecks
+MayaAsciiChecks.checkNormals('C:/scenes/hero.ma')
+'''
+
+import argparse
+import glob
+import sys
+import os
+import tracemalloc
+
+if __name__ == '__main__':
+	# run from inside the package folder, import the package instead of the MayaAsciiParser.py module
+	sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from MayaAsciiParser import MayaAsciiArrays
+from MayaAsciiParser import MayaAsciiMesh
+from MayaAsciiParser import MayaAsciiProfiler
+from MayaAsciiParser import MayaAsciiScene
+from MayaAsciiParser import MayaAsciiShading
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)),'fixtures')
+TOLERANCE = 1e-6
+
+_up = (0.0,0.0,1.0)
+_slant = (0.0,0.70710677,0.70710677)
+_side = (0.6,0.0,0.8)
+# mesh name -> (face, vertex, normal) of every face-vertex normal set in the file, in face-vertex order
+EXPECTED_NORMALS = {
+	# quad with a triangle hole, the hole normals follow the border, split normals on the shared edge
+	'holePlaneShape': [(0,0,_up),(0,1,_up),(0,2,_up),(0,3,_up),(0,4,_up),(0,6,_up),
+						(1,1,_side),(1,7,_side),(1,2,_side)],
+	# hard edged cube, every corner has one normal per face, normals written in 3 segments
+	'hardCubeShape': [(face,vertex,normal) for face,vertices,normal in (
+						(0,(0,1,3,2),(0.0,0.0,1.0)),(1,(2,3,5,4),(0.0,1.0,0.0)),(2,(4,5,7,6),(0.0,0.0,-1.0)),
+						(3,(6,7,1,0),(0.0,-1.0,0.0)),(4,(1,7,5,3),(1.0,0.0,0.0)),(5,(6,0,2,4),(-1.0,0.0,0.0)))
+						for vertex in vertices],
+	# first face left to maya, the others mix set and unset normals
+	'stripShape': [(1,1,_up),(1,2,_slant),(1,6,_slant),(1,5,_up),(2,2,_up),(2,7,_up),(2,6,_up)],
+}
+
+
+def check(condition,message):
+	'''
+		@param[in]: Condition that must hold
+		@param[in]: Message of the failure
+	'''
+	if not condition:
+		raise AssertionError(message)
+
+
+def referenceNormals(normals,topology):
+	'''
+		Pairs the normals with their face-vertices a face-vertex at a time, walking the faces and their
+		holes. Reference for MayaAsciiMesh.faceVertexNormals.
+
+		@param[in]: Flat buffer of 3 floats per face-vertex normal
+		@param[in]: MeshTopology
+		@param[out]: Returns Array of (face, vertex, normal) of the normals maya does not compute
+	'''
+	pairs = []
+	normalIndex = 0
+	offset = 0
+	holeOffset = 0
+	for face in range(topology.faceCount):
+		vertices = list(topology.faceConnects[offset:offset+topology.faceCounts[face]])
+		offset += topology.faceCounts[face]
+		for h in range(topology.holeCount):
+			if topology.holeFaces[h] == face:
+				vertices += list(topology.holeConnects[holeOffset:holeOffset+topology.holeCounts[h]])
+				holeOffset += topology.holeCounts[h]
+		for vertex in vertices:
+			if normalIndex*3 >= len(normals):
+				return pairs
+			normal = tuple(normals[normalIndex*3:normalIndex*3+3])
+			normalIndex += 1
+			if max(abs(n) for n in normal) < 1e19:
+				pairs.append( (face,vertex,normal) )
+	return pairs
+
+
+def samePairs(pairs,expected):
+	'''
+		@param[in]: Array of (face, vertex, normal)
+		@param[in]: Array of (face, vertex, normal)
+		@param[out]: Returns True when the faces and vertices are equal and the normals within TOLERANCE
+	'''
+	if len(pairs) != len(expected):
+		return False
+	for (face,vertex,normal),(expectedFace,expectedVertex,expectedNormal) in zip(pairs,expected):
+		if face != expectedFace or vertex != expectedVertex:
+			return False
+		if max(abs(a-b) for a,b in zip(normal,expectedNormal)) > TOLERANCE:
+			return False
+	return True
+
+
+def checkNormals(asciipath,expected=None):
+	'''
+		Decodes every mesh of a scene and checks the face-vertex normals MayaAsciiMesh.faceVertexNormals
+		pairs against referenceNormals, and against the expected pairs of the meshes listed.
+
+		@param[in]: File path of a maya ascii scene
+		@param[in]: (Optional) Dictionary of mesh names to expected (face, vertex, normal) pairs
+		@param[out]: Returns the number of meshes checked
+	'''
+	expected = expected if expected is not None else dict()
+	scene = MayaAsciiScene.parseFile(asciipath)
+	meshes = 0
+	for node in scene.nodes:
+		if node.nodeType != 'mesh':
+			continue
+		data = MayaAsciiMesh.decodeMesh(node)
+		faceNormals,faces,vertices = MayaAsciiMesh.faceVertexNormals(data.normals,data.topology)
+		check(len(faceNormals) == len(faces)*3 and len(faces) == len(vertices),
+			"{0} {1}: {2} normals for {3} faces and {4} vertices".format(asciipath,node.name,len(faceNormals)//3,len(faces),len(vertices)))
+		pairs = list(zip(faces,vertices,MayaAsciiArrays.group(faceNormals,3)))
+		check(samePairs(pairs,referenceNormals(data.normals,data.topology)),
+			"{0} {1}: normals paired differently than the reference".format(asciipath,node.name))
+		if node.name in expected:
+			check(samePairs(pairs,expected[node.name]),
+				"{0} {1}: normals {2} expected {3}".format(asciipath,node.name,pairs,expected[node.name]))
+		meshes += 1
+	return meshes
+
+
+def checkTweaks():
+	'''
+		Checks MayaAsciiMesh.foldTweaks folds the tweaks of existing vertices and gives back, whole,
+		the ones it can not fold.
+
+		@param[out]: Returns the number of tweak records checked
+	'''
+	points = MayaAsciiArrays.allocate(6)
+	tweaks = [MayaAsciiScene.AttrRecord('.pt[0:1]',2,'float3',payload='1 1 1 2 2 2'),
+			MayaAsciiScene.AttrRecord('.pt[0].px',payload='5'),
+			MayaAsciiScene.AttrRecord('.pt[1:3]',3,'float3',payload='1 1 1 1 1 1 1 1 1'),
+			MayaAsciiScene.AttrRecord('.pt[1]',1,'float3',payload='1 1')]
+	left = MayaAsciiMesh.foldTweaks(points,tweaks)
+	check(list(points) == [6.0,1.0,1.0,2.0,2.0,2.0],"tweaks folded into {0}".format(list(points)))
+	check(left == tweaks[2:],"tweaks left {0}".format(left))
+	# no vertices written, every tweak is left for mel
+	check(MayaAsciiMesh.foldTweaks(MayaAsciiArrays.allocate(0),tweaks[:1]) == tweaks[:1],"tweaks of a mesh with out vertices were dropped")
+	return len(tweaks)+1
+
+
+def checkNestedPeaks():
+	'''
+		Checks the memory peak of a stage covers what ran before and inside its nested stages.
+
+		@param[out]: Returns the number of stages checked
+	'''
+	profiler = MayaAsciiProfiler.StageProfiler(memory=True)
+	profiler.start()
+	try:
+		with profiler.stage('outer'):
+			block = bytearray(8 << 20)
+			del block
+			with profiler.stage('inner'):
+				block = bytearray(1 << 20)
+				del block
+	finally:
+		profiler.stop()
+	stages = profiler.report()['stages']
+	check(stages['outer']['peak'] >= 8 << 20,"outer stage peak {0} lost to the inner stage".format(stages['outer']['peak']))
+	if hasattr(tracemalloc,'reset_peak'):
+		# python 3.7/3.8 measure every peak since tracing started
+		check(stages['inner']['peak'] < 8 << 20,"inner stage peak {0} includes the outer stage".format(stages['inner']['peak']))
+	return len(stages)
+
+
+def sceneNetworks(asciipath):
+	'''
+		@param[in]: File path of a maya ascii scene
+		@param[out]: Returns Array of the MayaAsciiShading.ShadingNetworks of the surface shaders of the scene
+	'''
+	scene = MayaAsciiScene.parseFile(asciipath)
+	pairs = []
+	for node in scene.nodes:
+		if node.nodeType == 'shadingEngine':
+			for connection in scene.sourcesOf(node.name+".ss"):
+				pairs.append( (node,scene.findNode(connection.sourceNode)) )
+	return MayaAsciiShading.collectNetworks(scene,pairs,scene.nodes)
+
+
+def checkFingerprints(folder=FIXTURES):
+	'''
+		Checks the networks of the shading_members_*.ma scenes, the same network assigned to a different
+		number of meshes, get the same fingerprint, and that the fingerprint follows the attribute values.
+
+		@param[in]: (Optional) Folder of .ma fixtures
+		@param[out]: Returns the number of networks checked
+	'''
+	networks = []
+	for asciipath in sorted(glob.glob(os.path.join(folder,'shading_members_*.ma'))):
+		networks += sceneNetworks(asciipath)
+	if len(networks) == 0:
+		return 0
+	fingerprints = set(network.fingerprint() for network in networks)
+	check(len(fingerprints) == 1 and None not in fingerprints,"set members change the fingerprints {0}".format(sorted(fingerprints,key=str)))
+	edited = sceneNetworks(sorted(glob.glob(os.path.join(folder,'shading_members_*.ma')))[0])[0]
+	edited.shader.attributes.append(MayaAsciiScene.AttrRecord('.dc',payload='0.5'))
+	check(edited.fingerprint() not in fingerprints,"edited diffuse keeps the fingerprint")
+	return len(networks)
+
+
+def checkClosure():
+	'''
+		Checks the closure of a group takes in the inputs of its own nodes and not the ones of the nodes
+		sharing their short names under other groups.
+
+		@param[out]: Returns the number of nodes checked
+	'''
+	scene = MayaAsciiScene.SceneModel()
+	for group,letter in (('grpA','A'),('grpB','B')):
+		scene.addNode(MayaAsciiScene.NodeRecord('transform',group))
+		scene.addNode(MayaAsciiScene.NodeRecord('transform','box',group))
+		scene.addNode(MayaAsciiScene.NodeRecord('mesh','boxShape','|'+group+'|box'))
+		scene.addNode(MayaAsciiScene.NodeRecord('lambert','mat'+letter))
+		scene.addNode(MayaAsciiScene.NodeRecord('shadingEngine','sg'+letter))
+		scene.addNode(MayaAsciiScene.NodeRecord('polyCube','cube'+letter))
+		scene.addConnection(MayaAsciiScene.ConnectionRecord('cube'+letter+'.out','|'+group+'|box|boxShape.i'))
+		scene.addConnection(MayaAsciiScene.ConnectionRecord('mat'+letter+'.oc','sg'+letter+'.ss'))
+		scene.addConnection(MayaAsciiScene.ConnectionRecord('|'+group+'|box|boxShape.iog','sg'+letter+'.dsm',True))
+	names = [node.name for node in scene.closure(['grpA'])]
+	check(names == ['grpA','box','boxShape','matA','sgA','cubeA'],"closure of grpA {0}".format(names))
+	return len(scene.nodes)
+
+
+def runChecks(folder=FIXTURES):
+	'''
+		Runs every check on the scenes of a folder.
+
+		@param[in]: (Optional) Folder of .ma fixtures
+		@param[out]: Returns the number of meshes checked
+	'''
+	paths = sorted(glob.glob(os.path.join(folder,'*.ma')))
+	check(len(paths) > 0,"no fixtures in "+folder)
+	checked = set()
+	meshes = 0
+	for asciipath in paths:
+		count = checkNormals(asciipath,EXPECTED_NORMALS)
+		checked.update(node.name for node in MayaAsciiScene.parseFile(asciipath).nodes)
+		print("normals {0:>3} meshes {1}".format(count,os.path.basename(asciipath)))
+		meshes += count
+	print("tweaks  {0:>3} records".format(checkTweaks()))
+	print("peaks   {0:>3} stages".format(checkNestedPeaks()))
+	print("shading {0:>3} networks".format(checkFingerprints(folder)))
+	print("closure {0:>3} nodes".format(checkClosure()))
+	if folder == FIXTURES:
+		missing = [name for name in EXPECTED_NORMALS if name not in checked]
+		check(len(missing) == 0,"fixtures missing the meshes "+", ".join(missing))
+	return meshes
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description="Maya Ascii Parser checks")
+	parser.add_argument("--fixtures",default=FIXTURES,help="folder of the .ma scenes to check")
+	args = parser.parse_args()
+	try:
+		runChecks(args.fixtures)
+	except AssertionError as e:
+		print("FAILED",e)
+		sys.exit(1)
+	print("OK")
@@ -3,10 +3,12 @@ from maya import cmds
 from maya import mel
 import os
 import copy
+import json
 import uuid
 import inspect
 from importlib import reload
 from MayaAsciiParser import MayaAsciiParser
+from MayaAsciiParser import MayaAsciiCache
 #reload(MayaAsciiParser)
 
 
@@ -32,6 +34,28 @@ _apiVersion_ = 'Any'
 
 instanceFlag = '-f'
 instanceLongFlag = "AsciiFile"
+workersFlag = '-w'
+workersLongFlag = '-workers'
+noCacheFlag = '-nc'
+noCacheLongFlag = '-noCache'
+clearCacheFlag = '-cc'
+clearCacheLongFlag = '-clearCache'
+cacheDirFlag = '-cd'
+cacheDirLongFlag = '-cacheDir'
+rootsFlag = '-r'
+rootsLongFlag = '-roots'
+normalizeWeightsFlag = '-nw'
+normalizeWeightsLongFlag = '-normalizeWeights'
+reportFlag = '-rp'
+reportLongFlag = '-report'
+profileFlag = '-pr'
+profileLongFlag = '-profile'
+logFileFlag = '-lf'
+logFileLongFlag = '-logFile'
+memoryFlag = '-mm'
+memoryLongFlag = '-memory'
+fingerprintFlag = '-fp'
+fingerprintLongFlag = '-fingerprint'
 # THIS IS BAD CODE. Until I find a way for the undo class to know how to get the
 # instance this is a temporary fix
 callingModule = None
@@ -45,8 +69,19 @@ except:
 class MayaAsciiImporter(om.MPxCommand):
 	_name_ = ""
 	__instance = ""    	
-	__undoCue = []
+	__record = None # MayaAsciiNodes.ImportRecord of this command's import
+	__results = None
 	__asciifile=""
+	__workers=0
+	__useCache=True
+	__cacheDir=None
+	__roots=None
+	__normalizeWeights=False
+	__report=False
+	__profile=False
+	__logFile=None
+	__memory=False
+	__fingerprint=False
 
 	def __init__(self):
 		self._name_ = str(uuid.uuid4())
@@ -57,11 +92,38 @@ class MayaAsciiImporter(om.MPxCommand):
 	def doIt(self, argList):					
 		#Due to use of Mel Commands undo info has to be disabled temporarily between functions
 		cmds.undoInfo(swf=False)	
-		self.__asciifile = argList.asString(0)		
+		argData = om.MArgDatabase(self.syntax(),argList)
+		if argData.isFlagSet(instanceFlag):
+			self.__asciifile = argData.flagArgumentString(instanceFlag,0)
+		else:
+			self.__asciifile = argData.commandArgumentString(0)
+		if argData.isFlagSet(workersFlag):
+			self.__workers = argData.flagArgumentInt(workersFlag,0)
+		if argData.isFlagSet(cacheDirFlag):
+			self.__cacheDir = argData.flagArgumentString(cacheDirFlag,0)
+		self.__useCache = not argData.isFlagSet(noCacheFlag)
+		self.__normalizeWeights = argData.isFlagSet(normalizeWeightsFlag)
+		self.__report = argData.isFlagSet(reportFlag)
+		self.__profile = argData.isFlagSet(profileFlag)
+		self.__memory = argData.isFlagSet(memoryFlag)
+		self.__fingerprint = argData.isFlagSet(fingerprintFlag)
+		if argData.isFlagSet(logFileFlag):
+			self.__logFile = argData.flagArgumentString(logFileFlag,0)
+		if argData.isFlagSet(rootsFlag):
+			self.__roots = []
+			for i in range(argData.numberOfFlagUses(rootsFlag)):
+				self.__roots.append(argData.getFlagArgumentList(rootsFlag,i).asString(0))
+		if argData.isFlagSet(clearCacheFlag):
+			MayaAsciiCache.MayaAsciiCache(self.__cacheDir).clear()
 		mayaimporter = MayaAsciiParser.MayaAsciiParser()
-		m , t , sh , sg, o, c = mayaimporter.importFile(self.__asciifile)
-		self.__undoCue.append( (m,t,sh,sg,o,c) )		
+		m , t , sh , sg, o, c = mayaimporter.importFile(self.__asciifile,self.__workers,self.__useCache,self.__cacheDir,self.__roots,self.__normalizeWeights,self.__profile,self.__logFile,self.__memory,self.__fingerprint)
+		self.__record = mayaimporter.record
+		self.__results = (m,t)
 		cmds.undoInfo(swf=True)	
+		if self.__report:
+			# json.loads() of the result gives the stage report
+			om.MPxCommand.setResult(json.dumps(mayaimporter.report))
+			return True
 		om.MPxCommand.setResult(m)
 		om.MPxCommand.appendToResult(t)		
 		return True
@@ -69,69 +131,18 @@ class MayaAsciiImporter(om.MPxCommand):
 	
 	
 	def redoIt(self):					
-		cmds.undoInfo(swf=False)	
-		mayaimporter = MayaAsciiParser.MayaAsciiParser()		
-		m , t , sh , sg, o, c = mayaimporter.importFile(self.__asciifile)		
-		self.__undoCue.append( (m,t,sh,sg,o,c) )		
-		cmds.undoInfo(swf=True)	
-		om.MPxCommand.setResult(m)
-		om.MPxCommand.appendToResult(t)				
+		# replays the recorded import instead of reading the file again
+		self.__record.redoIt()
+		if self.__report:
+			return True
+		om.MPxCommand.setResult(self.__results[0])
+		om.MPxCommand.appendToResult(self.__results[1])				
 		return True
 	
 
 	def undoIt(self):		
-		cmds.undoInfo(swf=False)									
-		currentQue = self.__undoCue.pop()				
-		# undo by order of creation in reverse
-						
-		
-		for cons in currentQue[5]:
-			try:
-				mel.eval("disconnectAttr "+cons)
-			except:				
-				pass
-		
-		# Meshes were entirely made with API so best to nuke it		
-		msels = om.MSelectionList()
-		mselIter = om.MItSelectionList(msels)
-		mod = om.MDGModifier()
-		for meshe in currentQue[0]:					
-			if cmds.objExists(meshe):				
-				msels.add(meshe)					
-		while not mselIter.isDone():
-			mDag,mComp = mselIter.getComponent()
-			mod.deleteNode(mDag.node())
-			mselIter.next();				
-		mod.doIt();
-
-		
-		# delete other nodes
-		
-		for other in currentQue[4]:			
-			if cmds.objExists(other):
-				mel.eval("delete {0};".format(other))													
-			
-		
-		# delete transforms
-		
-		
-		for transf in reversed(currentQue[1]):
-			if cmds.objExists(transf):
-				mel.eval("delete {0};".format(transf))				
-				#cmds.delete(transf)
-				#msels.add(transf)
-		
-
-		for sg in currentQue[2]:
-			if cmds.objExists(sg):				
-				mel.eval("delete {0};".format(sg))	
-				#cmds.delete(sg)
-		
-		for sh in currentQue[3]:
-			if cmds.objExists(sh):				
-				mel.eval("delete {0};".format(sh))	
-				#cmds.delete(sh)
-		cmds.undoInfo(swf=True)	
+		# every created node (and the connections made to existing nodes) in one modifier
+		self.__record.undoIt()
 		return True
 		
 
@@ -150,6 +161,19 @@ def cmdCreator():
 def syntaxCreator():
 	syn = om.MSyntax()    
 	syn.addFlag(instanceFlag,instanceLongFlag, om.MSyntax.kString )
+	syn.addFlag(workersFlag,workersLongFlag, om.MSyntax.kLong )
+	syn.addFlag(noCacheFlag,noCacheLongFlag)
+	syn.addFlag(clearCacheFlag,clearCacheLongFlag)
+	syn.addFlag(cacheDirFlag,cacheDirLongFlag, om.MSyntax.kString )
+	syn.addFlag(rootsFlag,rootsLongFlag, om.MSyntax.kString )
+	syn.makeFlagMultiUse(rootsFlag)
+	syn.addFlag(normalizeWeightsFlag,normalizeWeightsLongFlag)
+	syn.addFlag(reportFlag,reportLongFlag)
+	syn.addFlag(profileFlag,profileLongFlag)
+	syn.addFlag(logFileFlag,logFileLongFlag, om.MSyntax.kString )
+	syn.addFlag(memoryFlag,memoryLongFlag)
+	syn.addFlag(fingerprintFlag,fingerprintLongFlag)
+	syn.addArg(om.MSyntax.kString)
 	return syn
 
 
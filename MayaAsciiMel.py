@@ -0,0 +1,115 @@
+# Maya Ascii Mel
+# Description: Runs queued mel statements (setAttr, addAttr, connectAttr) in chunks with a single
+# mel.eval per chunk instead of one interpreter round trip per statement.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiMel
+batch = MayaAsciiMel.MelBatch("Cant set attribute ")
+batch.add('setAttr "pCube1.tx" 5;')
+batch.add('setAttr "pCube1.missing" 5;')
+batch.flush()
+print(batch.failures)	# [('setAttr "pCube1.missing" 5;', None, RuntimeError(...))]
+'''
+
+from maya import mel
+
+DEFAULT_CHUNK = 1000
+
+# global mel variable holding the id of the statement being run
+_progressVariable = '$gMayaAsciiBatch'
+
+
+class MelBatch():
+	'''
+		Queue of mel statements. Every statement of a chunk is preceded by an assignment of its id to a
+		global mel variable, so when the chunk's mel.eval fails the variable tells which statement
+		failed. That statement is reported and the chunk resumes after it. Statements that ran are
+		never run twice, which matters for non idempotent statements (addAttr, connectAttr -na)
+		that bisecting the chunk would repeat.
+	'''
+	# ids keep growing across batches so a stale progress value never matches the current chunk
+	__serial = 0
+
+	def __init__(self,message=None,chunkSize=DEFAULT_CHUNK):
+		'''
+			@param[in]: (Optional) Message printed with each failing statement, None fails silently
+			@param[in]: (Optional) Number of statements per mel.eval
+		'''
+		self.message = message
+		self.chunkSize = chunkSize
+		self.statements = []
+		self.tags = []
+		self.failures = [] # (statement, tag, error)
+		self.succeeded = [] # tags of the statements that ran
+
+	def add(self,statement,tag=None):
+		'''
+			Queues a statement, runs the queue once it holds a full chunk.
+
+			@param[in]: mel statement terminated by a semicolon
+			@param[in]: (Optional) Value reported in succeeded/failures for this statement
+		'''
+		self.statements.append(statement)
+		self.tags.append(tag)
+		if len(self.statements) >= self.chunkSize:
+			self.flush()
+
+	def flush(self):
+		'''
+			Runs every queued statement.
+
+			@param[out]: Returns Array of (statement, tag, error) of the statements that failed in this flush
+		'''
+		statements = self.statements
+		tags = self.tags
+		self.statements = []
+		self.tags = []
+		failures = []
+		start = 0
+		while start < len(statements):
+			firstId = MelBatch.__serial
+			MelBatch.__serial += len(statements)-start
+			try:
+				mel.eval(self.script(statements,start,firstId))
+				self.succeeded.extend(tags[start:])
+				break
+			except Exception as e:
+				failed = self.progress()-firstId+start
+				if failed < start or failed >= len(statements):
+					# the chunk did not parse so none of it ran, run the statements one at a time
+					for s in range(start,len(statements)):
+						try:
+							mel.eval(statements[s])
+							self.succeeded.append(tags[s])
+						except Exception as statementError:
+							failures.append( (statements[s],tags[s],statementError) )
+					break
+				self.succeeded.extend(tags[start:failed])
+				failures.append( (statements[failed],tags[failed],e) )
+				start = failed+1
+		for statement,tag,error in failures:
+			if self.message is not None:
+				print(self.message,statement)
+				print(error)
+		self.failures.extend(failures)
+		return failures
+
+	def script(self,statements,start,firstId):
+		'''
+			Builds the mel script of a chunk.
+
+			@param[in]: Array of statements
+			@param[in]: Index of the first statement to run
+			@param[in]: Id of the first statement
+			@param[out]: Returns a single string
+		'''
+		lines = ["global int {0};".format(_progressVariable)]
+		for s in range(start,len(statements)):
+			lines.append("{0}={1};{2}".format(_progressVariable,firstId+s-start,statements[s]))
+		return "\n".join(lines)
+
+	def progress(self):
+		'''
+			@param[out]: Returns the id of the last statement that started running
+		'''
+		return int(mel.eval("global int {0}; {0} = {0};".format(_progressVariable)))
@@ -0,0 +1,644 @@
+# Maya Ascii Mesh
+# Description: Decodes the polyFaces records of a mesh node into flat int arrays in a single
+# linear pass, and the rest of the mesh payloads into MeshData. Does not import maya so it can
+# run headless and in worker processes.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiScene, MayaAsciiArrays, MayaAsciiMesh
+scene = MayaAsciiScene.parseFile('C:/scenes/cube.ma')
+mesh = scene.findNode('pCubeShape1')
+edges = MayaAsciiArrays.gatherSegments([a for a in mesh.attributes if a.leaf == 'ed'],3,MayaAsciiArrays.INT)
+topology = MayaAsciiMesh.decodePolyFaces([a.payload for a in mesh.attributes if a.leaf == 'fc'],edges)
+print(topology.faceCount, list(topology.faceCounts), list(topology.faceConnects))
+
+# decode every mesh of a scene on 4 processes
+meshes = MayaAsciiMesh.decodeMeshes([n for n in scene.nodes if n.nodeType == 'mesh'],4)
+'''
+
+import os
+import sys
+import operator
+import multiprocessing
+from array import array
+from itertools import accumulate, chain, compress
+from concurrent.futures import ProcessPoolExecutor
+from MayaAsciiParser import MayaAsciiArrays
+from MayaAsciiParser import MayaAsciiTokenizer
+
+INT = MayaAsciiArrays.INT
+
+# polyFaces record tags: face, hole, uvs, colors, face colors
+_tags = ('f','h','mu','mc','fc')
+_byteTags = tuple(tag.encode('ascii') for tag in _tags)
+# pnts child attributes -> axis
+_tweakAxes = {'px':0,'pntx':0,'py':1,'pnty':1,'pz':2,'pntz':2}
+# normals maya computes itself are written as 1e+20
+_unsetNormal = 1e19
+
+
+class FaceVertexSet():
+	'''
+		Per face-vertex indices of one uv or color set. counts holds one entry per face (or hole),
+		0 when the face has no indices in this set, ids holds the indices of every face back to back.
+	'''
+	__slots__ = ('counts','ids')
+
+	def __init__(self):
+		self.counts = array(INT)
+		self.ids = array(INT)
+
+	def add(self,element,ids):
+		'''
+			Stores the indices of a face.
+
+			@param[in]: Face (or hole) index
+			@param[in]: Sequence of int indices
+		'''
+		self.pad(element)
+		self.counts.append(len(ids))
+		self.ids.extend(ids)
+
+	def pad(self,length):
+		'''
+			Fills the faces with no indices in this set with 0 counts.
+
+			@param[in]: Number of faces the counts should cover
+		'''
+		missing = length-len(self.counts)
+		if missing > 0:
+			self.counts.extend(MayaAsciiArrays.allocate(missing,INT))
+
+
+class MeshTopology():
+	'''
+		Flat topology arrays of a mesh.
+
+		faceCounts    vertices per face
+		faceEdges     edge id of every face-vertex
+		faceFlips     1 when the edge is walked backwards (from its second vertex)
+		faceConnects  vertex id of every face-vertex
+		holeFaces     face index each hole belongs to
+		holeCounts    vertices per hole
+		holeConnects  vertex id of every hole-vertex
+		uvs, holeUvs, colors, holeColors   set index -> FaceVertexSet
+	'''
+	__slots__ = ('faceCounts','faceEdges','faceFlips','faceConnects',
+				'holeFaces','holeCounts','holeEdges','holeFlips','holeConnects',
+				'uvs','holeUvs','colors','holeColors')
+
+	def __init__(self):
+		self.faceCounts = array(INT)
+		self.faceEdges = array(INT)
+		self.faceFlips = array(INT)
+		self.faceConnects = array(INT)
+		self.holeFaces = array(INT)
+		self.holeCounts = array(INT)
+		self.holeEdges = array(INT)
+		self.holeFlips = array(INT)
+		self.holeConnects = array(INT)
+		self.uvs = dict()
+		self.holeUvs = dict()
+		self.colors = dict()
+		self.holeColors = dict()
+
+	@property
+	def faceCount(self):
+		return len(self.faceCounts)
+
+	@property
+	def holeCount(self):
+		return len(self.holeCounts)
+
+	def faceOffsets(self):
+		'''
+			Start of every face in the face-vertex arrays.
+
+			@param[out]: Returns array of faceCount+1 offsets
+		'''
+		return array(INT,[0])+array(INT,accumulate(self.faceCounts))
+
+
+def resolveEdges(signedEdges,edges):
+	'''
+		Converts signed polyFaces edge ids into edge ids, flip flags and vertex ids.
+		A negative id -e-1 means edge e is walked from its second vertex.
+		https://cgkit.sourceforge.net/doc2/mayaascii.html#polyface
+
+		@param[in]: array of signed edge ids
+		@param[in]: Flat edge array of (vertexA vertexB smooth) triples
+		@param[out]: Returns array of edge ids
+		@param[out]: Returns array of flip flags
+		@param[out]: Returns array of vertex ids
+	'''
+	edgeIds = array(INT,[e if e >= 0 else -e-1 for e in signedEdges])
+	flips = array(INT,[1 if e < 0 else 0 for e in signedEdges])
+	connects = array(INT,[edges[e*3+f] for e,f in zip(edgeIds,flips)])
+	return edgeIds,flips,connects
+
+
+def decodePolyFaces(payloads,edges,faceCount=0):
+	'''
+		Decodes the "f" "h" "mu" "mc" records of polyFaces setAttr payloads. Records are read by
+		their counts so a record may be split across lines, the cost is linear in the payload size.
+
+		@param[in]: Array of polyFaces payloads (text or bytes like) in the order they were written ie ".fc[0:499]" ".fc[500:999]"
+		@param[in]: Flat edge array of (vertexA vertexB smooth) triples
+		@param[in]: (Optional) Face count from setAttr -s, used to pad the per set arrays
+		@param[out]: Returns MeshTopology
+	'''
+	topology = MeshTopology()
+	signedFaceEdges = array(INT)
+	signedHoleEdges = array(INT)
+	face = -1
+	hole = -1
+	inHole = False
+	for payload in payloads:
+		if isinstance(payload,str):
+			tags = _tags
+		else:
+			# memoryview of a mapped file, only this payload is copied
+			payload = bytes(payload)
+			tags = _byteTags
+		tokens = payload.split()
+		t = 0
+		length = len(tokens)
+		while t < length:
+			tag = tokens[t]
+			if tag == tags[0]:
+				count = int(tokens[t+1])
+				topology.faceCounts.append(count)
+				signedFaceEdges.extend(map(int,tokens[t+2:t+2+count]))
+				face += 1
+				inHole = False
+				t += 2+count
+			elif tag == tags[1]:
+				count = int(tokens[t+1])
+				topology.holeFaces.append(face)
+				topology.holeCounts.append(count)
+				signedHoleEdges.extend(map(int,tokens[t+2:t+2+count]))
+				hole += 1
+				inHole = True
+				t += 2+count
+			elif tag == tags[2] or tag == tags[3]:
+				setIndex = int(tokens[t+1])
+				count = int(tokens[t+2])
+				ids = list(map(int,tokens[t+3:t+3+count]))
+				if tag == tags[2]:
+					sets = topology.holeUvs if inHole else topology.uvs
+				else:
+					sets = topology.holeColors if inHole else topology.colors
+				if setIndex not in sets:
+					sets[setIndex] = FaceVertexSet()
+				sets[setIndex].add(hole if inHole else face,ids)
+				t += 3+count
+			elif tag == tags[4]:
+				# single set face colors, stored as color set 0
+				count = int(tokens[t+1])
+				sets = topology.holeColors if inHole else topology.colors
+				if 0 not in sets:
+					sets[0] = FaceVertexSet()
+				sets[0].add(hole if inHole else face,list(map(int,tokens[t+2:t+2+count])))
+				t += 2+count
+			else:
+				# unknown record, skip to the next tag
+				t += 1
+				while t < length and not tokens[t][:1].isalpha():
+					t += 1
+	topology.faceEdges,topology.faceFlips,topology.faceConnects = resolveEdges(signedFaceEdges,edges)
+	topology.holeEdges,topology.holeFlips,topology.holeConnects = resolveEdges(signedHoleEdges,edges)
+	faceCount = max(faceCount,topology.faceCount)
+	for sets,total in ((topology.uvs,faceCount),(topology.colors,faceCount),(topology.holeUvs,topology.holeCount),(topology.holeColors,topology.holeCount)):
+		for faceSet in sets.values():
+			faceSet.pad(total)
+	return topology
+
+
+def edgeVertices(edges):
+	'''
+		Drops the smoothing flag of (vertexA vertexB smooth) edge triples.
+
+		@param[in]: Flat edge array
+		@param[out]: Returns array of (vertexA vertexB) pairs
+	'''
+	edgeCount = int(len(edges)/3)
+	edges = edges[:edgeCount*3]
+	pairs = MayaAsciiArrays.allocate(edgeCount*2,INT)
+	pairs[0::2] = edges[0::3]
+	pairs[1::2] = edges[1::3]
+	return pairs
+
+
+def faceVertexAssignment(topology,setIndex,faceSets,holeSets):
+	'''
+		Merges the face and hole indices of a uv or color set into the per face counts and ids
+		MFnMesh.assignUVs expects, a face with holes lists its border then every hole.
+
+		@param[in]: MeshTopology
+		@param[in]: Set index
+		@param[in]: Face sets of the topology ie topology.uvs
+		@param[in]: Hole sets of the topology ie topology.holeUvs
+		@param[out]: Returns array of counts per face
+		@param[out]: Returns array of ids
+	'''
+	faceSet = faceSets.get(setIndex,FaceVertexSet())
+	holeSet = holeSets.get(setIndex)
+	faceSet.pad(topology.faceCount)
+	counts = faceSet.counts[:topology.faceCount]
+	if holeSet is None or topology.holeCount == 0:
+		return counts,faceSet.ids
+	holeSet.pad(topology.holeCount)
+	# the ids between two faces with holes are copied as one slice, only the holes are walked
+	offsets = array(INT,[0])+array(INT,accumulate(counts))
+	ids = array(INT)
+	position = 0
+	holeOffset = 0
+	for h in range(topology.holeCount):
+		face = topology.holeFaces[h]
+		end = offsets[face+1]
+		if end > position:
+			ids.extend(faceSet.ids[position:end])
+			position = end
+		holeCount = holeSet.counts[h]
+		ids.extend(holeSet.ids[holeOffset:holeOffset+holeCount])
+		holeOffset += holeCount
+		counts[face] += holeCount
+	ids.extend(faceSet.ids[position:])
+	return counts,ids
+
+
+def foldTweaks(points,tweaks):
+	'''
+		Adds the pnts tweaks of a mesh to its vertex positions, so the mesh is built with its final
+		shape and the tweaks are never replayed.
+
+		@param[in]: Flat vertex array of 3 floats per vertex, changed in place
+		@param[in]: Array of pt/pnts AttrRecords
+		@param[out]: Returns Array of the records that could not be folded, whole, for mel to set
+	'''
+	vertCount = int(len(points)/3)
+	left = []
+	for attr in tweaks:
+		if not attr.hasValue:
+			continue
+		components = attr.components()
+		indices = attr.indexRange(0)
+		if indices is None or len(components) > 2:
+			left.append(attr)
+			continue
+		start,end = indices
+		if end >= vertCount:
+			# no vertices (vt not written) or tweaks past the last vertex, mel sets them on the mesh
+			left.append(attr)
+			continue
+		count = end-start+1
+		if len(components) == 1:
+			# pt[0:7] 3 floats per vertex
+			values = MayaAsciiArrays.decode(attr.rawPayload)
+			if len(values) != count*3:
+				left.append(attr)
+				continue
+			points[start*3:(start+count)*3] = array(MayaAsciiArrays.FLOAT,map(operator.add,points[start*3:(start+count)*3],values))
+		elif components[1][0] in _tweakAxes:
+			# pt[5].px one float per vertex
+			values = MayaAsciiArrays.decode(attr.rawPayload)
+			if len(values) != count:
+				left.append(attr)
+				continue
+			axis = _tweakAxes[components[1][0]]
+			for i in range(count):
+				points[(start+i)*3+axis] += values[i]
+		else:
+			left.append(attr)
+	return left
+
+
+def faceVertexColorIds(topology,setIndex):
+	'''
+		Color id of every face-vertex of a color set in maya's face-vertex order (a face with holes lists
+		its border then every hole), the layout MFnMesh.assignColors expects.
+
+		@param[in]: MeshTopology
+		@param[in]: Color set index
+		@param[out]: Returns array of color ids, -1 for face-vertices with no color
+	'''
+	faceSet = topology.colors.get(setIndex,FaceVertexSet())
+	holeSet = topology.holeColors.get(setIndex,FaceVertexSet())
+	faceSet.pad(topology.faceCount)
+	holeSet.pad(topology.holeCount)
+	if topology.holeCount == 0 and faceSet.counts[:topology.faceCount] == topology.faceCounts:
+		# every face colored, the ids are already in face-vertex order
+		return faceSet.ids[:len(topology.faceConnects)]
+	unassigned = array(INT,[-1])
+	ids = array(INT)
+	offset = 0
+	holeOffset = 0
+	h = 0
+	for face in range(topology.faceCount):
+		size = topology.faceCounts[face]
+		count = faceSet.counts[face]
+		faceIds = faceSet.ids[offset:offset+count][:size]
+		offset += count
+		ids.extend(faceIds)
+		ids.extend(unassigned*(size-len(faceIds)))
+		#handles multiple holes per face
+		while h < topology.holeCount and topology.holeFaces[h] == face:
+			size = topology.holeCounts[h]
+			count = holeSet.counts[h]
+			holeIds = holeSet.ids[holeOffset:holeOffset+count][:size]
+			holeOffset += count
+			ids.extend(holeIds)
+			ids.extend(unassigned*(size-len(holeIds)))
+			h += 1
+	return ids
+
+
+def faceVertexIds(topology):
+	'''
+		Face and vertex id of every face-vertex in maya's face-vertex order, a face with holes lists
+		its border then every hole.
+
+		@param[in]: MeshTopology
+		@param[out]: Returns array of face ids
+		@param[out]: Returns array of vertex ids
+	'''
+	faceIds = array(INT)
+	if topology.holeCount == 0:
+		for face in range(topology.faceCount):
+			faceIds.extend(array(INT,[face])*topology.faceCounts[face])
+		return faceIds,topology.faceConnects
+	vertexIds = array(INT)
+	offset = 0
+	holeOffset = 0
+	h = 0
+	for face in range(topology.faceCount):
+		count = topology.faceCounts[face]
+		vertexIds.extend(topology.faceConnects[offset:offset+count])
+		offset += count
+		#handles multiple holes per face
+		while h < topology.holeCount and topology.holeFaces[h] == face:
+			holeSize = topology.holeCounts[h]
+			vertexIds.extend(topology.holeConnects[holeOffset:holeOffset+holeSize])
+			holeOffset += holeSize
+			count += holeSize
+			h += 1
+		faceIds.extend(array(INT,[face])*count)
+	return faceIds,vertexIds
+
+
+def faceVertexNormals(normals,topology):
+	'''
+		Pairs the normals of a mesh with their face-vertices for MFnMesh.setFaceVertexNormals. Maya
+		writes 1e+20 for the normals it computes from the edge smoothing, those are left out so
+		they are not locked.
+
+		@param[in]: Flat normal array, 3 floats per face-vertex
+		@param[in]: MeshTopology
+		@param[out]: Returns array of normals, 3 floats per face-vertex
+		@param[out]: Returns array of face ids
+		@param[out]: Returns array of vertex ids
+	'''
+	faceIds,vertexIds = faceVertexIds(topology)
+	count = min(int(len(normals)/3),len(vertexIds))
+	normals = normals[:count*3]
+	faceIds = faceIds[:count]
+	vertexIds = vertexIds[:count]
+	if count == 0 or (max(normals) < _unsetNormal and min(normals) > -_unsetNormal):
+		return normals,faceIds,vertexIds
+	triples = list(zip(normals[0::3],normals[1::3],normals[2::3]))
+	keep = [abs(x) < _unsetNormal and abs(y) < _unsetNormal and abs(z) < _unsetNormal for x,y,z in triples]
+	keptNormals = array(MayaAsciiArrays.FLOAT,chain.from_iterable(compress(triples,keep)))
+	return keptNormals,array(INT,compress(faceIds,keep)),array(INT,compress(vertexIds,keep))
+
+
+def faceComponentIds(components,faceCount):
+	'''
+		Decodes face components into face ids, components of other kinds are left out.
+
+		@param[in]: Array of components ie ["f[0:3]","f[5]","f[*]"]
+		@param[in]: Number of faces of the mesh, the range of "f[*]"
+		@param[out]: Returns array of face ids in the order they are written
+	'''
+	ids = array(INT)
+	for component in components:
+		kind,bracket,indices = component.partition('[')
+		if kind not in ('f','face') or not bracket:
+			continue
+		indices = indices.rstrip(']')
+		if indices == '*':
+			ids.extend(range(faceCount))
+			continue
+		first,colon,last = indices.partition(':')
+		ids.extend(range(int(first),int(last if colon else first)+1))
+	return ids
+
+
+def edgeSmoothing(edges):
+	'''
+		@param[in]: Flat edge array of (vertexA vertexB smooth) triples
+		@param[out]: Returns array of edge ids
+		@param[out]: Returns Array of smooth flags as bools, the form MFnMesh.setEdgeSmoothings accepts
+	'''
+	edgeCount = int(len(edges)/3)
+	return array(INT,range(edgeCount)),[s == 1 for s in edges[2:edgeCount*3:3]]
+
+
+class MeshData():
+	'''
+		Decoded payloads of a mesh node, everything MFnMesh needs as flat arrays. Pickles compactly
+		so it can be returned from worker processes.
+
+		points         vertex positions, 3 floats per vertex
+		edges          (vertexA vertexB smooth) int triples
+		normals        3 floats per normal
+		topology       MeshTopology
+		uvNames        uv set index -> name
+		uvPoints       uv set index -> 2 floats per uv
+		uvAssignments  uv set index -> (counts per face, uv ids)
+		colorNames     color set index -> name
+		colorChannels  color set index -> 3 (RGB) or 4 (RGBA) channels
+		colorPoints    color set index -> channels floats per color
+		colorAssignments   color set index -> color id of every face-vertex, -1 when uncolored
+		materialFaceAssignment   instObjGroups index -> face ids of the components ie ["f[0:3]","f[5]"] -> 0 1 2 3 5, empty for the whole mesh
+		otherAttribs   every other setAttr record, replayed with mel
+	'''
+	__slots__ = ('name','parent','vertCount','faceCount','edgeCount','points','edges','normals','topology',
+				'uvNames','uvPoints','uvAssignments','colorNames','colorChannels','colorPoints','colorAssignments',
+				'materialFaceAssignment','otherAttribs')
+
+	def __init__(self,name=None,parent=None):
+		self.name = name
+		self.parent = parent
+		self.vertCount = 0
+		self.faceCount = 0
+		self.edgeCount = 0
+		self.points = array(MayaAsciiArrays.FLOAT)
+		self.edges = array(INT)
+		self.normals = array(MayaAsciiArrays.FLOAT)
+		self.topology = MeshTopology()
+		self.uvNames = dict()
+		self.uvPoints = dict()
+		self.uvAssignments = dict()
+		self.colorNames = dict()
+		self.colorChannels = dict()
+		self.colorPoints = dict()
+		self.colorAssignments = dict()
+		self.materialFaceAssignment = dict()
+		self.otherAttribs = []
+
+	def __getstate__(self):
+		return [getattr(self,slot) for slot in self.__slots__]
+
+	def __setstate__(self,state):
+		for slot,value in zip(self.__slots__,state):
+			setattr(self,slot,value)
+
+
+def decodeMesh(node):
+	'''
+		Sorts the setAttr records of a mesh node and decodes the numeric payloads.
+
+		@param[in]: NodeRecord of a mesh
+		@param[out]: Returns MeshData
+	'''
+	#https://help.autodesk.com/cloudhelp/2025/CHS/Maya-Tech-Docs/CommandsPython/setAttr.html
+	data = MeshData(node.name,node.parent)
+	uvAttribs = dict() # uv set index -> uvsp setAttr records
+	colorAttribs = dict() # color set index -> clsp setAttr records
+	vertAttribs = []
+	edgeAttribs = []
+	faceAttribs = []
+	normalAttribs = []
+	tweakAttribs = []
+	componentAttribs = dict() # instObjGroups index -> face components
+	for attr in node.attributes:
+		root = attr.root
+		name = attr.leaf
+
+		# UV Map Name
+		if root in ('uvst','uvSet') and name in ('uvsn','uvSetName'):
+			data.uvNames[attr.logicalIndex(0)] = attr.value
+			continue
+
+		# UV Components
+		if root in ('uvst','uvSet') and name in ('uvsp','uvSetPoints'):
+			# segmented lists ie [0:34] + [35:90] are merged when decoded
+			uvAttribs.setdefault(attr.logicalIndex(0),[]).append(attr)
+			continue
+
+		# Component Tweaks, folded into the vertices
+		if root in ('pt','pnts'):
+			tweakAttribs.append(attr)
+			continue
+
+		# Vertex Components
+		if name in ('vt','vrts'):
+			if attr.size is not None:
+				data.vertCount = attr.size
+			vertAttribs.append(attr)
+			continue
+
+		# Edge Component
+		if name in ('ed','edge'):
+			if attr.size is not None:
+				data.edgeCount = attr.size
+			edgeAttribs.append(attr)
+			continue
+
+		# Face Component
+		if name in ('fc','face'):
+			if attr.size is not None:
+				data.faceCount = attr.size
+			faceAttribs.append(attr)
+			continue
+
+		# Normals Component, normals per face vertex
+		if name in ('n','normals'):
+			normalAttribs.append(attr)
+			continue
+
+		# Material Assignments
+		if root in ('iog','instObjGroups'):
+			if name in ('gcl','objectGrpCompList') and attr.hasValue:
+				# ie 2 "f[0:3]" "f[5]"  -> ["f[0:3]","f[5]"], decoded once the face count is known
+				materialData = [MayaAsciiTokenizer.unquote(t) for t in MayaAsciiTokenizer.splitArguments(attr.payload)]
+				materialData.pop(0)
+				componentAttribs[attr.logicalIndex(1)] = materialData
+				continue
+			if not attr.hasValue:
+				continue
+
+		# Color sets, the name, representation and colors are set through MFnMesh
+		if root in ('clst','colorSet'):
+			colorSetIndex = attr.logicalIndex(0)
+			if name in ('clsn','colorName'):
+				data.colorNames[colorSetIndex] = attr.value
+				data.colorChannels.setdefault(colorSetIndex,4)
+				continue
+			elif name in ('rprt','representation'):
+				try:
+					data.colorChannels[colorSetIndex] = int(attr.value)
+				except:
+					# sometimes if there is a construction history for the color set the representation becomes a place holder.
+					pass
+				continue
+			elif name in ('clsp','colorSetPoints'):
+				if attr.hasValue:
+					colorAttribs.setdefault(colorSetIndex,[]).append(attr)
+				continue
+
+		#everything else goes here
+		data.otherAttribs.append(attr)
+
+	# decode the numeric payloads in bulk, edges are (vertexA vertexB smooth) triples
+	data.points = MayaAsciiArrays.gatherSegments(vertAttribs,3,count=data.vertCount)
+	data.otherAttribs.extend(foldTweaks(data.points,tweakAttribs))
+	data.edges = MayaAsciiArrays.gatherSegments(edgeAttribs,3,INT,count=data.edgeCount)
+	data.edgeCount = int(len(data.edges)/3)
+	try:
+		data.normals = MayaAsciiArrays.gatherSegments(normalAttribs,3)
+	except Exception as e:
+		raise Exception("problem parsing normal data ",node.name)
+
+	# faces, holes and per face uv/color ids as flat arrays
+	data.topology = decodePolyFaces([f.rawPayload for f in faceAttribs],data.edges,data.faceCount)
+	for uvSetIndex,attrs in uvAttribs.items():
+		data.uvPoints[uvSetIndex] = MayaAsciiArrays.gatherSegments(attrs,2)
+		data.uvAssignments[uvSetIndex] = faceVertexAssignment(data.topology,uvSetIndex,data.topology.uvs,data.topology.holeUvs)
+	for colorSetIndex,attrs in colorAttribs.items():
+		data.colorPoints[colorSetIndex] = MayaAsciiArrays.gatherSegments(attrs,data.colorChannels.get(colorSetIndex,4))
+		data.colorAssignments[colorSetIndex] = faceVertexColorIds(data.topology,colorSetIndex)
+	for groupIndex,components in componentAttribs.items():
+		data.materialFaceAssignment[groupIndex] = faceComponentIds(components,data.topology.faceCount)
+	return data
+
+
+def _workerExecutable():
+	'''
+		Worker processes must run a python interpreter, inside the maya gui sys.executable is maya itself.
+
+		@param[out]: Returns path of the python executable (mayapy when running in maya)
+	'''
+	executable = sys.executable
+	folder,filename = os.path.split(executable)
+	if filename.lower().startswith('maya') and not filename.lower().startswith('mayapy'):
+		extension = os.path.splitext(filename)[1] if os.name == 'nt' else ''
+		executable = os.path.join(folder,'mayapy'+extension)
+	return executable
+
+
+def decodeMeshes(nodes,workers=0):
+	'''
+		Decodes the mesh nodes, in parallel worker processes when workers is above 1.
+		The workers run decodeMesh so the result is identical to the serial path.
+
+		@param[in]: Array of mesh NodeRecords
+		@param[in]: (Optional) Number of worker processes, 0 or 1 decodes in this process
+		@param[out]: Returns Array of MeshData in the order of nodes
+	'''
+	if workers is None or workers <= 1 or len(nodes) < 2:
+		return [decodeMesh(node) for node in nodes]
+	# spawn a clean interpreter, forking maya is not safe
+	context = multiprocessing.get_context('spawn')
+	context.set_executable(_workerExecutable())
+	with ProcessPoolExecutor(max_workers=min(workers,len(nodes)),mp_context=context) as pool:
+		return list(pool.map(decodeMesh,nodes))
@@ -0,0 +1,152 @@
+# Maya Ascii Names
+# Description: Keeps the node names of the scene being imported into in memory, so picking a free
+# name for an imported node is a set lookup instead of a cmds.objExists probe per candidate, and
+# rewrites plugs to the names the imported nodes got.
+# Does not import maya, the names are given by the caller (ie cmds.ls()).
+'''
+Example code:
+from maya import cmds
+from MayaAsciiParser import MayaAsciiNames
+names = MayaAsciiNames.NameRegistry(cmds.ls())
+print(names.exists('pCube1'))
+print(names.unique('pCube1'))	# pCube21 when pCube1 to pCube20 exist
+names.add(cmds.createNode('transform',n='pCube1'))
+
+resolver = MayaAsciiNames.NameResolver({'pCube1':'pCube21'})
+print(resolver.command('|grp|pCube1.t pCube1Shape.t -na'))	# |grp|pCube21.t pCube1Shape.t -na
+'''
+
+from string import digits
+
+
+def leafName(name):
+	'''
+		@param[in]: Node name or DAG path
+		@param[out]: Returns the last part of the path
+	'''
+	return name.rpartition('|')[2]
+
+
+def splitSuffix(name):
+	'''
+		@param[in]: Node name
+		@param[out]: Returns the name without its trailing digits
+		@param[out]: Returns the trailing digits as a number, 0 when there are none
+	'''
+	prefix = name.rstrip(digits)
+	suffix = name[len(prefix):]
+	return prefix,int(suffix) if suffix else 0
+
+
+class NameRegistry():
+	'''
+		Snapshot of the scene's node names, updated with every name the import creates or reserves.
+		For each name prefix (the name without its trailing digits) the highest suffix in use is
+		kept, a name clash is resolved with that suffix plus one.
+
+		DAG nodes are registered by their leaf name, like cmds.objExists on a short name a leaf
+		name is taken once any node uses it.
+	'''
+
+	def __init__(self,names=()):
+		'''
+			@param[in]: (Optional) Iterable of node names or DAG paths already in the scene
+		'''
+		self.names = set()
+		self.suffixes = dict() # prefix -> highest suffix in use
+		for name in names:
+			self.add(name)
+
+	def add(self,name):
+		'''
+			Registers a name as taken.
+
+			@param[in]: Node name or DAG path
+		'''
+		name = leafName(name)
+		self.names.add(name)
+		prefix,suffix = splitSuffix(name)
+		if suffix > self.suffixes.get(prefix,-1):
+			self.suffixes[prefix] = suffix
+
+	def exists(self,name):
+		'''
+			@param[in]: Node name or DAG path
+			@param[out]: Returns True when a node uses the name
+		'''
+		return leafName(name) in self.names
+
+	def unique(self,name):
+		'''
+			Picks a free name and reserves it.
+
+			@param[in]: Desired node name
+			@param[out]: Returns the name when free, otherwise its prefix numbered past the highest suffix in use
+		'''
+		name = leafName(name)
+		if name in self.names:
+			prefix = name.rstrip(digits)
+			# past the highest suffix so the name can not be taken, zero padded ones (joint01) included
+			name = prefix+str(self.suffixes.get(prefix,0)+1)
+		self.add(name)
+		return name
+
+
+class NameResolver():
+	'''
+		Rewrites node names in plugs and connectAttr arguments to the names the nodes got in the
+		scene. Only the node part of a plug is looked up (every part of a DAG path), attribute names
+		are left alone. Rewritten plugs are cached, call clear() when the renamed dictionary changes.
+	'''
+
+	def __init__(self,renamed):
+		'''
+			@param[in]: Dictionary of file names to scene names
+		'''
+		self.renamed = renamed
+		self.plugs = dict() # plug as written -> rewritten plug
+
+	def clear(self):
+		self.plugs = dict()
+
+	def node(self,name):
+		'''
+			@param[in]: Node name or DAG path as written in the file, may start with the root namespace ":"
+			@param[out]: Returns the name of the node in the scene
+		'''
+		if '|' in name:
+			return '|'.join([self.node(part) if part else part for part in name.split('|')])
+		renamed = self.renamed.get(name)
+		if renamed is None and name[:1] == ':':
+			renamed = self.renamed.get(name[1:])
+			if renamed is not None:
+				renamed = ':'+renamed
+		return name if renamed is None else renamed
+
+	def plug(self,plug):
+		'''
+			@param[in]: Plug "node.attribute" or a node name
+			@param[out]: Returns the plug with its node renamed
+		'''
+		result = self.plugs.get(plug)
+		if result is None:
+			nodeName,dot,attribute = plug.partition('.')
+			result = self.node(nodeName)+dot+attribute
+			self.plugs[plug] = result
+		return result
+
+	def command(self,line):
+		'''
+			@param[in]: Space separated arguments ie ConnectionRecord.command(), plugs may be quoted
+			@param[out]: Returns the arguments with the nodes renamed
+		'''
+		tokens = line.split(" ")
+		for t in range(len(tokens)):
+			token = tokens[t]
+			if token[:1] == '-':
+				continue
+			if len(token) > 1 and token[0] == '"' and token[-1] == '"':
+				tokens[t] = '"'+self.plug(token[1:-1])+'"'
+			else:
+				tokens[t] = self.plug(token)
+		return " ".join(tokens)
@@ -0,0 +1,538 @@
+# Maya Ascii Nodes
+# Description: Creates the nodes of a parsed scene through MDagModifier/MDGModifier in a single
+# doIt() and sets simple attribute values through MPlug, with out going through mel. Connects them
+# with one MDGModifier. Records what an import created so it can be undone and redone with one modifier.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiScene, MayaAsciiNodes, MayaAsciiMel
+scene = MayaAsciiScene.parseFile('C:/scenes/rig.ma')
+creator = MayaAsciiNodes.NodeCreator(scene=scene)
+for node in scene.nodes:
+	if node.nodeType in ('transform','joint'):
+		creator.add(node,node.name)
+creator.doIt()
+batch = MayaAsciiMel.MelBatch("Cant set attribute ")
+for node,name,mobject in creator.created:
+	creator.setAttributes(mobject,node.attributes,batch)
+batch.flush()
+# delete every created node
+creator.undoIt()
+
+# connections looked up once per plug and made with one modifier
+connections = MayaAsciiNodes.ConnectionBatch()
+for connection in scene.connections:
+	connections.add(connection.source,connection.destination,connection.nextAvailable,connection.command())
+connections.doIt()
+print(connections.summary())
+
+# undo/redo an import
+record = MayaAsciiNodes.ImportRecord()
+record.addCreator(creator)
+record.undoIt()
+record.redoIt()
+'''
+
+import maya.api.OpenMaya as oMaya
+from maya import cmds
+from MayaAsciiParser import MayaAsciiScene
+
+# setAttr data types a plug can take directly, everything else goes through mel
+_plugDataTypes = (None,'string','double2','double3','float2','float3','long2','long3','short2','short3')
+
+_unitSetters = {
+	oMaya.MFnUnitAttribute.kAngle: lambda plug,value: plug.setMAngle(oMaya.MAngle(value,oMaya.MAngle.uiUnit())),
+	oMaya.MFnUnitAttribute.kDistance: lambda plug,value: plug.setMDistance(oMaya.MDistance(value,oMaya.MDistance.uiUnit())),
+	oMaya.MFnUnitAttribute.kTime: lambda plug,value: plug.setMTime(oMaya.MTime(value,oMaya.MTime.uiUnit())),
+}
+_floatTypes = (oMaya.MFnNumericData.kFloat,oMaya.MFnNumericData.kDouble)
+_staticAttributes = dict() # (node type, attribute name) -> attribute MObject
+
+
+class NodeCreator():
+	'''
+		Queues createNode statements and runs them with one MDGModifier for dependency nodes and one
+		MDagModifier for DAG nodes. The modifiers are kept so undoIt() deletes every created node.
+	'''
+	# node type -> True for DAG node types
+	__dagTypes = dict()
+
+	def __init__(self,renamed=None,scene=None,objects=None):
+		'''
+			@param[in]: (Optional) Dictionary of file names to scene names, used to find parents created before
+			@param[in]: (Optional) MayaAsciiScene.SceneModel of the nodes, resolves the -p parents by DAG path
+			@param[in]: (Optional) Dictionary of the MObjects created by earlier NodeCreators, shared with this one
+		'''
+		self.dgModifier = oMaya.MDGModifier()
+		self.dagModifier = oMaya.MDagModifier()
+		self.renamed = renamed if renamed is not None else dict()
+		self.scene = scene
+		self.created = [] # (NodeRecord, name, MObject)
+		self.objects = objects if objects is not None else dict() # DAG path (name with out a scene) in the file -> MObject
+
+	@classmethod
+	def isDagType(cls,nodeType):
+		if nodeType not in cls.__dagTypes:
+			inherited = cmds.nodeType(nodeType,isTypeName=True,inherited=True) or []
+			cls.__dagTypes[nodeType] = 'dagNode' in inherited
+		return cls.__dagTypes[nodeType]
+
+	def add(self,node,name):
+		'''
+			Queues a node.
+
+			@param[in]: NodeRecord
+			@param[in]: Name to give the node
+			@param[out]: Returns the MObject, valid once doIt() ran
+		'''
+		if self.isDagType(node.nodeType):
+			parentObject = self.parentObject(node)
+			mobject = self.dagModifier.createNode(node.nodeType,parentObject)
+			self.dagModifier.renameNode(mobject,name)
+		else:
+			mobject = self.dgModifier.createNode(node.nodeType)
+			self.dgModifier.renameNode(mobject,name)
+		self.created.append( [node,name,mobject] )
+		self.objects[self.pathOf(node)] = mobject
+		return mobject
+
+	def pathOf(self,node):
+		'''
+			@param[in]: NodeRecord
+			@param[out]: Returns the key of the node in objects, its DAG path when the scene is known
+		'''
+		if self.scene is None:
+			return node.name
+		return self.scene.pathOf(node)
+
+	def parentObject(self,node):
+		'''
+			@param[in]: NodeRecord of a DAG node
+			@param[out]: Returns the parent MObject, kNullObj for the world
+		'''
+		if node.parent == "":
+			return oMaya.MObject.kNullObj
+		parentName = MayaAsciiScene.shortName(node.parent)
+		parent = self.scene.parentOf(node) if self.scene is not None else None
+		key = self.scene.pathOf(parent) if parent is not None else parentName
+		if key in self.objects:
+			return self.objects[key]
+		# created before this batch, possibly renamed
+		mSel = oMaya.MSelectionList()
+		mSel.add(self.renamed.get(node.parent,self.renamed.get(parentName,node.parent)))
+		return mSel.getDependNode(0)
+
+	def doIt(self):
+		'''
+			Creates every queued node.
+
+			@param[out]: Returns Array of (NodeRecord, name, MObject) with the names maya gave the nodes
+		'''
+		self.dgModifier.doIt()
+		self.dagModifier.doIt()
+		for entry in self.created:
+			entry[1] = oMaya.MFnDependencyNode(entry[2]).name()
+		return self.created
+
+	def undoIt(self):
+		'''
+			Deletes the created nodes.
+		'''
+		self.dagModifier.undoIt()
+		self.dgModifier.undoIt()
+
+	def setAttributes(self,mobject,attrs,batch):
+		'''
+			Sets the attribute values of a node. Values a plug can take are set directly, the rest
+			(flags, array sizes, typed data) is queued in the mel batch.
+
+			@param[in]: MObject of the node
+			@param[in]: Array of AttrRecords
+			@param[in]: MayaAsciiMel.MelBatch receiving the statements that need mel
+		'''
+		fnNode = oMaya.MFnDependencyNode(mobject)
+		nodeName = None
+		for attr in attrs:
+			if not setSimpleAttribute(fnNode,attr):
+				if nodeName is None:
+					nodeName = fnNode.name()
+				batch.add(attr.mel(nodeName))
+
+
+def setSimpleAttribute(fnNode,attr):
+	'''
+		Sets an attribute value through its plug.
+
+		@param[in]: MFnDependencyNode of the node
+		@param[in]: AttrRecord
+		@param[out]: Returns False when the value needs mel (nothing or only part of it was set)
+	'''
+	if not attr.hasValue or attr.size is not None or attr.flags or attr.dataType not in _plugDataTypes:
+		return False
+	if attr.dataType == 'string' and '\\' in attr.payload:
+		# escaped strings are left to mel
+		return False
+	try:
+		if '[' in attr.path or attr.path.count('.') > 1:
+			mSel = oMaya.MSelectionList()
+			mSel.add(fnNode.name()+attr.path)
+			plug = mSel.getPlug(0)
+		else:
+			plug = staticPlug(fnNode,attr.path[1:])
+		return setPlugValue(plug,attr.value)
+	except (RuntimeError,TypeError,ValueError):
+		return False
+
+
+def staticPlug(fnNode,name):
+	'''
+		Finds a plug through the attribute MObject cached per node type, the attribute name is looked
+		up once for all the nodes of a type (ie every lambert of a look-dev file).
+
+		@param[in]: MFnDependencyNode of the node
+		@param[in]: Attribute name
+		@param[out]: Returns MPlug
+	'''
+	key = (fnNode.typeName,name)
+	attribute = _staticAttributes.get(key)
+	if attribute is None:
+		plug = fnNode.findPlug(name,False)
+		# dynamic attributes differ from one node to the next
+		if not plug.isDynamic:
+			_staticAttributes[key] = plug.attribute()
+		return plug
+	return oMaya.MPlug(fnNode.object(),attribute)
+
+
+def setPlugValue(plug,value):
+	'''
+		@param[in]: MPlug
+		@param[in]: Decoded setAttr value (AttrRecord.value)
+		@param[out]: Returns False when the plug does not take this kind of value
+	'''
+	if plug.isCompound:
+		if not isinstance(value,list) or len(value) != plug.numChildren():
+			return False
+		for c in range(len(value)):
+			if not setPlugValue(plug.child(c),value[c]):
+				return False
+		return True
+	if isinstance(value,list):
+		return False
+	attribute = plug.attribute()
+	if isinstance(value,str):
+		if attribute.hasFn(oMaya.MFn.kTypedAttribute) and oMaya.MFnTypedAttribute(attribute).attrType() == oMaya.MFnData.kString:
+			plug.setString(value)
+			return True
+		return False
+	if attribute.hasFn(oMaya.MFn.kUnitAttribute):
+		setter = _unitSetters.get(oMaya.MFnUnitAttribute(attribute).unitType())
+		if setter is None:
+			return False
+		setter(plug,float(value))
+		return True
+	if attribute.hasFn(oMaya.MFn.kEnumAttribute):
+		plug.setInt(int(value))
+		return True
+	if attribute.hasFn(oMaya.MFn.kNumericAttribute):
+		numericType = oMaya.MFnNumericAttribute(attribute).numericType()
+		if numericType == oMaya.MFnNumericData.kBoolean:
+			plug.setBool(bool(value))
+		elif numericType in _floatTypes:
+			plug.setDouble(float(value))
+		else:
+			plug.setInt(int(value))
+		return True
+	return False
+
+
+class ConnectionBatch():
+	'''
+		Queues connections and makes them with one MDGModifier. Nodes are looked up once per name and
+		plugs once per plug name, so the plugs of a node connected many times are found once.
+		Connections that are already made are skipped, the ones that can not be made are kept in
+		failures with the reason so they are reported together instead of one print per edge.
+	'''
+
+	def __init__(self):
+		self.modifier = oMaya.MDGModifier()
+		self.objects = dict() # node name -> MObject, None when the scene has no such node
+		self.plugs = dict() # plug name -> MPlug, None when the node has no such plug
+		self.nextIndices = dict() # array plug name -> next logical index given to connectAttr -na
+		self.destinations = set() # destination plug names queued
+		self.queued = [] # (source MPlug, destination MPlug, source name, destination name, tag)
+		self.connections = [] # (source name, destination name) of the connections made
+		self.succeeded = [] # tags of the connections made
+		self.skipped = [] # tags of the connections that were already made
+		self.failures = [] # (tag, reason)
+
+	def node(self,name):
+		'''
+			@param[in]: Node name or DAG path
+			@param[out]: Returns the MObject, None when there is no such node
+		'''
+		if name not in self.objects:
+			mSel = oMaya.MSelectionList()
+			try:
+				mSel.add(name)
+				self.objects[name] = mSel.getDependNode(0)
+			except RuntimeError:
+				self.objects[name] = None
+		return self.objects[name]
+
+	def plug(self,name):
+		'''
+			@param[in]: Plug name "node.attribute[index].child"
+			@param[out]: Returns the MPlug, None when the plug can not be found
+		'''
+		if name not in self.plugs:
+			nodeName,dot,path = name.partition('.')
+			mobject = self.node(nodeName)
+			plug = None
+			if mobject is not None and path:
+				try:
+					plug = findPlug(oMaya.MFnDependencyNode(mobject),path)
+				except (RuntimeError,TypeError,ValueError):
+					# aliases and attributes only the selection list parses
+					try:
+						mSel = oMaya.MSelectionList()
+						mSel.add(name)
+						plug = mSel.getPlug(0)
+					except (RuntimeError,TypeError):
+						plug = None
+			self.plugs[name] = plug
+		return self.plugs[name]
+
+	def nextAvailable(self,name,plug):
+		'''
+			@param[in]: Array plug name
+			@param[in]: MPlug of the array
+			@param[out]: Returns the logical index after the last element, counting the ones given before
+		'''
+		index = self.nextIndices.get(name)
+		if index is None:
+			existing = plug.getExistingArrayAttributeIndices()
+			index = max(existing)+1 if len(existing) > 0 else 0
+		self.nextIndices[name] = index+1
+		return index
+
+	def add(self,source,destination,nextAvailable=False,tag=None,once=False):
+		'''
+			Queues a connection.
+
+			@param[in]: Source plug name
+			@param[in]: Destination plug name, the array plug with nextAvailable
+			@param[in]: (Optional) Connect to a new element of the destination array (connectAttr -na)
+			@param[in]: (Optional) Value reported in succeeded/skipped/failures for this connection
+			@param[in]: (Optional) With nextAvailable, skip the connection when the source already feeds an
+				element of the array (links like renderPartition.st a node only needs once)
+			@param[out]: Returns False when the connection can not be made
+		'''
+		sourcePlug = self.plug(source)
+		destinationPlug = self.plug(destination)
+		for name,plug in ((source,sourcePlug),(destination,destinationPlug)):
+			if plug is None:
+				nodeName = name.partition('.')[0]
+				if self.node(nodeName) is None:
+					self.failures.append( (tag,"missing node "+nodeName) )
+				else:
+					self.failures.append( (tag,"missing plug "+name) )
+				return False
+		if nextAvailable and destinationPlug.isArray:
+			if once and self.feeds(sourcePlug,destinationPlug):
+				self.skipped.append(tag)
+				return True
+			index = self.nextAvailable(destination,destinationPlug)
+			destinationPlug = destinationPlug.elementByLogicalIndex(index)
+			destination = "{0}[{1}]".format(destination,index)
+		elif destinationPlug.isDestination:
+			if destinationPlug.source() == sourcePlug:
+				self.skipped.append(tag)
+				return True
+			self.failures.append( (tag,"destination already connected") )
+			return False
+		if destination in self.destinations:
+			self.failures.append( (tag,"destination already connected") )
+			return False
+		try:
+			self.modifier.connect(sourcePlug,destinationPlug)
+		except (RuntimeError,TypeError) as e:
+			self.failures.append( (tag,"refused "+str(e)) )
+			return False
+		self.destinations.add(destination)
+		self.queued.append( (sourcePlug,destinationPlug,source,destination,tag) )
+		return True
+
+	def feeds(self,sourcePlug,arrayPlug):
+		'''
+			@param[in]: Source MPlug
+			@param[in]: Array MPlug
+			@param[out]: Returns True when the source is connected to an element of the array, queued connections included
+		'''
+		for connected in sourcePlug.destinations():
+			if connected.isElement and connected.array() == arrayPlug:
+				return True
+		for queuedSource,queuedDestination,source,destination,tag in self.queued:
+			if queuedSource == sourcePlug and queuedDestination.isElement and queuedDestination.array() == arrayPlug:
+				return True
+		return False
+
+	def doIt(self):
+		'''
+			Makes every queued connection.
+
+			@param[out]: Returns Array of the tags of the connections made
+		'''
+		queued = self.queued
+		modifier = self.modifier
+		self.queued = []
+		self.modifier = oMaya.MDGModifier()
+		try:
+			modifier.doIt()
+			made = queued
+		except RuntimeError:
+			# a connection was refused (ie a locked destination), the connections are made one at a time to find it
+			try:
+				modifier.undoIt()
+			except RuntimeError:
+				pass
+			made = []
+			for entry in queued:
+				sourcePlug,destinationPlug,source,destination,tag = entry
+				if destinationPlug.isDestination and destinationPlug.source() == sourcePlug:
+					made.append(entry)
+					continue
+				single = oMaya.MDGModifier()
+				try:
+					single.connect(sourcePlug,destinationPlug)
+					single.doIt()
+					made.append(entry)
+				except RuntimeError as e:
+					self.failures.append( (tag,"refused "+str(e)) )
+		for sourcePlug,destinationPlug,source,destination,tag in made:
+			self.connections.append( (source,destination) )
+			self.succeeded.append(tag)
+		return [entry[4] for entry in made]
+
+	def summary(self):
+		'''
+			@param[out]: Returns Dictionary of failure reasons to the tags of the connections that failed for it
+		'''
+		reasons = dict()
+		for tag,reason in self.failures:
+			reasons.setdefault(reason,[]).append(tag)
+		return reasons
+
+
+def findPlug(fnNode,path):
+	'''
+		Walks an attribute path down from the node, with out a selection list parse.
+
+		@param[in]: MFnDependencyNode of the node
+		@param[in]: Attribute path "attribute[index].child" with out the node name
+		@param[out]: Returns MPlug
+	'''
+	plug = None
+	for part in path.split('.'):
+		name,bracket,index = part.partition('[')
+		if plug is None:
+			plug = staticPlug(fnNode,name)
+		else:
+			plug = plug.child(fnNode.attribute(name))
+		if bracket:
+			plug = plug.elementByLogicalIndex(int(index[:-1]))
+	return plug
+
+
+class ImportRecord():
+	'''
+		What an import created, kept as MObjectHandles so the nodes are found again whatever they
+		got renamed to, and the connections it made between nodes it did not create. undoIt()
+		deletes the nodes with one modifier, redoIt() undoes that modifier which brings the nodes
+		and their connections back without importing the file again.
+	'''
+
+	def __init__(self):
+		self.handles = []
+		self.names = set() # names of the created nodes when they were recorded
+		self.connections = [] # (source plug, destination plug) between nodes not created here
+		self.modifier = None
+
+	def addObject(self,mobject):
+		'''
+			@param[in]: MObject of a created node
+		'''
+		self.handles.append(oMaya.MObjectHandle(mobject))
+		self.names.add(oMaya.MFnDependencyNode(mobject).name())
+
+	def addCreator(self,creator):
+		'''
+			@param[in]: NodeCreator that ran doIt()
+		'''
+		for node,name,mobject in creator.created:
+			self.addObject(mobject)
+
+	def addConnection(self,source,destination):
+		'''
+			Records a connection, connections of created nodes go away with the nodes and are skipped.
+
+			@param[in]: Source plug name
+			@param[in]: Destination plug name
+		'''
+		if MayaAsciiScene.shortName(source.split(".")[0]) in self.names:
+			return
+		if MayaAsciiScene.shortName(destination.split(".")[0]) in self.names:
+			return
+		self.connections.append( (source,destination) )
+
+	def deleteModifier(self):
+		'''
+			@param[out]: Returns MDagModifier disconnecting the recorded connections and deleting the created nodes
+		'''
+		modifier = oMaya.MDagModifier()
+		for source,destination in self.connections:
+			try:
+				mSel = oMaya.MSelectionList()
+				mSel.add(source)
+				mSel.add(destination)
+				modifier.disconnect(mSel.getPlug(0),mSel.getPlug(1))
+			except RuntimeError:
+				pass
+		alive = [h for h in self.handles if h.isValid() and h.isAlive()]
+		created = set(h.hashCode() for h in alive)
+		for handle in reversed(alive):
+			mobject = handle.object()
+			# children go with their created parents
+			if mobject.hasFn(oMaya.MFn.kDagNode) and hasAncestor(mobject,created):
+				continue
+			modifier.deleteNode(mobject)
+		return modifier
+
+	def undoIt(self):
+		'''
+			Deletes the created nodes.
+		'''
+		if self.modifier is None:
+			self.modifier = self.deleteModifier()
+		self.modifier.doIt()
+
+	def redoIt(self):
+		'''
+			Brings the nodes deleted by undoIt() back.
+		'''
+		if self.modifier is not None:
+			self.modifier.undoIt()
+
+
+def hasAncestor(mobject,hashes):
+	'''
+		@param[in]: MObject of a DAG node
+		@param[in]: Set of MObjectHandle hash codes
+		@param[out]: Returns True when a parent (at any depth) of the node is in the set
+	'''
+	fnDag = oMaya.MFnDagNode(mobject)
+	while fnDag.parentCount() > 0:
+		parent = fnDag.parent(0)
+		if oMaya.MObjectHandle(parent).hashCode() in hashes:
+			return True
+		fnDag = oMaya.MFnDagNode(parent)
+	return False
@@ -27,16 +27,27 @@ if(fileName != None):
 
 import maya.api.OpenMaya as oMaya
 import maya.api.OpenMayaAnim as oAnim
-import maya.api.OpenMayaRender as oMayaRender
-from string import digits
 import os
 from maya import cmds
-from maya import mel
 import re
 import inspect
+import contextlib
+from MayaAsciiParser import MayaAsciiTokenizer
+from MayaAsciiParser import MayaAsciiScene
+from MayaAsciiParser import MayaAsciiArrays
+from MayaAsciiParser import MayaAsciiMesh
+from MayaAsciiParser import MayaAsciiCache
+from MayaAsciiParser import MayaAsciiMel
+from MayaAsciiParser import MayaAsciiNodes
+from MayaAsciiParser import MayaAsciiNames
+from MayaAsciiParser import MayaAsciiProfiler
+from MayaAsciiParser import MayaAsciiShading
 
 class MayaAsciiParser():	
 	objectsImported = list()
+	record = None # MayaAsciiNodes.ImportRecord of the last import, undoes it
+	profiler = None # MayaAsciiProfiler.StageProfiler of the running import
+	report = None # stage report of the last import, see MayaAsciiProfiler.StageProfiler.report()
 	'''
 		publicly editable presets
 	'''
@@ -71,71 +82,39 @@ class MayaAsciiParser():
 	nodeNoDuplicate = ['file','shadingEngine','place2dTexture','place3dTexture']
 
 	connectblacklist = ['defaultRenderLayer']
+	# -na links a node needs once, skipped when the node already has one (ie a shading group linked when created)
+	connectOnce = ['renderPartition.st','defaultLightSet.dsm','defaultShaderList1.s','defaultTextureList1.tx','defaultRenderUtilityList1.u']
 	
 	__namedictionary__ = dict() #name comparitor incase nodes got remapped
 	__meshes__ = []
+	__materials__ = dict() # shading group name -> mesh path -> [MFnMesh, Array of face id arrays] queued by connectMeshToMaterial
 	__shaders__ = []	
 	__transforms__ = []
+	__transformIndex__ = dict() # DAG path of the transform in the file -> MFnTransform
+	workers = 0 # mesh decoding processes, 0 decodes on the main thread
+	useCache = True # read and write the parse cache
+	cacheDir = None # parse cache directory, None uses MayaAsciiCache.defaultCacheDir()
+	__parsed__ = None # MayaAsciiCache.ParsedScene being imported
+	__names__ = None # MayaAsciiNames.NameRegistry of the scene being imported into
+	__scene__ = None # MayaAsciiScene.SceneModel being imported, resolves the DAG paths of the nodes
+	__dagObjects__ = dict() # DAG path in the file -> MObject created by this import
+	colorRepresentations = {1:oMaya.MFnMesh.kAlpha,3:oMaya.MFnMesh.kRGB,4:oMaya.MFnMesh.kRGBA} # color set channels -> MFnMesh representation
+	normalizeWeights = False # let setWeights normalize the skin weights, False keeps the values of the file
+	__resolver__ = None # MayaAsciiNames.NameResolver of __namedictionary__, caches the rewritten plugs
+	failedConnections = [] # (connection, reason) of the connections the last import could not make
+	__networks__ = None # MayaAsciiShading.NetworkRegistry of the shading networks in the scene
+	__duplicates__ = [] # (ShadingNetwork, ShadingNetwork created in its place) of the networks found twice in the file
+	fingerprintNetworks = False # keep the fingerprints on the imported shading groups and reuse the networks of previous imports
 
 	def __init__(self):
 		pass
 		
-	def getTypeName(self,str):
-		'''
-			Returns the Node Type of the node.
-
-			@param[in]: Line of maya ascii
-			@param[out]: Returns a single string
-		'''
-		splitstring = str.split('\n')		
-		
-		splitstring = splitstring[0].split(" ")
-		return splitstring[0]
-	
-	def getNodeParent(self,str):
-		'''
-			Returns the parent name of a node.
-
-			@param[in]: Line of maya ascii
-			@param[out]: Returns a single string
-		'''
-		splitstring = str.split('\n')	
-		
-		namefound = splitstring[0]
-		if "-p \"" not in namefound and "-parent \"" not in namefound:
-			return ""
-		start = "-p \""
-		if ("-parent \"" in namefound):
-			start = "-parent \""
-		end = "\""
-		startIndex = namefound.find(start)+len(start)
-		return namefound[startIndex:namefound.find(end,startIndex) ]
-	
-	def getNodeName(self,str):
-		'''
-			Returns the node's name.
-
-			@param[in]: Line of maya ascii
-			@param[out]: Returns a single string
-		'''
-		splitstring = str.split('\n')
-		if len(splitstring) == 0:
-			return None
-		namefound = splitstring[0]
-		start = "-n \""
-		if ("-name" in namefound):
-			start = "-name \""
-		end = "\""
-		startIndex = namefound.find(start)+len(start)
-		return namefound[startIndex:namefound.find(end,startIndex) ]
-	
-	def filterNodes(self,parsedlist,connectionList):
+	def filterNodes(self,scene):
 		'''
 			Iterates through every node and sorts out what the nodes that needs to be
 			processed.
 
-			@param[in]: Array
-			@param[in]: Array of connection commands
+			@param[in]: SceneModel of the parsed file
 			@param[out]: Returns List of meshes
 			@param[out]: Returns list of paired shader groups
 			@param[out]: Returns skin nodes
@@ -148,405 +127,57 @@ class MayaAsciiParser():
 		skinnodes = []
 		othernodes = []
 		transforms = []
-		for i in range(len(parsedlist)):
-			if i > 0:				
-				nodeType = self.getTypeName(parsedlist[i])
-				nodeName = self.getNodeName(parsedlist[i])						
-				if (nodeName not in self.nameblacklist) and (nodeType not in self.nodeblacklist):
-					if nodeType == 'skinCluster':
-						skinnodes.append(parsedlist[i])
-						continue
-					if nodeType == 'transform':
-						transforms.append(parsedlist[i])
-					if nodeType == 'mesh':
-						# insert createNode string back 					
-						transformname = self.getNodeParent(parsedlist[i])												
-						meshlist.append(parsedlist[i])
-						meshlist.append(transformname)
-						continue
-					elif nodeType == 'shadingEngine':		
-						nodeName = self.getNodeName(parsedlist[i])					
-						cons = self.findConnectionsTo(nodeName+".",connectionList)					
-						for c in range(len(cons)):
-							plugname = self.getPlugName(cons[c][0])
-							plugConnectedTo = cons[c][1].split(".")						
-							if( plugname == 'surfaceShader' or plugname == 'ss' ):
-								# find the shader													
-								shaderNode,index = self.findNodeName(parsedlist,plugConnectedTo[0])										
-								
-						shaders.append( (parsedlist[i],shaderNode) )
+		for node in scene.nodes:
+			nodeType = node.nodeType
+			nodeName = node.name
+			if (nodeName not in self.nameblacklist) and (nodeType not in self.nodeblacklist):
+				if nodeType == 'skinCluster':
+					skinnodes.append(node)
+				elif nodeType == 'transform':
+					transforms.append(node)
+				elif nodeType == 'mesh':
+					meshlist.append(node)
+				elif nodeType == 'shadingEngine':
+					# find the shader
+					shaderNode = None
+					for con in scene.sourcesOf(nodeName+".ss")+scene.sourcesOf(nodeName+".surfaceShader"):
+						shaderNode = scene.findNode(con.sourceNode)
+					if shaderNode is None:
+						othernodes.append(node)
 					else:
-						othernodes.append(parsedlist[i])
-					
-		return meshlist,shaders,skinnodes,transforms,othernodes
-	
-	def findNodeName(self,parsedlist,search):
-		'''
-			Searches for a node based on its name.
-
-			@param[in]: Array of nodes
-			@param[in]: Node name to search for
-			@param[out]: Returns the whole Node entry (Empty string if not found)
-			@param[out]: Returns the array index of the node (-1 if not found)
-		'''
-		for i in range(len(parsedlist)):
-			if i > 0:
-				nodeName = self.getNodeName(parsedlist[i])
-				if nodeName == search:
-					return parsedlist[i],i
-		return "",-1
-			
-
-	def getAttributeValue(self,line,attributeLabel,end=" "):
-		'''
-			Returns Attribute value tagged with its label -attributename "attributevalue".
-
-			@param[in]: Line of maya ascii
-			@param[in]: Attribute name to retrieve values from , best when paired with self.longOrShortNames() 
-			@param[in]: (Optional) Termination string usually a space or a ";"
-			@param[out]: Returns the string value of the attribute
-		'''
-		
-		try:			
-			startIndex = line.find(attributeLabel)+len(attributeLabel)		
-		except:			
-			raise Exception("ERROR cant get attribute label "+attributeLabel+" in line "+line)
-		return line[startIndex:line.find(end,startIndex)]
-
-
-	def longOrShortNames(self,line,labels):		
-		'''
-			Searches for the attribute label based on its alternate names ['-sn','-longname'] and returns the detected
-			version of the label.
-
-			@param[in]: Line of maya ascii
-			@param[in]: Array string indices of attribute names and their alternates
-			@param[in]: Returns the detected label found in the node
-		'''
-		for l in labels:
-			if l in line:
-				return l
-		return None
+						shaders.append( (node,shaderNode) )
+				else:
+					othernodes.append(node)
 
-	def getEdgeID(self,value):		
-		'''
-			Determines if the edge is flipped or not and returns the correct edge ID.
+		return meshlist,shaders,skinnodes,transforms,othernodes
 
-			@param[in]: EdgeID
-			@param[out]: (int) Returns Real EdgeID
-			@param[out]: (boolean) Returns if the edge is flipped
-		'''
-		flipped = False
-		if (value < 0):
-			flipped = True
-		edgeID = int(value)
-		if flipped:
-			#https://cgkit.sourceforge.net/doc2/mayaascii.html#polyface
-			edgeID = -edgeID-1
-		return edgeID,flipped
+	
 	
 
 	
 	
-	def parseMesh(self,maMel):	
+	def parseMesh(self,node,data=None):	
 		'''
-			Parses the Maya ascii node and generates the necessary arrays to build a mesh.
+			Builds a mesh out of the decoded Maya ascii node.
 
-			@param[in]: Line of maya ascii containing a mesh createNode
+			@param[in]: NodeRecord of a mesh
+			@param[in]: (Optional) MeshData already decoded for the node, decoded here when not given
 			@param[out]: Returns mesh DAG Object
 			@param[out]: Returns material Face Assignment components
-			@param[out]: Returns vertex tweaks in vectors
 
 		'''
-		#https://help.autodesk.com/cloudhelp/2025/CHS/Maya-Tech-Docs/CommandsPython/setAttr.html
 		#https://help.autodesk.com/view/MAYAUL/2022/ENU/?guid=Maya_SDK_py_ref_class_open_maya_1_1_m_fn_mesh_html		
-		faceCount = 0
-		edgeCount = 0
-		vertCount = 0
-		uvnames = []
-		uvsets = []
-		uvsetsHoles = dict()
-		verts = []
-		edges = []
-		faces = []	
-		faceVertexIDs=[]			
-		normals = []
-		normals2 = []				
-		allEdges = []
-		allEdgeFaceDesc = []
-		allEdgeFaceConnects = []
-		allEdgeConnectionCount = []
-		allFacesVIDs=[]
-		fs = [] # faceIDs
-		mus = [] # uvfaces		
-		holes = [] # holes		
-		colors = dict() # colors		
-		vertexIDList = []
-		materialFaceAssignment = dict()
-		tweaks = []
-				
-		
-		commandlines = maMel.split(";")		
-		otherAttribs = []
-		for i in range(len(commandlines)):			
-			lines = commandlines[i]+";"
-
-			# UV Map Name			
-			if('".uvSet' in lines or '".uvst' in lines)  and ('-type "string"' in lines):
-				# new UV Map named found								
-				UVname = self.getAttributeValue(lines,'-type "string" "','";')
-				uvnames.append(UVname)
-				continue
-
-			# UV Components
-			if ('.uvSetPoints' in lines or '.uvsp' in lines):				
-				if '.uvsp";' in lines or '.uvSetPoints";' in lines :
-					continue
-
-				if '-type "float2"' in lines:
-					uvpoints = self.getAttributeValue(lines,'-type "float2" ',';')					
-				else:
-					uvpoints = self.getAttributeValue(lines,'" ',';')	
-					
-				uvpoints = re.sub(r"[\n\t]*", "", uvpoints)	
-				if('Attr' in uvpoints):
-					raise Exception("Invalid UV return ",lines)
-				# if this is a continuation in a segmented list append results ie [0:34] + [35:90]
-				if (len(uvnames) == len(uvsets)):
-					currentIndex = len(uvsets)-1
-					currentlist = uvsets[currentIndex]
-					uvsets[currentIndex] = currentlist +" "+ uvpoints										
-				else:					
-					uvsets.append(uvpoints)		
-				continue			
-
-			# Component Tweaks
-			if '".pnts' in lines or '".pt' in lines :
-				tweaks.append(lines)
-				continue
-
-			# Vertex Components
-			if '".vrts'	in lines or '".vt' in lines:
-				# parse Verts
-				try:
-					tempC = int( self.getAttributeValue(lines,self.longOrShortNames(lines,["-s ","-size "])))
-					vertCount = tempC
-				except:
-					pass
-				if '".vt";' in lines or '".vrts";' in lines:
-					#skip this has no entries
-					continue
-				vertPoints = self.getAttributeValue(lines,'" ',";")
-				vertData = re.sub(r"[\n\t]*", "", vertPoints).strip().split(" ")				
-				vlen = int(len(vertData)/3)
-				
-				for v in range(vlen):
-					vIndex = len(verts)
-					mPoint = oMaya.MPoint()
-					mPoint.x = vertData[v*3]
-					mPoint.y = vertData[(v*3) + 1]
-					mPoint.z = vertData[(v*3) + 2]
-					verts.append(mPoint)
-					
-				continue
-					
-			
-			# Edge Component
-			if '".edge' in lines or '".ed' in lines:
-				# parse Edges
-				try:
-					tempC = int(self.getAttributeValue(lines,self.longOrShortNames(lines,["-s ","-size "])))
-					edgeCount = tempC					
-				except:
-					pass
-				if '".ed";' in lines or '".edge";'in lines:
-					# empty
-					continue
-				edgesraw = self.getAttributeValue(lines,']" ',";")				
-				edgesraw = list(map( int, re.sub(r"[\n\t]*", "", edgesraw).strip().split(" ")))
-				#tokenize edges				
-				edgeLen = int(len(edgesraw)/3)
-				
-				dv = int(len(edgesraw) / edgeLen)				
-				for ei in range(edgeLen):
-					edges.append(edgesraw[ei*dv:(ei*dv)+dv])
-				continue
-
-			# Face Component
-			if  '".face' in lines or '".fc' in lines:						
-				# parse Faces				
-				try:
-					tempC = int(self.getAttributeValue(lines,self.longOrShortNames(lines,["-s ","-size "])))	
-					faceCount = tempC
-				except:
-					pass
-				if '".face";' in lines or '".fc";' in lines:
-					# empty
-					continue
-				
-				facesData = self.getAttributeValue(lines,'-type "polyFaces" ',";").strip()									
-				faces =  re.sub(r"[\t]*", "", facesData).strip().split("\n")				
-				# get face components 
-				currentMode = "f"
-				currentModeB = "f"
-				findex = 0
-				mindex = 0
-				hindex = 0
-				cindex = 0
-				for ff in faces:	
+		if data is None:
+			data = MayaAsciiMesh.decodeMesh(node)
+		vertCount = data.vertCount
+		edgeCount = data.edgeCount
+		edges = data.edges
+		normals = data.normals
+		topology = data.topology
+		uvnames = data.uvNames
+		verts = oMaya.MFloatPointArray(MayaAsciiArrays.group(data.points,3))
+		allFacesVIDs = topology.faceConnects
 						
-					if 'mc'	in ff:
-						currentMode = 'mc'
-						# add face index where this thing lines up with
-						carray = list(map(int,ff.split(" ")[1:]))								
-						try:
-							colors[findex].append(carray)
-						except:
-							colors[findex] = [carray]
-						
-					elif 'h' in ff:
-						# Faces can have multiple holes						
-						currentMode = 'h'
-						currentModeB = currentMode
-						# add face index where this thing lines up with
-
-						harray = [findex]+list(map(int,ff.split(" ")[2:]))						
-						hindex = len(holes)
-						holes.append(harray)
-
-						
-					elif 'f' in ff:
-						currentMode = 'f'	
-						currentModeB = currentMode
-						fuarray = list(map(int,ff.split(" ")[1:]))
-						findex = len(fs)
-						fs.append(fuarray)					
-						
-					elif 'mu' in ff:
-						# check if this UV is for a face or a hole.		
-						currentMode = 'mu'				
-						if currentModeB == 'f':
-							muarray = list(map(int,ff.split(" ")[1:]))																				
-							mindex = len(mus)
-							mus.append(muarray)
-						else:							
-							# hole , figure out multi uvs 
-							muarray = list(map(int,ff.split(" ")[1:]))	
-							try:
-								uvsetsHoles[findex].append(muarray)
-							except:
-								uvsetsHoles[findex] = [muarray]						
-					
-					elif currentMode == 'mc':
-						carray = list(map(int,ff.split(" ")[1:]))
-						colors[findex][-1] += carray
-						
-					elif currentMode == 'h':
-						harray = list(map(int,ff.split(" ")[1:]))						
-						holes[hindex] += harray
-
-						#faceHole[findex] += harray	
-						
-					elif currentMode == 'f':						
-						fuarray = list(map(int,ff.split(" ")[1:]))						
-						fs[findex] += fuarray
-						
-					elif currentMode == "mu":
-						if currentModeB == 'f':
-							muarray = list(map(int,ff.split(" ")[1:]))						
-							mus[mindex] += muarray
-						else:
-							#todo: holes
-							
-							muarray = list(map(int,ff.split(" ")[1:]))						
-							uvsetsHoles[findex][-1] += muarray
-						
-							
-							
-					
-				continue
-
-			#	Normals Component
-			if '".normals' in lines or '".n' in lines:				
-				#normals per face vertex
-				try:
-					normSize = int(self.getAttributeValue(lines,self.longOrShortNames(lines,["-s ","-size "])))	
-				except:
-					pass				
-				if '".normals";' in lines or '".n";' in lines:
-					continue
-				normalData = self.getAttributeValue(lines,'-type "float3" ',";").strip()	
-				try:							
-					normalData = list(map( float, re.sub(r"[\n\t]*", "", normalData).split(' ')))					
-				except Exception as e:
-					raise Exception("problem parsing normal data ",lines)
-				normSize = int(len(normalData)/3)
-				for n in range(normSize):					
-					vNormal = oMaya.MVector()
-					vNormal.x = normalData[ 0 + (n*3) ]
-					vNormal.y = normalData[ 1 + (n*3) ]
-					vNormal.z = normalData[ 2 + (n*3) ]
-					normals.append(vNormal)
-					normals2.append( [vNormal.x,vNormal.y,vNormal.z] )
-				continue
-
-			# 	Material Assignments
-			if ('".instObjGroups[0].objectGroups";' in lines or  '".iog[0].og";' in lines):
-				continue
-			elif ('".instObjGroups[0].objectGroups' in lines or '".iog[0].og' in lines):
-				materialData = self.getAttributeValue(lines,'-type "componentList"',';').strip()
-				#materialData = re.sub(r"[\n\tf\[\]\"]*", "", materialData) # convert "[32:50]" to 32:50
-				materialData = re.sub(r"[\n\t\"]*", "", materialData) # convert "[32:50]" to 32:50
-				materialData = materialData.split(" ")
-				materialFaceSize = int(materialData.pop(0))
-				
-				materialIndex = 0
-				if '".instObjGroups[0].objectGroups' in lines:
-					materialIndex = int(self.getAttributeValue(lines,'.instObjGroups[0].objectGroups[','].objectGrpCompList"'))
-				else:
-					materialIndex = int(self.getAttributeValue(lines,'.iog[0].og[','].gcl"'))				
-				materialFaceAssignment[materialIndex] = materialData
-				continue
-
-			#everything else goes here
-			if i == 0:
-				meshparent = self.getNodeParent(lines)
-			if i > 0 and 'rename ' not in lines:			
-				otherAttribs.append(lines)
-
-		for e in range(edgeCount):			
-			allEdges = allEdges + edges[e][0:2]							
-
-		
-		if faceCount == 0:
-			faceCount = len(fs)				
-
-		for f in range(faceCount):						
-			fd = fs[f]# fs[f].split(" ")
-			pcount = fd[0]#int(fd[1])									
-			faceVIDs = [0] * pcount
-			edgeIDList = []
-			
-					
-			for eid in range(pcount):	
-							
-				edgeID,flipped = self.getEdgeID(fd[1+eid])				
-				
-				if flipped:					
-					faceVIDs[eid] = int(edges[edgeID][1])
-					allEdgeFaceDesc.append(1) 					
-				else:
-					faceVIDs[eid] = int(edges[edgeID][0])
-					allEdgeFaceDesc.append(0) 				
-				edgeIDList.append(edgeID)
-
-			hcount = 0	
-			
-			allEdgeConnectionCount.append(pcount+hcount)	
-			allFacesVIDs = allFacesVIDs + faceVIDs
-			faceVertexIDs.append(faceVIDs)
-			allEdgeFaceConnects = allEdgeFaceConnects + edgeIDList
-					
 		'''	
 		Create mesh node		
 		'''				
@@ -554,240 +185,108 @@ class MayaAsciiParser():
 		mesh = oMaya.MFnMesh()		
 		parent = None
 		# assigning parent object fails.				
-		for t in self.__transforms__:
-				parentName,groupOBJ = t				
-				if(parentName == meshparent):					
-					parent = groupOBJ
+		parentNode = self.__scene__.parentOf(node)
+		parent = self.__transformIndex__.get(self.__scene__.pathOf(parentNode)) if parentNode is not None else None
 		
-		mesh.create( verts , allEdges , allEdgeConnectionCount , allEdgeFaceConnects , allEdgeFaceDesc,  parent=parent.object())		
+		mesh.create( verts , 
+			oMaya.MIntArray(MayaAsciiMesh.edgeVertices(edges)) , 
+			oMaya.MIntArray(topology.faceCounts) , 
+			oMaya.MIntArray(topology.faceEdges) , 
+			list(topology.faceFlips),  parent=parent.object())		
 		
-		#add holes
-		for h in range(len(holes)):
-			holeEdges = holes[h]
-			
-			faceID = -1
-			vertexlist = []#set()
-			for e in range(len(holeEdges)):
-				if e == 0:					
-					faceID = holeEdges[e]
-					
-					
-				if e > 0 :
-					edgeID,flipped = self.getEdgeID(holeEdges[e])					
-					if flipped:
-						vertexlist.append(edges[edgeID][1])										
-					else:
-						vertexlist.append(edges[edgeID][0])				
-						
-									
-			#vertexlist = list(vertexlist)
+		#add holes, every loop of a face in one call
+		holeOffset = 0
+		h = 0
+		while h < topology.holeCount:
+			faceID = topology.holeFaces[h]
 			points = []
-			for v in range(len(vertexlist)):				
-				points.append(verts[vertexlist[v]])
-									
-			mesh.addHoles(faceID,points,[len(points)],False)						
+			loopCounts = []
+			while h < topology.holeCount and topology.holeFaces[h] == faceID:
+				holeSize = topology.holeCounts[h]
+				for v in topology.holeConnects[holeOffset:holeOffset+holeSize]:
+					points.append(verts[v])
+				loopCounts.append(holeSize)
+				holeOffset += holeSize
+				h += 1
+			mesh.addHoles(faceID,points,loopCounts,False)						
 		
-		uvmapcount = len(uvnames)
-		for uvn in range(uvmapcount):
+		for uvn in sorted(uvnames.keys()):
 			#print("Attempting UV maps ",uvmapcount," ",uvnames[uvn])
 			if uvnames[uvn] != "map1":
 				mesh.createUVSet(uvnames[uvn])		
-			uvw = []
-			uvv = []
-			uvsize=[]
 			
-			if uvn >= len(uvsets):
-				if (len(uvsets) == 0):
-					continue
-				
-				uvsets[uvn] = uvsets[uvn].strip();											
+			if uvn not in data.uvPoints:
 				#print("WARNING this mesh may have construction history. missing UV assignments")
 				continue
 			else:				
-				uvpoints = list(map(float, uvsets[uvn].split(" ") ))
-				uvcount = int(len(uvpoints)/2)
-				for uvp in range(uvcount):				
-					u = uvpoints[0 + (uvp * 2) ]
-					v = uvpoints[1 + (uvp * 2) ]				
-					uvw.append(u)
-					uvv.append(v)				
-				uvids = []
-				faceID = 0
-				for m in range(len(mus)):									
-					muis = mus[m]					
-					if muis[0] == uvn:	
-						vcount = muis[1]					
-						uvsize.append(vcount)																				
-						uvids += muis[2:]	
-						
-						try:
-							#handles multiple holes per face
-							holeFaceUV = uvsetsHoles[faceID]
-							for hUV in range(len(holeFaceUV)):
-								if holeFaceUV[hUV][0] == uvn:									
-									uvsize[-1] = uvsize[-1] + holeFaceUV[hUV][1]						
-									uvids += holeFaceUV[hUV][2:]
-						except:
-							pass
-						
-						faceID += 1
+				uvpoints = data.uvPoints[uvn]
+				uvw = oMaya.MFloatArray(uvpoints[0::2])
+				uvv = oMaya.MFloatArray(uvpoints[1::2])
+				uvsize,uvids = data.uvAssignments[uvn]
 
-				# // Todo add holes in UV
 				mesh.setUVs(uvw,uvv,uvnames[uvn])	
 
 				try:								
-					mesh.assignUVs(uvsize,uvids,uvnames[uvn])	
+					mesh.assignUVs(oMaya.MIntArray(uvsize),oMaya.MIntArray(uvids),uvnames[uvn])	
 				except:
 					print("Unable to assign UVs to  ",mesh.partialPathName(),uvnames[uvn])
 
-		# if normals counts equal to vertex count it means per vertex normals
-		if len(normals) == vertCount:
-			for aindex in range(len(normals)):
-				vertexIDList.append(aindex)
-			mesh.setVertexNormals(normals,vertexIDList)
-			
-		else:
-			if len(normals) > 0:			
-				allNormals = oMaya.MVectorArray(normals)						
-				#condense the perFace vertex normals to a per Vertex shared normals.			
-				allFacesVIDs = oMaya.MIntArray(allFacesVIDs)
-				# this doesn't work.  setFaceVertexNormals is bugged
-				#
-				# mesh.setFaceVertexNormals(allNormals,allFaceIDs,allFacesVIDs)		
-				#
-				# this is the work around to do it per vertex
-				#
-				vertNormals = []
-				for aindex in range(len(allFacesVIDs)):
-					vindex = allFacesVIDs[aindex]	
-					try:
-						vertNormals.append(allNormals[aindex])
-						vertexIDList.append(vindex)	
-					except:
-						pass
-						
-				mesh.setVertexNormals(vertNormals,vertexIDList)
-					
-			
-					
-			
-						
-		# Edge Normals
-		for eid in range(edgeCount):		
-			edgeSmooth = False
-			if int(edges[eid][2]) == 1:
-				edgeSmooth = True	
-			mesh.setEdgeSmoothing(eid,edgeSmooth)					
-		mesh.cleanupEdgeSmoothing()		
+		# Edge Normals, before the normals so cleaning up the smoothing does not reset them
+		edgeIds,edgeSmooths = MayaAsciiMesh.edgeSmoothing(edges)
+		if len(edgeIds) > 0:
+			mesh.setEdgeSmoothings(oMaya.MIntArray(edgeIds),edgeSmooths)
+		mesh.cleanupEdgeSmoothing()
+
+		# normals are written per face-vertex, only the ones maya did not compute get locked
+		normalCount = int(len(normals)/3)
+		faceVertexCount = len(allFacesVIDs)+len(topology.holeConnects)
+		if normalCount == vertCount and normalCount != faceVertexCount:
+			# per vertex normals
+			mesh.setVertexNormals(oMaya.MVectorArray(MayaAsciiArrays.group(normals,3)),oMaya.MIntArray(range(normalCount)))
+		elif normalCount > 0:
+			faceNormals,normalFaces,normalVertices = MayaAsciiMesh.faceVertexNormals(normals,topology)
+			if len(normalFaces) > 0:
+				mesh.setFaceVertexNormals(oMaya.MVectorArray(MayaAsciiArrays.group(faceNormals,3)),
+					oMaya.MIntArray(normalFaces),oMaya.MIntArray(normalVertices))
 		mesh.updateSurface()		
 		meshName = mesh.name()
-		colorDictionary = dict()
-		
-		for m in range(len(otherAttribs)):
-			refabstring = otherAttribs[m].replace('".', '"{0}.'.format(meshName)).strip()	
-			refabstring = re.sub(r"[\n\t;]*", "", refabstring)
-			if ('.colorName' in refabstring  and '.colorSet' in refabstring) or ('.clsn'in refabstring and '.clst' in refabstring):
-				colorName = self.getAttributeValue(refabstring,'-type "string" "',';')
-				if '.colorName' in refabstring:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.colorSet[','].colorName"'))				
-				else:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.clst[','].clsn"'))						
-				if colorSetIndex not in colorDictionary.keys():
-					colorDictionary[colorSetIndex] = [colorName,4,list(),oMaya.MColorArray(),list(),list()] # 4 channels , ColorPoints, Output Colors, OutputFaceIDs , OutputVertexIDs
-			if ('.colorSet' in refabstring and '.representation' in refabstring) or ('.clst' in refabstring and '.rprt' in refabstring):
-				if 'representation' in refabstring:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.colorSet[','].representation'))
-					colorRep = self.getAttributeValue(refabstring+";",'].representation" ',";")
-				else:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.clst[','].rprt'))
-					colorRep = self.getAttributeValue(refabstring+";",'].rprt" ',";")
-				
-				try:					
-					colorDictionary[colorSetIndex][1] = int(colorRep)
-				except:
-					# sometimes if there is a construction history for the color set the representation becomes a place holder.
-					pass
-			elif ('.colorSetPoints' in refabstring) or ('.clsp' in refabstring):
-				refab = refabstring+";"
-				if ('.clsp";' in refab) or ('.colorSetPoints";' in refab):							
-					continue
-
-				if '.colorSetPoints' in refabstring:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.colorSet[','].colorSetPoints'))
-				else:
-					colorSetIndex = int(self.getAttributeValue(refabstring,'.clst[','].clsp'))
-
-				colorValues = self.getAttributeValue(refabstring+";",']" ',"; ").split(" ")
-				colorValues = list(filter(None, colorValues))
-				#tokenize array of numbers				
-				colorDictionary[colorSetIndex][2] += colorValues; #colorLists
-				
 
+		# Color sets, every call names its set so colors never land on the current set of a previous one
+		defaultColor = mesh.currentColorSetName()
+		existingSets = mesh.getColorSetNames()
+		for colorSetIndex in sorted(data.colorNames.keys()):
+			colorName = data.colorNames[colorSetIndex]
+			channels = data.colorChannels.get(colorSetIndex,4)
+			representation = self.colorRepresentations.get(channels,oMaya.MFnMesh.kRGBA)
+			if colorName not in existingSets:
+				colorName = mesh.createColorSet(colorName,False,representation)
+			colorValues = data.colorPoints.get(colorSetIndex)
+			if colorValues is None or colorSetIndex not in data.colorAssignments:
+				continue
+			colorTuples = MayaAsciiArrays.group(colorValues,channels)
+			if channels == 1:
+				# alpha only
+				colorTuples = [(0.0,0.0,0.0,a[0]) for a in colorTuples]
+			colors = oMaya.MColorArray([oMaya.MColor(c) for c in colorTuples])
 			try:
-				mel.eval(refabstring)
+				mesh.setColors(colors,colorName,representation)
+				mesh.assignColors(oMaya.MIntArray(data.colorAssignments[colorSetIndex]),colorName)
 			except Exception as e:
-				print("Cant set attribute ",refabstring)
-				print(e)				
-				#raise Exception("Error mesh attrib",refabstring)
-
-		# Color sets	
-		defaultColor = mesh.currentColorSetName()
-		colorSetPoints = 2		
-		outputColors = 3
-		outputColorFaces = 4
-		outputColorVertexes = 5
-		#tokenize values
-		for colorSetIndex,value in colorDictionary.items():
-			colorValues = colorDictionary[colorSetIndex][2]
-			colorRep = colorDictionary[colorSetIndex][1]
-			colorIndexes = int(len(colorValues) / colorRep)
-			colorLists = []
-			
-			for c in range(colorIndexes):
-				mColor = oMaya.MColor()
-				mColor.r = float(colorValues[ (c * colorRep) + 0 ])
-				mColor.g = float(colorValues[ (c * colorRep) + 1 ])
-				mColor.b = float(colorValues[ (c * colorRep) + 2 ])
-				if colorRep > 3:
-					mColor.a = float(colorValues[ (c * colorRep) + 3 ])					
-				colorLists.append(mColor)
-			colorDictionary[colorSetIndex][2] = colorLists
-
-		for faceID,value in colors.items():					
-			faceColors = value			
-			vertexIDs = faceVertexIDs[faceID]	
-			for fc in range(len(faceColors)):
-				colorSetIndex = int(faceColors[fc][0])
-				colorCount = faceColors[fc][1]
-				colorItems = faceColors[fc][2:]		
-				
-				for fi in range(len(colorItems)):
-					vertID = vertexIDs[fi]	
-					
-					if colorItems[fi] != -1:						
-						mColor = colorDictionary[colorSetIndex][colorSetPoints][ colorItems[fi] ] 						
-						colorDictionary[colorSetIndex][outputColors].append(mColor)
-						colorDictionary[colorSetIndex][outputColorVertexes].append(vertID)				
-						colorDictionary[colorSetIndex][outputColorFaces].append(faceID)							
-
-		for colorSetIndex,value in colorDictionary.items():					
-			mesh.setCurrentColorSetName( colorDictionary[colorSetIndex][0])					
-			mesh.clearColors()
-			
-			if len(colorDictionary[colorSetIndex][outputColors]) > 0:				
-				mesh.setFaceVertexColors( 
-					colorDictionary[colorSetIndex][outputColors], 
-					colorDictionary[colorSetIndex][outputColorFaces],
-					colorDictionary[colorSetIndex][outputColorVertexes])
-			mesh.updateSurface()
-		
+				print("Unable to assign colors to  ",mesh.partialPathName(),colorName,e)
 		try:
-			mesh.setCurrentColorSetName( defaultColor )		
+			if defaultColor != "":
+				mesh.setCurrentColorSetName( defaultColor )
 		except:
 			pass
-				
 
-		return mesh, materialFaceAssignment, tweaks
+		# after the color sets so their indices match the file
+		batch = MayaAsciiMel.MelBatch("Cant set attribute ")
+		for attr in data.otherAttribs:
+			batch.add(attr.mel(meshName))
+		batch.flush()
+
+		return mesh, data.materialFaceAssignment
+
 	
 
 	def createTransformNodes(self,parsedList):
@@ -796,496 +295,460 @@ class MayaAsciiParser():
 			Instantiates Transform nodes from a list of tranform nodes. Any nodes that generates a new name will update
 			a name dictionary for later connection redirects.
 
-			@param[in]: Array of Create Nodes
+			@param[in]: Array of transform NodeRecords
 			
 		'''
-		for i in range(len(parsedList)):
-			transformData = parsedList[i]
-			nodeName = self.getNodeName(transformData)
-			lines = transformData.split(";")
-			resultname = nodeName
-			for l in range(len(lines)):
-				line = lines[l]
-				if 'rename ' not in line:
-					if l == 0 :
-						#filter renamed entities
-						newName = self.incrimentNodeName(nodeName)
-						self.__namedictionary__[nodeName] = newName
-						line = self.retargetRenamedEntities(line)
-						resultname = mel.eval("createNode "+line)												
-						mSel = oMaya.MSelectionList()
-						mSel.add(resultname)
-						parentOBJ = mSel.getComponent(0)
-						parentOBJ = oMaya.MFnTransform(parentOBJ[0])							
-						
-						self.__transforms__.append( (nodeName,parentOBJ))												
-					else:
-						if 'setAttr' in line:
-							attrib = line.split(" ")
-						refabstring = line.replace('".', '"{0}.'.format(resultname))
-						mel.eval(refabstring)
+		batch = MayaAsciiMel.MelBatch("Cant set attribute ")
+		creator = MayaAsciiNodes.NodeCreator(self.__namedictionary__,self.__scene__,self.__dagObjects__)
+		for node in parsedList:
+			nodeName = node.name
+			#filter renamed entities
+			newName = self.incrimentNodeName(nodeName)
+			try:
+				creator.add(node,newName)
+			except Exception as e:
+				print("Unable to create ",nodeName,e)
+		created = creator.doIt()
+		self.record.addCreator(creator)
+		for node,resultname,mobject in created:
+			nodeName = node.name
+			self.__namedictionary__[nodeName] = resultname
+			self.__names__.add(resultname)
+			parentOBJ = oMaya.MFnTransform(oMaya.MDagPath.getAPathTo(mobject))
+			
+			self.__transforms__.append( (nodeName,parentOBJ))												
+			self.__transformIndex__[self.__scene__.pathOf(node)] = parentOBJ
+			for command in node.addAttrCommands(resultname):
+				batch.add(command)
+		# dynamic attributes exist before their values are set
+		batch.flush()
+		for node,resultname,mobject in created:
+			creator.setAttributes(mobject,node.attributes,batch)
+		batch.flush()
+
 
 	
 	def connectMeshToMaterial(self,mesh,shaderGroup="initialShadingGroup",faceset=[]):
 		'''
-			Connects the Mesh and its faces to its designated materials.
+			Queues the Mesh and its faces for its designated materials, assignMaterials() adds them
+			to the shading groups.
 
 			@param[in]: Mesh DAG Node
 			@param[in]: Shader Group name
-			@param[in]: Array of mesh face components in maya's component format ie "shapenodeName.f[0:23]"
+			@param[in]: Array of face ids (MeshData.materialFaceAssignment), empty assigns the whole mesh
 		'''
-		shadersel = oMaya.MSelectionList()
-		shadersel.add(shaderGroup)		
-		mshadingGroup = shadersel.getDependNode(0)
-		print("shading group",shaderGroup)		
-		setFn = oMaya.MFnSet(mshadingGroup)				
-		mshadersel = oMaya.MSelectionList()		
-		if len(faceset) == 0:
-			mshadersel.add(mesh.fullPathName())						
-		else:			
-			for f in range(len(faceset)):			
-				fs = mesh.name()+"."+faceset[f]									
-				mshadersel.add( fs )
-		try:
-			setFn.addMembers( mshadersel )
-		except:
-			print(" unable to apply face materials to ",mesh.name()," shaderGroup ",shaderGroup," faces ",faceset)
-		
+		members = self.__materials__.setdefault(shaderGroup,dict())
+		path = mesh.fullPathName()
+		if path not in members:
+			members[path] = [mesh,[]]
+		members[path][1].append(faceset)
+
+	def assignMaterials(self):
+		'''
+			Adds the queued meshes and faces to their shading groups, with one MFnSet.addMembers
+			per shading group.
+
+			@param[out]: Returns the number of shading groups assigned
+		'''
+		assigned = 0
+		for shaderGroup,members in self.__materials__.items():
+			mshadersel = oMaya.MSelectionList()
+			try:
+				shadersel = oMaya.MSelectionList()
+				shadersel.add(shaderGroup)
+				setFn = oMaya.MFnSet(shadersel.getDependNode(0))
+			except RuntimeError:
+				print("Unable to find shading group ",shaderGroup," for ",len(members)," meshes")
+				continue
+			for path,(mesh,facesets) in members.items():
+				if any(len(faces) == 0 for faces in facesets):
+					mshadersel.add(mesh.getPath())
+					continue
+				components = oMaya.MFnSingleIndexedComponent()
+				componentOBJ = components.create(oMaya.MFn.kMeshPolygonComponent)
+				for faces in facesets:
+					components.addElements(list(faces))
+				mshadersel.add( (mesh.getPath(),componentOBJ) )
+			try:
+				setFn.addMembers( mshadersel )
+				assigned += 1
+			except RuntimeError as e:
+				print("Unable to apply face materials of ",len(members)," meshes to ",shaderGroup,e)
+		self.__materials__ = dict()
+		return assigned
+
 
 
 	def incrimentNodeName(self,name):
 		'''
 			Takes a Node name and add an incriment prefix if its not unique.
+			The name is reserved in __names__ so the following nodes will not pick it.
 		
 			@param[in]: Node name to make Unique
 			@param[out]: Returns a string of a new Unique name
 		'''
-		if cmds.objExists(name):							
-				meshName = name.rstrip(digits)
-				incs = 1;
-				newMeshName = meshName+str(incs)
-				while cmds.objExists( newMeshName ):					
-					incs += 1
-					newMeshName = meshName+str(incs)
-				return newMeshName
-		else:
-			return name
+		return self.__names__.unique(name)
 		
 
 
-	def getPlugName(self,str):
-		'''
-			Returns the connecting attribute name.
-
-			@param[in]: dag and plug path  "mynode.attributeplug"
-			@param[out]: Returns the plug name  "attributeplug"
-		'''
-		plugpaths = str.split(".")
-		return plugpaths[1]
-	
-
-
 	def createMeshNodes(self,parsedlist):
 		'''
 			Iterates througha list of mesh create nodes and create the mesh nodes and sort them into a list.
 			
-			@param[in]: Array of Mesh Nodes in maya Ascii createnodes			
+			@param[in]: Array of mesh NodeRecords
 		'''
 		ms = []		
-		
-		for i in range(0,len(parsedlist),2):
-			meshName = self.getNodeName(parsedlist[i])						
-			parentName = parsedlist[i+1]								
+		# the meshes were decoded by readScene (or loaded from the cache), only the MFnMesh construction runs here
+		for node in parsedlist:
+			data = self.__parsed__.meshData(node)
+			meshName = node.name
+			parentName = node.parent
 			oldMeshName = meshName			
-			meshOBJ,faceMaterial,vertextweaks = self.parseMesh(parsedlist[i] )												
-			self.__meshes__.append( (oldMeshName,meshOBJ,faceMaterial,parentName,vertextweaks) )
-			if cmds.objExists(meshName):							
-				meshName = meshName.rstrip(digits)
-				meshName+="#"
+			meshOBJ,faceMaterial = self.parseMesh(node,data)												
+			self.__meshes__.append( (oldMeshName,meshOBJ,faceMaterial,parentName) )
+			meshName = self.incrimentNodeName(meshName)
 			meshOBJ.setName(meshName)
 			meshName = meshOBJ.name()
+			self.__names__.add(meshName)
+			self.record.addObject(meshOBJ.object())
 			self.__namedictionary__[oldMeshName] = meshName
 			ms.append(meshOBJ.fullPathName())			
 			
-
-	def applyVertexTweaks(self):
-		'''
-			Apply vertex position tweaks to each mesh registered in __meshes__
-			This is done after the create nodes are parsed and processed.
-		'''
-		for mesh in self.__meshes__:
-			meshOBJ = mesh[1]
-			tweaks = mesh[4]	
-			meshname = meshOBJ.name()		
-			refabstring = ""				
-			for line in tweaks:
-				refabstring += line.replace('".', '"{0}.'.format(meshname)).strip()+"\n"
-			mel.eval(refabstring)
-			
 			
-	
+
 	def createShaderNodes(self,parsedlist):
 		'''
-			Instantiate shaders and its shader group pair.
+			Instantiate the shading networks, the shaders, their shader groups and the texture nodes
+			upstream of them. Every node is created by one modifier, then each network gets its
+			attribute values and its connections in one pass.
 		
-			@param[in]: Array of Shader Groups and Shaders to instantiate
+			@param[in]: Array of MayaAsciiShading.ShadingNetworks to instantiate
+			@param[out]: Returns Array of the mel statements that ran
 		'''
 		#use  self.namedictionary to keep track of name changes
-		for i in range(len(parsedlist)):			
-			shaderGroupRaw = parsedlist[i][0]
-			shaderRaw = parsedlist[i][1]
-			shaderGroupName = self.getNodeName(shaderGroupRaw)
-			shaderName = self.getNodeName(shaderRaw)
-			shaderType = self.getTypeName(shaderRaw)
-			print("Creating ",shaderGroupName,shaderName,shaderType)
-			if(shaderName == ""):
-				raise Exception("WTF not a valid shader",parsedlist[i])
-			material = cmds.shadingNode(shaderType, name=shaderName, asShader=True)			
-			sg = cmds.sets(name=shaderGroupName,empty=True,renderable=True,noSurfaceShader=True)		
-			cmds.connectAttr("%s.outColor" % material, "%s.surfaceShader" % sg)			
-			shaderValues = re.sub(r"[\n\t]*","", shaderRaw).strip().split(";")			
-			for s in range(len(shaderValues)):
-				if 'setAttr' in shaderValues[s]:
-					attrib = shaderValues[s].split(" ")
-					refabstring = shaderValues[s].replace('".', '"{0}.'.format(shaderName))
-					try:					
-						mel.eval(refabstring)
-					except:
-						print("Unable to set attribute ",refabstring)
-			self.__shaders__.append((shaderGroupName,shaderName,shaderType))
+		batch = MayaAsciiMel.MelBatch("Unable to set attribute ")
+		creator = MayaAsciiNodes.NodeCreator(self.__namedictionary__,self.__scene__,self.__dagObjects__)
+		for network in parsedlist:
+			for node in network.nodes:
+				try:
+					creator.add(node,self.incrimentNodeName(node.name))
+				except Exception as e:
+					print("Unable to create ",node.name,e)
+		created = creator.doIt()
+		self.record.addCreator(creator)
+		objects = dict() # name in the file -> MObject
+		for node,resultname,mobject in created:
+			objects[node.name] = mobject
+			self.__namedictionary__[node.name] = resultname
+			self.__names__.add(resultname)
+			for command in node.addAttrCommands(resultname):
+				batch.add(command)
+		# dynamic attributes exist before their values are set
+		batch.flush()
+
+		resolver = MayaAsciiNames.NameResolver(self.__namedictionary__)
+		connections = MayaAsciiNodes.ConnectionBatch()
+		for network in parsedlist:
+			for node in network.nodes:
+				if node.name in objects:
+					creator.setAttributes(objects[node.name],node.attributes,batch)
+			for connection in network.connections:
+				connections.add(resolver.plug(connection.source),resolver.plug(connection.destination),connection.nextAvailable)
+			shaderGroupName = resolver.node(network.shadingGroup.name)
+			# what sets -renderable does for the shading groups it creates
+			connections.add(shaderGroupName+".pa",":renderPartition.st",True,None,True)
+			fingerprint = network.fingerprint()
+			if self.fingerprintNetworks and fingerprint is not None and network.shadingGroup.name in objects:
+				# left on the shading group so the next imports reuse the network
+				names = [resolver.node(name) for name in network.canonicalNames()]
+				batch.add('addAttr -ln "{0}" -dt "string" "{1}";'.format(MayaAsciiShading.FINGERPRINT_ATTRIBUTE,shaderGroupName))
+				batch.add('addAttr -ln "{0}" -dt "string" "{1}";'.format(MayaAsciiShading.NODES_ATTRIBUTE,shaderGroupName))
+				batch.add('setAttr -type "string" "{0}.{1}" "{2}";'.format(shaderGroupName,MayaAsciiShading.FINGERPRINT_ATTRIBUTE,fingerprint))
+				batch.add('setAttr -type "string" "{0}.{1}" "{2}";'.format(shaderGroupName,MayaAsciiShading.NODES_ATTRIBUTE," ".join(names)))
+				self.__networks__.add(fingerprint,names)
+			self.__shaders__.append((shaderGroupName,resolver.node(network.shader.name),network.shader.nodeType))
+		batch.flush()
+		connections.doIt()
+		if len(connections.failures) > 0:
+			print("Unable to connect ",len(connections.failures)," shading network plugs")
+		# copies of a network in the file use the nodes created for the first one
+		for network,original in self.__duplicates__:
+			for name,originalName in zip(network.canonicalNames(),original.canonicalNames()):
+				self.__namedictionary__[name] = self.__namedictionary__.get(originalName,originalName)
+		return batch.succeeded
+
 
-		
-	#https://forum.highend3d.com/t/create-node-in-api/38810
-	#connection centric.		
 	def makeConnections(self,connections):
 		'''
 		
-			Parse the array connections and connect the nodes
-
-			@param[in]: Array of Connection nodes in maya ascii format
-
-		'''
-		successConnections = []
-		for c in range(len(connections)):
-			con = connections[c].split(" ")
-			skip = False
-			for m in range(len(self.__meshes__)):
-				meshEntry = self.__meshes__[m]
-				oldMeshName = meshEntry[0]
-				meshOBJ = meshEntry[1]
-				faceMaterials = meshEntry[2]
-				if( oldMeshName+"." in con[0]):					
-					matIndex = -1
+			Parse the array connections and connect the nodes. Material assignments of the imported
+			meshes go to their faces, every other connection is made with one MDGModifier.
+
+			@param[in]: Array of ConnectionRecords
+			@param[out]: Returns Array of the connections made "source destination [-na]"
+
+		'''
+		# every node is created, the renames are final
+		self.__resolver__ = MayaAsciiNames.NameResolver(self.__namedictionary__)
+		resolver = self.__resolver__
+		meshes = dict() # original mesh name -> __meshes__ entries, several for shapes sharing a name under different parents
+		for entry in self.__meshes__:
+			meshes.setdefault(entry[0],[]).append(entry)
+		engine = MayaAsciiNodes.ConnectionBatch()
+		for connection in connections:
+			meshEntry = self.findMeshEntry(meshes,connection.sourceNode)
+			if meshEntry is not None:
+				plug = connection.sourcePlug
+				if plug.startswith('instObjGroups.objectGroups[') or plug.startswith('iog.og['):
 					#this is a material assignment to our faces
-					if '.instObjGroups.objectGroups[' in con[0]:																		
-						matIndex = int(self.getAttributeValue(con[0],'.instObjGroups.objectGroups[',']'))
-					elif '.iog.og[' in con[0]:						
-						matIndex = int(self.getAttributeValue(con[0],'.iog.og[',']'))
-						
-					if matIndex == -1:
-						continue	
-
-					connectionname = re.sub(r"[:]*", "", con[1].split(".")[0] )
-					connectedSG = self.__namedictionary__[ connectionname ]							
-					if matIndex > -1:									
-						self.connectMeshToMaterial(meshOBJ,connectedSG,faceMaterials[matIndex])						
-					else:
-						self.connectMeshToMaterial(meshOBJ,connectedSG,[])
-					skip = True
-			#skip = True
-			if skip == False:
-				
-				connections[c] = self.retargetRenamedEntities(connections[c])
-				connectinstring = re.sub(r"[:]*", "", connections[c])					
-
-				cons = connectinstring.split(" ")
-				sideA = cons[0].split(".")[0]
-				sideA_node = cons[0].split(".")[1]
-				sideB = cons[1].split(".")[0]
-				if ":default" not in con[0] and sideA not in self.connectblacklist:
-					
-					if cmds.objExists(sideA) and cmds.objExists(sideB):						
-						if cmds.isConnected(cons[0],cons[1]) == False:
-							result = None
-							# exceptions goes here
-							if sideA_node == 'midLayerParent':
-								continue
-							if sideA == 'shapeEditorManager':								
-								continue
-								
-							
-							try:
-								result = mel.eval("connectAttr "+connections[c])
-								successConnections.append(connections[c])								
-								#print("Connecting Success ",connections[c],":",result)
-							except:								
-								#print("Error executing ",connections[c],"::",cmds.isConnected(cons[0],cons[1]), sideA , sideB )
-								pass
-					else:
-						if cmds.objExists(sideA) == False:
-							print("Can't find connections for ",sideA)
-						if cmds.objExists(sideB) == False:
-							print("Can't find connections for ",sideB)
-
-		return successConnections
+					matIndex = int(plug[plug.rindex('[')+1:-1])
+					connectedSG = self.__namedictionary__.get(connection.destinationNode,connection.destinationNode)
+					self.connectMeshToMaterial(meshEntry[1],connectedSG,meshEntry[2][matIndex])
+					continue
+			if ":default" in connection.source:
+				continue
+			sourceNode = resolver.node(connection.sourceNode)
+			# exceptions goes here
+			if sourceNode in self.connectblacklist or sourceNode == 'shapeEditorManager':
+				continue
+			if connection.sourcePlug.split(".")[0] == 'midLayerParent':
+				continue
+			connectionString = resolver.command(connection.command())
+			once = MayaAsciiScene.stripRootNamespace(connection.destination) in self.connectOnce
+			engine.add(resolver.plug(connection.source),resolver.plug(connection.destination),connection.nextAvailable,connectionString,once)
+		engine.doIt()
+		self.failedConnections = engine.failures
+		for reason,failed in engine.summary().items():
+			print("Unable to make {0} connections, {1}: {2}{3}".format(len(failed),reason,", ".join(failed[:5])," ..." if len(failed) > 5 else ""))
+		for source,destination in engine.connections:
+			self.record.addConnection(source,destination)
+		return engine.succeeded
 	
 
-	def getAllConnectAttr(self,maMel):
+	def findMeshEntry(self,meshes,sourceNode):
 		'''
-			Formats the connection entry
-
-			@param[in]: Connection node in maya ascii format
-			@param[out]: Returns Array of the constituant parts of the connection with out quotes
-		'''
-		lines = maMel.split(";")
-		results = []
-		for line in lines:
-			if "connectAttr" in line:
-				connectString = line.split("connectAttr")[-1].strip()
-				connectString = re.sub(r"[\n\t\"]*", "", connectString)
-				results.append( connectString )
-		return results
-	
-
-	def findConnectionsTo(self,sourceName,connectionList,exact=False):
+			@param[in]: Dictionary of original mesh names to __meshes__ entries
+			@param[in]: Connection source node, a name or a DAG path "|grp|geoShape"
+			@param[out]: Returns the __meshes__ entry of the mesh or None
 		'''
-			Find A connection either from the left or right side of the connection list.
+		entries = meshes.get(MayaAsciiScene.shortName(sourceNode))
+		if entries is None:
+			return None
+		if len(entries) == 1 or '|' not in sourceNode:
+			return entries[0]
+		# shapes sharing a name, the one whose parent ends the path
+		for entry in entries:
+			if sourceNode.endswith("|"+entry[3].lstrip("|")+"|"+entry[0]):
+				return entry
+		for entry in entries:
+			if sourceNode.endswith("|"+MayaAsciiScene.shortName(entry[3])+"|"+entry[0]):
+				return entry
+		return entries[0]
 
-			@param[in]: Source name
-			@param[in]: Array of Connection list nodes in maya ascii format
-			@param[in]: (Optional) Use Exact matches
-			@param[out]: Returns Array of results
-		'''
-		results = []
-		for con in connectionList:
-			if sourceName in con:
-				connections = con.strip().split(" ")
-				conPointA = -1
-				conPointB = -1
-				connectionFormatted = []
-				# format the result to a (Source)Left to Right(Target)
-				if exact:
-					for a in range(len(connections)):
-						if sourceName == connections[a]:						
-							conPointA = a
-							connectionFormatted.append(connections[a])
-							break
-					for b in range(len(connections)):
-						if sourceName != connections[b]:
-							conPointB = b
-							connectionFormatted.append(connections[b])
-							break
-				else:
-					for a in range(len(connections)):
-						if sourceName in connections[a]:						
-							conPointA = a
-							connectionFormatted.append(connections[a])
-							break
-					for b in range(len(connections)):
-						if sourceName not in connections[b]:
-							conPointB = b
-							connectionFormatted.append(connections[b])
-							break
-				if conPointA !=-1 and conPointB != -1:
-					results.append(connectionFormatted)
-		return results
 
 	def findExistingShaders(self,shaderlist):
 		'''
-			Filters out already existing shaders from the list 
+			Filters out the shading networks already in the scene, found by their fingerprint (node
+			types, attribute values and connections) whatever their names are. A network found twice
+			in the file is created once, the copies are mapped onto it by createShaderNodes.
 		
-			@param[in]: Array of shaders parsed from the maya file
-			@param[out]: Return array of cleared Shaders that have no duplicates or existing shaders
-			@param[out]: Return array of clashing Shaders that already exists
+			@param[in]: Array of MayaAsciiShading.ShadingNetworks parsed from the maya file
+			@param[out]: Return array of cleared ShadingNetworks that have no duplicates or existing shaders
+			@param[out]: Return array of reused Shaders that already exists (shader group, shader, shader type)
 		'''	
 		notFoundList = []
 		alreadyExists = []
-		for s in shaderlist:						
-			shaderGroupName = self.getNodeName(s[0])			
-			shaderName = self.getNodeName(s[1])			
-			print("Looking for ",shaderGroupName,shaderName)			
-			self.__namedictionary__[shaderGroupName] = shaderGroupName
-			self.__namedictionary__[shaderName] = shaderName
-			shaderType = self.getTypeName(s[1])		
-			if shaderName == "":
-				if cmds.objExists(shaderGroupName):
-					alreadyExists.append( (shaderGroupName,shaderName,shaderType) )
-			elif cmds.objExists( shaderGroupName )  and cmds.objExists( shaderName ) and cmds.objectType( shaderGroupName ) == "shadingEngine" and cmds.objectType( shaderName) == shaderType:				
-				alreadyExists.append( (shaderGroupName,shaderName,shaderType) )
-			else:				
-				notFoundList.append(s)
+		created = dict() # fingerprint -> ShadingNetwork created by this import
+		self.__duplicates__ = []
+		self.__networks__ = self.scanNetworks() if self.fingerprintNetworks else MayaAsciiShading.NetworkRegistry()
+		for network in shaderlist:						
+			fingerprint = network.fingerprint()
+			existing = self.__networks__.find(fingerprint)
+			if existing is not None and not self.matchesNetwork(network,existing):
+				# edited since it was imported, the stored fingerprint no longer describes it
+				self.__networks__.remove(fingerprint)
+				existing = None
+			if existing is not None:
+				# the existing network is used as is, its nodes keep their names
+				for name,existingName in zip(network.canonicalNames(),existing):
+					self.__namedictionary__[name] = existingName
+				alreadyExists.append( (self.__namedictionary__[network.shadingGroup.name],self.__namedictionary__[network.shader.name],network.shader.nodeType) )
+			elif fingerprint is not None and fingerprint in created:
+				self.__duplicates__.append( (network,created[fingerprint]) )
+			else:
+				if fingerprint is not None:
+					created[fingerprint] = network
+				notFoundList.append(network)
 			
 		return notFoundList,alreadyExists
 
+	def scanNetworks(self):
+		'''
+			Reads the fingerprints the previous imports left on their shading groups. Networks whose
+			nodes were renamed or deleted since are left out, the others are checked against the
+			network being imported by matchesNetwork.
+
+			@param[out]: Returns MayaAsciiShading.NetworkRegistry
+		'''
+		registry = MayaAsciiShading.NetworkRegistry()
+		nodeIt = oMaya.MItDependencyNodes(oMaya.MFn.kShadingEngine)
+		while not nodeIt.isDone():
+			fnNode = oMaya.MFnDependencyNode(nodeIt.thisNode())
+			if fnNode.hasAttribute(MayaAsciiShading.FINGERPRINT_ATTRIBUTE) and fnNode.hasAttribute(MayaAsciiShading.NODES_ATTRIBUTE):
+				fingerprint = fnNode.findPlug(MayaAsciiShading.FINGERPRINT_ATTRIBUTE,False).asString()
+				names = fnNode.findPlug(MayaAsciiShading.NODES_ATTRIBUTE,False).asString().split()
+				if all(self.__names__.exists(name) for name in names):
+					registry.add(fingerprint,names)
+			nodeIt.next()
+		return registry
+
+	def matchesNetwork(self,network,existing):
+		'''
+			Checks the nodes of an existing network still have the types and connections of the network
+			with the same fingerprint. Attribute values edited since the import are not compared.
+
+			@param[in]: MayaAsciiShading.ShadingNetwork parsed from the maya file
+			@param[in]: Array of the existing node names in canonical order
+			@param[out]: Returns True when the existing network can stand in for the parsed one
+		'''
+		names = dict(zip(network.canonicalNames(),existing))
+		nodes = dict((node.name,node) for node in network.nodes)
+		if len(names) != len(nodes):
+			return False
+		for name,existingName in names.items():
+			if cmds.nodeType(existingName) != nodes[name].nodeType:
+				return False
+		for connection in network.connections:
+			source = names.get(MayaAsciiScene.shortName(connection.sourceNode))
+			destination = names.get(MayaAsciiScene.shortName(connection.destinationNode))
+			if source is None or destination is None or connection.nextAvailable:
+				continue
+			try:
+				if not cmds.isConnected(source+"."+connection.sourcePlug,destination+"."+connection.destinationPlug):
+					return False
+			except RuntimeError:
+				return False
+		return True
 
-	def retargetRenamedEntities(self,strings):		
-		'''
-
-			Retarget connections to the newly renamed nodes
-
-			@param[in]: Line of maya ascii nodes to retarget
-			@param[out]: Returns the string of filtered and redirected nodes
-		'''
-		strings = strings.split(" ")
-		for a in range(len(strings)):
-			if '"' in strings[a] :
-				quoteds = re.findall('"([^"]*)"', strings[a])
-				quoteds = quoteds[0].split(".") # only one quoted string per entry anyways
-				for q in range(len(quoteds)):
-					for i, key in enumerate(self.__namedictionary__):
-						if self.__namedictionary__[key] != key and  key == quoteds[q]:
-							quoteds[q] = self.__namedictionary__[key]
-				strings[a] = '"'+ ".".join(quoteds) + '"'
-			else:
-				subattributes = strings[a].split(".")
-				for q in range(len(subattributes)):
-					for i, key in enumerate(self.__namedictionary__):
-						if self.__namedictionary__[key] != key and  key == subattributes[q]:
-							subattributes[q] = self.__namedictionary__[key]
-							#print("old name found in connection ",key," converting to ",self.__namedictionary__[key], strings)
-				strings[a] = ".".join(subattributes)		
-		return " ".join(strings)
-
-	
 
-	
 	def createOtherNodes(self,otherlist,exception):
 		'''
 			For other nodes not exclussively filtered this will attempt to instantiate them. If any of these
 			return a warning it may mean the nodes are using attributes that can only be used during I/O scene loading
 
-			@param[in]: Array of maya ascii nodes to instantiate that were not picked up by the filters
-			@param[in]: Array of node names to ignore
+			@param[in]: Array of NodeRecords to instantiate that were not picked up by the filters
+			@param[in]: Set of node names to ignore (the shading network nodes)
 			@param[out]: Returns Array DAG Nodes of successfully created nodes
 			@param[out]: Returns Array of created Blend Shape nodes
 		'''
 		otherNodes = []
 		blendshapes = []
-		for o in range(len(otherlist)):
-			nodeType = self.getTypeName(otherlist[o])
-			nodeName = self.getNodeName(otherlist[o])
+		batch = MayaAsciiMel.MelBatch()
+		creator = MayaAsciiNodes.NodeCreator(self.__namedictionary__,self.__scene__,self.__dagObjects__)
+		for node in otherlist:
+			nodeType = node.nodeType
+			nodeName = node.name
 			#filter out shaders and shape transforms
 			skip = False			
-			if cmds.objExists(nodeName) and nodeType in self.nodeNoDuplicate:
+			if self.__names__.exists(nodeName) and (nodeType in self.nodeNoDuplicate or '-s' in node.flags or '-shared' in node.flags):
+				# shared nodes are not duplicated by createNode -s
 				continue
-			if nodeType in exception:
+			if nodeName in exception:
 				continue
-			for s in range(len(self.__shaders__)):
-				if nodeType == self.__shaders__[s][2]:
-					skip = True
-				if nodeName == self.__shaders__[s][0]:
-					skip = True
-			for t in range(len(self.__transforms__)):
-				if nodeName == self.__transforms__[t][0]:
-					skip = True
+			if self.__scene__.pathOf(node) in self.__transformIndex__:
+				skip = True
 			
 			if nodeType == 'skinCluster':
 				skip = True
 			
 			if skip:
 				continue
-			# Skinning
-			
-				
-			# Remove -rename -r 
-			lines = otherlist[o].split(";") #otherlist[o].splitlines()
-			filtered = []
-			resultname = nodeName
-			for l in range(len(lines)):				
-				line = lines[l]
-				if 'rename ' not in line:
-					#find self reference  ' ".  ' and replace with node name					
-					if l == 0 :
-						#filter renamed entities						
-						newName = self.incrimentNodeName(nodeName)						
-						self.__namedictionary__[nodeName] = newName
-						line = self.retargetRenamedEntities(line)																													
-						resultname = mel.eval("createNode "+line)												
-
-						#print(nodeType," Creating node ",nodeName," -> ",resultname)
-						if resultname != newName:
-							raise Exception("New Name didn't match the desired name {0}->{1}".format(newName,resultname))
-						if nodeType == "blendShape":
-							blendshapes.append( (nodeName,resultname))
-						otherNodes.append(resultname)
-						
-					else:
-						#setAttribs
-						refabstring = line.replace('".', '"{0}.'.format(resultname))
-
-						# Blend Shape exceptions
-						if(('-shortName' in line and '-longName' in line) or ('-sn' in line and '-ln' in line)):							
-							shortname = self.getAttributeValue(line,self.longOrShortNames(line,["-sn ","-shortName "]) )
-							longname = self.getAttributeValue(line,self.longOrShortNames(line,["-ln ","-longName "]) )							
-							if shortname == '"aal"' and longname == '"attributeAliasList"':
-								# reserved attributes created at I/O time
-								continue	
-							
-							
-						if nodeType == "blendShape":							
-							if '".aal"' in line or '".attributeAliasList"' in line:
-								#Blend Shape Aliases
-								aliasses = self.getAttributeValue(line,'-type "attributeAlias"',";").replace("weight[", resultname+".weight[")
-								aliasses = aliasses.split(" ")[2:]
-								resultatt = mel.eval('aliasAttr '+ " ".join(aliasses))								
-								continue
-						try:
-							mel.eval(refabstring)
-						except:
-							pass
+
+			#filter renamed entities						
+			newName = self.incrimentNodeName(nodeName)						
+			try:
+				creator.add(node,newName)
+			except Exception as e:
+				print("Unable to create ",nodeName,e)
+
+		created = creator.doIt()
+		self.record.addCreator(creator)
+		for node,resultname,mobject in created:
+			nodeType = node.nodeType
+			nodeName = node.name
+			self.__namedictionary__[nodeName] = resultname
+			self.__names__.add(resultname)
+			#print(nodeType," Creating node ",nodeName," -> ",resultname)
+			if nodeType == "blendShape":
+				blendshapes.append( (nodeName,resultname))
+			otherNodes.append(resultname)
+
+			for command in node.addAttrCommands(resultname):
+				# Blend Shape exceptions
+				tokens = MayaAsciiTokenizer.splitArguments(command)
+				if ('"aal"' in tokens and '"attributeAliasList"' in tokens):
+					# reserved attributes created at I/O time
+					continue
+				batch.add(command)
+		# dynamic attributes exist before their values are set
+		batch.flush()
+
+		for node,resultname,mobject in created:
+			attributes = node.attributes
+			if node.nodeType == "blendShape":
+				attributes = [attr for attr in attributes if attr.leaf not in ('aal','attributeAliasList')]
+			creator.setAttributes(mobject,attributes,batch)
+			for attr in node.attributes:
+				if node.nodeType == "blendShape" and attr.leaf in ('aal','attributeAliasList'):
+					#Blend Shape Aliases {"alias","weight[0]","alias2","weight[1]"}
+					aliasses = re.findall('"([^"]*)"', attr.payload)
+					# the weights being aliased are created by the queued setAttr
+					batch.flush()
+					for a in range(0,len(aliasses)-1,2):
+						cmds.aliasAttr(aliasses[a],resultname+"."+aliasses[a+1])
+		batch.flush()
 		return otherNodes,blendshapes							
 			
+			
 	def createSkins(self,skinNodes):
 		'''		
 			Instantiates a list of Skin deformers and sorts out their weight and influences
 
-			@param[in]: Array of maya ascii skin nodes 
+			@param[in]: Array of skinCluster NodeRecords
 			@param[out]: Array of Skin DAG Nodes
 
 		'''
 		skinobjects = []
-		for s in range(len(skinNodes)):					
-			skinName = ""
-			newName = skinName
-			skindata = skinNodes[s].split(";")
-			weightslist = []
-			for l in range(len(skindata)):
-				skinaAttrib = skindata[l]+";"
-				if l == 0:
-					skinName = self.getNodeName(skindata[l])										
-					newName = mel.eval("createNode "+skindata[l].strip())
-					
-					self.__namedictionary__[skinName] = newName
-				else:					
-					#insert objectName into attributes
-					skinaAttrib = skinaAttrib.replace('".', '"{0}.'.format(newName))
-					
-					if '";' in skinaAttrib:
-						continue					
-					
-					skinaAttrib = re.sub(r"[\t]*", "", skinaAttrib)					
-					skinaAttrib = " ".join(skinaAttrib.splitlines())
-					
-					if '.weightList' in skinaAttrib:
-						#copy weights list.
-						skinaAttrib = self.getAttributeValue(skinaAttrib,'weights" ',';')							
-						weightslist += list(filter(str.strip, skinaAttrib.split(" ") )) 
-						
-					elif '.wl' in skinaAttrib:						
-						#copy weights list.
-						skinaAttrib = self.getAttributeValue(skinaAttrib,'w" ',';')	
-						weightslist  += list(filter(str.strip, skinaAttrib.split(" ") )) 
-					else:
-						try:
-							mel.eval(skinaAttrib)
-						except:							
-							pass
+		batch = MayaAsciiMel.MelBatch()
+		creator = MayaAsciiNodes.NodeCreator(self.__namedictionary__,self.__scene__,self.__dagObjects__)
+		for node in skinNodes:
+			creator.add(node,self.incrimentNodeName(node.name))
+		created = creator.doIt()
+		self.record.addCreator(creator)
+		for node,newName,mobject in created:
+			skinName = node.name
+			weightslist = MayaAsciiArrays.allocate(0,MayaAsciiArrays.DOUBLE)
+			self.__namedictionary__[skinName] = newName
+			self.__names__.add(newName)
+			decodedWeights = self.__parsed__.skinWeights(node)
+			if decodedWeights is not None:
+				weightslist = decodedWeights
+			for attr in node.attributes:
+				if not attr.hasValue:
+					continue
+				if attr.root in ('wl','weightList'):
+					#copy weights list.
+					if decodedWeights is None:
+						weightslist.extend(MayaAsciiArrays.decode(attr.rawPayload,MayaAsciiArrays.DOUBLE))
+			creator.setAttributes(mobject,[a for a in node.attributes if a.hasValue and a.root not in ('wl','weightList')],batch)
 			# now parse the weights list																		
 			skinobjects.append( (newName,weightslist) )
+		batch.flush()
 			
 		# return the node for deletion on undo
 		return skinobjects
 					
+					
 	def applyWeightsToSkins(self,skins):
 		'''
 			This transcribes all the weights and influences of the skin node
@@ -1293,38 +756,63 @@ class MayaAsciiParser():
 			@param[in]: Array of containing a tupple for Skin DAG nodes and its weight pairs			
 		'''
 		for s in range(len(skins)):
-			skin = skins[s]
-			weightslist = skin[1]
+			skinName,weightslist = skins[s]
 			mSel = oMaya.MSelectionList()
-			mSel.add(skin[0])
-			skin = oAnim.MFnSkinCluster()			
-			skin.setObject(mSel.getDependNode(0))
-			influenceCount = []
-			influenceIndexes = []
-			weights = []
-			obj = None
-			bindedmeshes = skin.getOutputGeometry()
-			for binds in bindedmeshes:
-				meshObj = oMaya.MFnMesh(binds)
-				#meshObj.setObject(binds)							
-				vertIter = oMaya.MItMeshVertex(binds)
-				skin_plug = skin.findPlug( "weightList",0 ); 
-				vertCount = vertIter.count()				
-				vertexID = 0
-				#for w in range(len(weightslist)):
-				w = 0
-				while w < len(weightslist):					
-					numInfluence = int(weightslist[w])					
-					for i in range(numInfluence):						
-						w+=1
-						influenceID = int(weightslist[w])
-						w+=1
-						weight = float(weightslist[w])
-						#print (weightslist[w])
-						# I figured its   {influence count} {influence index} {weight} {influence index} {weight} {influence index} {weight}					
-						skin_plug.elementByLogicalIndex(vertexID).child(0).elementByLogicalIndex(influenceID).setFloat( weight ) 						
-					vertexID += 1 
-					w += 1
+			mSel.add(skinName)
+			skin = oAnim.MFnSkinCluster(mSel.getDependNode(0))
+			# I figured its   {influence count} {influence index} {weight} {influence index} {weight} {influence index} {weight}
+			offsets,columns,values = MayaAsciiArrays.sparseRows(weightslist)
+			rowCount = len(offsets)-1
+			# the file indexes influences by their logical matrix index, setWeights by their order in influenceObjects()
+			influences = skin.influenceObjects()
+			influenceIndex = dict()
+			for i in range(len(influences)):
+				influenceIndex[skin.indexForInfluenceObject(influences[i])] = i
+			row = 0
+			for binds in skin.getOutputGeometry():
+				if binds.hasFn(oMaya.MFn.kMesh):
+					pointCount = oMaya.MFnMesh(binds).numVertices
+					componentType = oMaya.MFn.kMeshVertComponent
+				elif binds.hasFn(oMaya.MFn.kNurbsCurve):
+					pointCount = oMaya.MFnNurbsCurve(binds).numCVs
+					componentType = oMaya.MFn.kCurveCVComponent
+				else:
+					# double indexed points (surfaces, lattices), written a weight at a time
+					self.setWeightPlugs(skin,offsets,columns,values,row,rowCount)
+					break
+				pointCount = min(pointCount,rowCount-row)
+				if pointCount <= 0:
+					break
+				used = sorted(set(columns[offsets[row]:offsets[row+pointCount]]))
+				missing = [c for c in used if c not in influenceIndex]
+				if len(missing) > 0:
+					print("Weights of missing influences are skipped ",skinName,missing)
+				columnOrder = [c for c in used if c in influenceIndex]
+				fnComponent = oMaya.MFnSingleIndexedComponent()
+				components = fnComponent.create(componentType)
+				fnComponent.setCompleteData(pointCount)
+				weights = MayaAsciiArrays.denseRows(offsets,columns,values,row,row+pointCount,columnOrder)
+				skin.setWeights(oMaya.MDagPath.getAPathTo(binds),components,
+					oMaya.MIntArray([influenceIndex[c] for c in columnOrder]),
+					oMaya.MDoubleArray(weights),self.normalizeWeights,False)
+				row += pointCount
+
+	def setWeightPlugs(self,skin,offsets,columns,values,first,last):
+		'''
+			Writes weightList rows through the skin's plugs, for geometry setWeights can not take in one call.
+
+			@param[in]: MFnSkinCluster
+			@param[in]: INT array of row offsets
+			@param[in]: INT array of influence indices
+			@param[in]: DOUBLE array of weights
+			@param[in]: First row
+			@param[in]: Row after the last one
+		'''
+		skin_plug = skin.findPlug( "weightList",0 )
+		for vertexID in range(first,last):
+			weightsPlug = skin_plug.elementByLogicalIndex(vertexID).child(0)
+			for e in range(offsets[vertexID],offsets[vertexID+1]):
+				weightsPlug.elementByLogicalIndex(columns[e]).setFloat( values[e] )
 							
 		
 	def connectBlendShapesToShapeManager(self,blendShapes):
@@ -1352,11 +840,81 @@ class MayaAsciiParser():
 
 			
 		
-	def importFile(self,asciipath):		
+	def readScene(self,asciipath,roots=None):
+		'''
+			Parses the scene and decodes its meshes and skin weights, from the parse cache when the file
+			was imported before.
+
+			@param[in]: File Path of maya.ma file
+			@param[in]: (Optional) Node names or glob patterns, only the nodes they depend on are decoded
+			@param[out]: Returns MayaAsciiCache.ParsedScene
+			@param[out]: Returns SceneModel of the nodes to import
+		'''
+		cache = None
+		key = None
+		if self.useCache:
+			cache = MayaAsciiCache.MayaAsciiCache(self.cacheDir)
+			try:
+				key = cache.key(asciipath)
+				parsed = cache.load(asciipath,key)
+				if parsed is not None:
+					print("Using parse cache for ",asciipath)
+					return parsed,self.selectNodes(parsed.scene,roots)
+			except OSError as e:
+				print("Parse cache unavailable ",e)
+				cache = None
+		with self.stage('tokenize'):
+			parsed = MayaAsciiCache.ParsedScene(MayaAsciiScene.parseFile(asciipath))
+		scene = self.selectNodes(parsed.scene,roots)
+		# payloads of the nodes left out are never decoded
+		with self.stage('decode',len(scene.nodes)):
+			parsed.decode(self.workers,None if scene is parsed.scene else scene.nodes)
+		if cache is not None:
+			try:
+				cache.store(asciipath,parsed,key)
+			except OSError as e:
+				print("Unable to write parse cache ",e)
+		return parsed,scene
+
+	def stage(self,name,items=None):
+		'''
+			@param[in]: Stage name
+			@param[in]: (Optional) Number of items the stage processes
+			@param[out]: Returns the context manager measuring a stage of the running import
+		'''
+		if self.profiler is None:
+			return contextlib.nullcontext()
+		return self.profiler.stage(name,items)
+
+	def selectNodes(self,scene,roots):
+		'''
+			Restricts the import to some nodes of the scene and everything they depend on.
+
+			@param[in]: SceneModel of the parsed file
+			@param[in]: Array of node names or glob patterns ie ["hero_rig","prop_*"], None or empty keeps every node
+			@param[out]: Returns SceneModel
+		'''
+		if not roots:
+			return scene
+		nodes = scene.closure(roots)
+		if len(nodes) == 0:
+			print("No nodes matching ",roots)
+		return scene.subset(nodes)
+
+	def importFile(self,asciipath,workers=0,useCache=True,cacheDir=None,roots=None,normalizeWeights=False,profile=False,logFile=None,memory=False,fingerprint=False):		
 		'''
 			Initiates the import operation 
 
 			@param[in]: File Path of maya.ma file
+			@param[in]: (Optional) Number of processes decoding the meshes in parallel
+			@param[in]: (Optional) Read and write the parse cache
+			@param[in]: (Optional) Parse cache directory
+			@param[in]: (Optional) Node names or glob patterns to import with their dependencies, None imports everything
+			@param[in]: (Optional) Normalize the skin weights as they are set
+			@param[in]: (Optional) Add a cProfile capture of the import to the report
+			@param[in]: (Optional) File path of a log the report is appended to
+			@param[in]: (Optional) Record the memory peak of every stage, tracing the allocations slows the import down
+			@param[in]: (Optional) Keep the shading network fingerprints on the shading groups and reuse the networks of previous imports
 			@param[out]: Array of imported Mesh Shape node paths
 			@param[out]: Array of imported Transform Paths
 			@param[out]: Array of imported Shader Node names
@@ -1364,46 +922,78 @@ class MayaAsciiParser():
 			@param[out]: Array of imported Connections
 		'''
 		print("Performing Import ",asciipath)	
+		# stage timings of this import end up in self.report
 		
+		self.__parsed__ = None
 		self.__meshes__ = []
+		self.__materials__ = dict()
 		self.__transforms__ = []
+		self.__transformIndex__ = dict()
+		self.__dagObjects__ = dict()
+		self.record = MayaAsciiNodes.ImportRecord()
 		self.__shaders__=[]
 		self.__namedictionary__ = dict()
 		self.__namedictionary__["initialShadingGroup"] = "initialShadingGroup"
+		self.workers = workers
+		self.useCache = useCache
+		self.cacheDir = cacheDir
+		self.normalizeWeights = normalizeWeights
+		self.fingerprintNetworks = fingerprint
+		self.failedConnections = []
 		others=[]
-		exceptions = []
-		file1 = open(asciipath, "r")
-		file1strings = file1.read()
-		# Remove special characters
-		file1strings = re.sub('&lf;', "", file1strings)	
-		file1strings = re.sub('&cr;', "", file1strings)			
-		
-
-		nodes = file1strings.split("createNode ")				
-		connections = self.getAllConnectAttr(file1strings)
-		meshlist,shaderlist,skins,transforms,othernodes = self.filterNodes(nodes,connections)				
-		shaderlist,shaderAlreadyExists = self.findExistingShaders(shaderlist)					
-		self.createTransformNodes(transforms)		
-		others,blendshapes = self.createOtherNodes(othernodes,exceptions)	
-		self.createMeshNodes(meshlist)		
-		self.createShaderNodes(shaderlist)
-		skins = self.createSkins(skins)
-		
-		for ex in shaderlist:
-			shaderType = self.getTypeName(ex[1])
-			exceptions.append(shaderType)
-		for ex in shaderAlreadyExists:
-			shaderType = ex[2]
-			exceptions.append(shaderType)
-
+		exceptions = set()
+		self.profiler = MayaAsciiProfiler.StageProfiler(memory=memory,profile=profile)
+		self.profiler.start()
+		stage = self.profiler.stage
+		try:
+			with stage('read'):
+				self.__parsed__,scene = self.readScene(asciipath,roots)
+				self.__scene__ = scene
+			# one snapshot of the scene names, the import keeps it up to date instead of probing with objExists
+			with stage('names'):
+				self.__names__ = MayaAsciiNames.NameRegistry(cmds.ls())
+			with stage('filterNodes',len(scene.nodes)):
+				meshlist,shaderlist,skins,transforms,othernodes = self.filterNodes(scene)				
+			with stage('findExistingShaders',len(shaderlist)):
+				networks = MayaAsciiShading.collectNetworks(scene,shaderlist,othernodes)
+				shaderlist,shaderAlreadyExists = self.findExistingShaders(networks)					
+			# the network nodes, created or already in the scene, are not created again with the other nodes
+			for network in networks:
+				exceptions.update(network.names())
+			with stage('createTransformNodes',len(transforms)):
+				self.createTransformNodes(transforms)		
+			with stage('createOtherNodes',len(othernodes)):
+				others,blendshapes = self.createOtherNodes(othernodes,exceptions)	
+			with stage('createMeshNodes',len(meshlist)):
+				self.createMeshNodes(meshlist)		
+			with stage('createShaderNodes',len(shaderlist)):
+				self.createShaderNodes(shaderlist)
+			with stage('createSkins',len(skins)):
+				skins = self.createSkins(skins)
 			
-
-		for s in range(len(skins)):
-			others.append( skins[s][0] )
-		connections = self.makeConnections(connections)				
-		self.applyVertexTweaks()								
-		self.applyWeightsToSkins(skins)					
-		self.connectBlendShapesToShapeManager(blendshapes)
+			for s in range(len(skins)):
+				others.append( skins[s][0] )
+			with stage('makeConnections',len(scene.connections)):
+				connections = self.makeConnections(scene.connections)				
+			with stage('assignMaterials',len(self.__materials__)):
+				self.assignMaterials()
+			with stage('applyWeightsToSkins',len(skins)):
+				self.applyWeightsToSkins(skins)					
+			with stage('connectBlendShapesToShapeManager',len(blendshapes)):
+				self.connectBlendShapesToShapeManager(blendshapes)
+		finally:
+			self.profiler.stop()
+			if self.__parsed__ is not None:
+				# done with the file, its map is closed instead of waiting for the records to be collected
+				self.__parsed__.scene.close(False)
+			self.report = self.profiler.report()
+			self.report['file'] = asciipath
+			self.report['failedConnections'] = len(self.failedConnections)
+			if logFile:
+				try:
+					self.profiler.write(logFile,{'file':asciipath,'failedConnections':len(self.failedConnections)})
+				except (IOError,OSError) as e:
+					print("Unable to write import log ",logFile,e)
 		
 		ms=[]
 		ts=[]		
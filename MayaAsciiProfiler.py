@@ -0,0 +1,149 @@
+# Maya Ascii Profiler
+# Description: Records wall time, call counts, item counts and optionally peak memory and a cProfile
+# capture for each stage of an import. The report is a plain dictionary so it can be returned as
+# JSON and appended to a log file. Does not import maya.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiProfiler
+profiler = MayaAsciiProfiler.StageProfiler(memory=True,profile=True)
+profiler.start()
+with profiler.stage('createMeshNodes',len(meshes)):
+	createMeshes(meshes)
+profiler.stop()
+print(profiler.report()['stages']['createMeshNodes'])
+profiler.write('D:/logs/imports.jsonl',{'file':'C:/scenes/city.ma'})
+
+# from maya the importer returns the report as JSON
+import json
+report = json.loads(cmds.MayaAsciiImporter('C:/scenes/city.ma', report=True, memory=True, logFile='D:/logs/imports.jsonl'))
+'''
+
+import io
+import os
+import json
+import time
+import socket
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_LINES = 40 # functions listed in the cProfile capture
+
+
+class StageProfiler():
+	'''
+		Accumulates the measures of named stages. A stage entered several times adds up its time,
+		calls and items and keeps the highest memory peak. Stages can be nested, the peak of the
+		outer stage covers the inner ones.
+	'''
+
+	def __init__(self,memory=False,profile=False):
+		'''
+			@param[in]: (Optional) Trace the python heap peak of every stage, slows the stages down
+			@param[in]: (Optional) Capture a cProfile of the whole run
+		'''
+		self.memory = memory
+		self.profile = profile
+		self.stages = dict() # stage name -> dictionary of measures
+		self.order = []
+		self.profiler = None
+		self.startTime = None
+		self.seconds = 0.0
+		self.startedTracing = False
+		self.peaks = [] # [baseline, peak so far] of the stages being measured, the innermost last
+
+	def start(self):
+		self.startTime = time.perf_counter()
+		if self.memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			self.startedTracing = True
+		if self.profile:
+			self.profiler = cProfile.Profile()
+			self.profiler.enable()
+
+	def stop(self):
+		if self.profiler is not None:
+			self.profiler.disable()
+		if self.startedTracing:
+			tracemalloc.stop()
+			self.startedTracing = False
+		if self.startTime is not None:
+			self.seconds = time.perf_counter()-self.startTime
+
+	@contextmanager
+	def stage(self,name,items=None):
+		'''
+			Measures the body of a with statement.
+
+			@param[in]: Stage name
+			@param[in]: (Optional) Number of items the stage processes
+		'''
+		record = self.stages.get(name)
+		if record is None:
+			record = {'seconds':0.0,'calls':0,'items':0}
+			self.stages[name] = record
+			self.order.append(name)
+		tracing = self.memory and tracemalloc.is_tracing()
+		if tracing:
+			current,peak = tracemalloc.get_traced_memory()
+			if len(self.peaks) > 0:
+				# the reset below would lose the peak the enclosing stage reached so far
+				outer = self.peaks[-1]
+				outer[1] = max(outer[1],peak-outer[0])
+			if hasattr(tracemalloc,'reset_peak'):
+				tracemalloc.reset_peak()
+			self.peaks.append([current,0])
+		start = time.perf_counter()
+		try:
+			yield record
+		finally:
+			record['seconds'] += time.perf_counter()-start
+			record['calls'] += 1
+			if items is not None:
+				record['items'] += items
+			if tracing:
+				# python 3.7/3.8 can not reset the peak, it is then the peak since tracing started
+				baseline,saved = self.peaks.pop()
+				peak = max(saved,tracemalloc.get_traced_memory()[1]-baseline)
+				record['peak'] = max(record.get('peak',0),peak)
+
+	def profileText(self,lines=PROFILE_LINES):
+		'''
+			@param[out]: Returns the cProfile capture sorted by cumulative time, None when not profiling
+		'''
+		if self.profiler is None:
+			return None
+		output = io.StringIO()
+		stats = pstats.Stats(self.profiler,stream=output)
+		stats.sort_stats('cumulative').print_stats(lines)
+		return output.getvalue()
+
+	def report(self):
+		'''
+			@param[out]: Returns JSON serializable dictionary of the total time, every stage in the order they ran and the cProfile capture
+		'''
+		report = {'seconds':self.seconds,'stages':dict((name,dict(self.stages[name])) for name in self.order),'order':list(self.order)}
+		text = self.profileText()
+		if text is not None:
+			report['profile'] = text
+		return report
+
+	def write(self,logpath,extra=None):
+		'''
+			Appends the report to a log file, one JSON object per line.
+
+			@param[in]: File path of the log
+			@param[in]: (Optional) Dictionary of fields added to the report ie the imported file
+			@param[out]: Returns the written dictionary
+		'''
+		entry = {'time':time.strftime("%Y-%m-%dT%H:%M:%S"),'host':socket.gethostname(),'pid':os.getpid()}
+		if extra:
+			entry.update(extra)
+		entry.update(self.report())
+		folder = os.path.dirname(os.path.abspath(logpath))
+		if not os.path.isdir(folder):
+			os.makedirs(folder)
+		with open(logpath,"a") as output:
+			output.write(json.dumps(entry)+"\n")
+		return entry
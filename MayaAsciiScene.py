@@ -0,0 +1,789 @@
+# Maya Ascii Scene
+# Description: Intermediate scene model built from the tokenized statements of a Maya ascii
+# file. Nodes, their setAttr values and the connection edge list are parsed once and never
+# touch maya, so scenes can be parsed (and cached) on machines without a Maya license.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiScene
+scene = MayaAsciiScene.parseFile('C:/scenes/cube.ma')
+for node in scene.nodes:
+	print(node.nodeType, node.name, node.parent, len(node.attributes))
+for connection in scene.connections:
+	print(connection.source, "->", connection.destination)
+
+# only the rig and what it depends on
+rig = scene.subset(scene.closure(["hero_rig","hero_*_geo"]))
+'''
+
+import re
+from fnmatch import fnmatchcase
+from MayaAsciiParser import MayaAsciiTokenizer
+
+_component = re.compile(r'([^.\[\]]+)(?:\[([^\]]*)\])?')
+_booleans = {'yes': True, 'no': False, 'on': True, 'off': False, 'true': True, 'false': False}
+# set membership plugs, followed upstream they would pull in every member of the set
+_membershipPlugs = ('dsm','dagSetMembers','dnsm','dnSetMembers','gn','groupNodes')
+
+
+def decodeToken(token):
+	'''
+		Converts a single setAttr value token to its python type.
+
+		@param[in]: Token returned by MayaAsciiTokenizer.splitArguments()
+		@param[out]: Returns a string, bool, int or float
+	'''
+	if token[0] == '"':
+		return MayaAsciiTokenizer.unquote(token)
+	if token in _booleans:
+		return _booleans[token]
+	try:
+		return int(token)
+	except ValueError:
+		pass
+	try:
+		return float(token)
+	except ValueError:
+		return token
+
+
+class AttrRecord():
+	'''
+		A setAttr statement. The value payload is kept as raw text and only decoded on request.
+		Records of a memory mapped file keep the payload as a memoryview of the map (see rawPayload).
+	'''
+	__slots__ = ('path','size','dataType','flags','_payload','_buffer','_components','_value')
+
+	def __init__(self,path,size=None,dataType=None,flags=(),payload="",buffer=None):
+		self.path = path
+		self.size = size
+		self.dataType = dataType
+		self.flags = flags
+		self._payload = payload if buffer is None else None
+		self._buffer = buffer
+		self._components = None
+		self._value = None
+
+	def __repr__(self):
+		return "AttrRecord({0!r})".format(self.path)
+
+	def detach(self,keep=True):
+		'''
+			Stops viewing the mapped file, the payload is copied or, when not kept, emptied.
+
+			@param[in]: (Optional) Copy the payload, False drops it
+		'''
+		if isinstance(self._buffer,memoryview):
+			self._buffer = bytes(self._buffer) if keep else b""
+
+	def __getstate__(self):
+		payload = self.rawPayload
+		if not isinstance(payload,str):
+			# memoryviews do not pickle, the bytes are copied
+			payload = bytes(payload)
+		return (self.path,self.size,self.dataType,self.flags,payload)
+
+	def __setstate__(self,state):
+		self.path,self.size,self.dataType,self.flags,payload = state
+		if isinstance(payload,str):
+			self._payload = payload
+			self._buffer = None
+		else:
+			self._payload = None
+			self._buffer = payload
+		self._components = None
+		self._value = None
+
+	@property
+	def payload(self):
+		'''
+			Value payload as text ie "0.5 -0.5 0.5", decoded from the map on first use.
+		'''
+		if self._payload is None:
+			self._payload = str(self._buffer,'utf-8')
+			self._buffer = None
+		return self._payload
+
+	@property
+	def rawPayload(self):
+		'''
+			Value payload as it was stored, text or a bytes like buffer. Numeric decoders read this
+			so only the payload being decoded gets copied.
+		'''
+		if self._payload is None:
+			return self._buffer
+		return self._payload
+
+	def components(self):
+		'''
+			Splits the attribute path in its names and indices. ".uvst[0].uvsp[0:13]" becomes
+			[("uvst","0"),("uvsp","0:13")]
+
+			@param[out]: Returns Array of (name, index string or None) tuples
+		'''
+		if self._components is None:
+			self._components = [(m.group(1),m.group(2)) for m in _component.finditer(self.path)]
+		return self._components
+
+	@property
+	def leaf(self):
+		'''
+			Name of the last attribute of the path with out its index.
+		'''
+		components = self.components()
+		if len(components) == 0:
+			return ""
+		return components[-1][0]
+
+	@property
+	def root(self):
+		'''
+			Name of the first attribute of the path with out its index.
+		'''
+		components = self.components()
+		if len(components) == 0:
+			return ""
+		return components[0][0]
+
+	def logicalIndex(self,component=0):
+		'''
+			Returns the first logical index of one of the path components.
+
+			@param[in]: Position of the component in the path
+			@param[out]: Returns an int (-1 if the component has no index)
+		'''
+		components = self.components()
+		if component >= len(components) or components[component][1] is None:
+			return -1
+		return int(components[component][1].split(":")[0])
+
+	def indexRange(self,component=-1):
+		'''
+			Returns the index range written in a component ie [5:10] or [5]
+
+			@param[in]: Position of the component in the path
+			@param[out]: Returns a tuple of ints (start,end) or None when the component has no index
+		'''
+		components = self.components()
+		if len(components) == 0 or components[component][1] is None:
+			return None
+		indices = components[component][1].split(":")
+		return int(indices[0]),int(indices[-1])
+
+	@property
+	def hasValue(self):
+		'''
+			False for statements that only declare the size of an array ie setAttr -s 2 ".iog[0].og"
+		'''
+		return len(self.rawPayload) > 0
+
+	@property
+	def value(self):
+		'''
+			Decoded payload. Single values are returned as is, multiple values as a list.
+		'''
+		if self._value is None:
+			values = [decodeToken(t) for t in MayaAsciiTokenizer.splitArguments(self.payload)]
+			if len(values) == 1:
+				values = values[0]
+			self._value = values
+		return self._value
+
+	def mel(self,nodeName):
+		'''
+			Builds the setAttr command targeting a node.
+
+			@param[in]: Name of the node receiving the attribute
+			@param[out]: Returns a single string
+		'''
+		command = ["setAttr"]
+		command += self.flags
+		if self.size is not None:
+			command.append("-s {0}".format(self.size))
+		command.append('"{0}{1}"'.format(nodeName,self.path))
+		if self.dataType is not None:
+			command.append('-type "{0}"'.format(self.dataType))
+		if self.hasValue:
+			command.append(self.payload)
+		return " ".join(command)+";"
+
+
+class NodeRecord():
+	'''
+		A createNode statement with the setAttr and addAttr statements that follow it.
+	'''
+	__slots__ = ('nodeType','name','parent','flags','attributes','addAttributes')
+
+	def __init__(self,nodeType,name,parent="",flags=()):
+		self.nodeType = nodeType
+		self.name = name
+		self.parent = parent
+		self.flags = flags
+		self.attributes = []
+		self.addAttributes = []
+
+	def __repr__(self):
+		return "NodeRecord({0!r}, {1!r})".format(self.nodeType,self.name)
+
+	def createCommand(self,name=None,parent=None):
+		'''
+			Builds the createNode command for this node.
+
+			@param[in]: (Optional) Name to create the node with, defaults to the name from the file
+			@param[in]: (Optional) Parent name, defaults to the parent from the file
+			@param[out]: Returns a single string
+		'''
+		if name is None:
+			name = self.name
+		if parent is None:
+			parent = self.parent
+		command = ["createNode",self.nodeType,'-n "{0}"'.format(name)]
+		if parent != "":
+			command.append('-p "{0}"'.format(parent))
+		command += self.flags
+		return " ".join(command)+";"
+
+	def addAttrCommands(self,nodeName):
+		'''
+			Builds the addAttr commands for this node.
+
+			@param[in]: Name of the node receiving the attributes
+			@param[out]: Returns Array of strings
+		'''
+		return ['{0} "{1}";'.format(a,nodeName) for a in self.addAttributes]
+
+	def attribute(self,*names):
+		'''
+			Finds the first setAttr whose path starts with one of the names ie attribute(".vt",".vrts")
+
+			@param[in]: Attribute paths to look for
+			@param[out]: Returns AttrRecord or None
+		'''
+		for attr in self.attributes:
+			for name in names:
+				if attr.path == name or attr.path.startswith(name+"[") or attr.path.startswith(name+"."):
+					return attr
+		return None
+
+
+class ConnectionRecord():
+	'''
+		A connectAttr statement, an edge going from the source plug to the destination plug.
+		Plugs are kept as written, shared nodes keep their root namespace ":initialShadingGroup.dsm"
+	'''
+	__slots__ = ('source','destination','nextAvailable')
+
+	def __init__(self,source,destination,nextAvailable=False):
+		self.source = source
+		self.destination = destination
+		self.nextAvailable = nextAvailable
+
+	def __repr__(self):
+		return "ConnectionRecord({0!r}, {1!r})".format(self.source,self.destination)
+
+	@property
+	def sourceNode(self):
+		return stripRootNamespace(self.source.split(".",1)[0])
+
+	@property
+	def sourcePlug(self):
+		return self.source.split(".",1)[-1]
+
+	@property
+	def destinationNode(self):
+		return stripRootNamespace(self.destination.split(".",1)[0])
+
+	@property
+	def destinationPlug(self):
+		return self.destination.split(".",1)[-1]
+
+	def command(self):
+		'''
+			Formats the connection the way the importer expects it "source destination [-na]"
+
+			@param[out]: Returns a single string
+		'''
+		if self.nextAvailable:
+			return "{0} {1} -na".format(self.source,self.destination)
+		return "{0} {1}".format(self.source,self.destination)
+
+
+class SceneModel():
+	'''
+		Parsed content of a maya ascii file. Nodes and connections are indexed as they are added so
+		lookups by node name or plug are constant time.
+	'''
+
+	def __init__(self):
+		self.nodes = []
+		self.connections = []
+		self.requires = []
+		self.fileInfo = dict()
+		self.source = None # MayaAsciiTokenizer.MayaAsciiMappedReader whose map the payloads view, closed by close()
+		self.clearIndex()
+
+	def __getstate__(self):
+		# the indices are rebuilt on load, no need to store them twice
+		return (self.nodes,self.connections,self.requires,self.fileInfo)
+
+	def __setstate__(self,state):
+		self.nodes,self.connections,self.requires,self.fileInfo = state
+		self.source = None
+		self.buildIndex()
+
+	def close(self,keep=True):
+		'''
+			Closes the mapped file the payloads were read from, the scene stops depending on it.
+
+			@param[in]: (Optional) Copy the payloads still viewing the map, False drops them (the scene is not used after)
+			@param[out]: Returns False when something else still holds a view of the map
+		'''
+		for node in self.nodes:
+			for attr in node.attributes:
+				attr.detach(keep)
+		closed = True
+		if self.source is not None:
+			closed = self.source.close()
+			self.source = None
+		return closed
+
+	def clearIndex(self):
+		self.nodesByName = dict()
+		self.connectionsBySource = dict()  # source plug -> [ConnectionRecord]
+		self.connectionsByDestination = dict()  # destination plug -> [ConnectionRecord]
+		self.outgoing = dict()  # source node name -> [ConnectionRecord]
+		self.incoming = dict()  # destination node name -> [ConnectionRecord]
+		self.childrenByParent = dict()  # parent DAG path -> [NodeRecord]
+		self.nodesByPath = dict()  # DAG path "|group1|pCube1" -> NodeRecord
+		self.nameCounts = dict()  # node name -> number of nodes using it
+		self.paths = dict()  # id(NodeRecord) -> DAG path
+		self.parents = dict()  # id(NodeRecord) -> NodeRecord of the -p parent
+
+	def buildIndex(self):
+		'''
+			Rebuilds every lookup table from the node and connection lists.
+		'''
+		self.clearIndex()
+		for node in self.nodes:
+			self.indexNode(node)
+		for connection in self.connections:
+			self.indexConnection(connection)
+
+	def indexNode(self,node):
+		# duplicated short names (shapes under different parents) resolve to the first node like maya's ls
+		if node.name not in self.nodesByName:
+			self.nodesByName[node.name] = node
+		self.nameCounts[node.name] = self.nameCounts.get(node.name,0)+1
+		path = "|"+node.name
+		if node.parent != "":
+			# like createNode -p, the parent is resolved among the nodes created before this one
+			parent = self.nodeAt(node.parent)
+			if parent is not None:
+				self.parents[id(node)] = parent
+				parentPath = self.paths[id(parent)]
+			else:
+				parentPath = "|"+stripRootNamespace(node.parent).lstrip("|")
+			self.childrenByParent.setdefault(parentPath,[]).append(node)
+			path = parentPath+path
+		self.paths[id(node)] = path
+		self.nodesByPath.setdefault(path,node)
+
+	def indexConnection(self,connection):
+		sourceNode = connection.sourceNode
+		destinationNode = connection.destinationNode
+		self.connectionsBySource.setdefault(sourceNode+"."+connection.sourcePlug,[]).append(connection)
+		self.connectionsByDestination.setdefault(destinationNode+"."+connection.destinationPlug,[]).append(connection)
+		# DAG paths "|group1|pCube1" are indexed by their short name like the nodes
+		self.outgoing.setdefault(shortName(sourceNode),[]).append(connection)
+		self.incoming.setdefault(shortName(destinationNode),[]).append(connection)
+
+	def addNode(self,node):
+		self.nodes.append(node)
+		self.indexNode(node)
+
+	def addConnection(self,connection):
+		self.connections.append(connection)
+		self.indexConnection(connection)
+
+	def findNode(self,name):
+		'''
+			Searches for a node based on its name.
+
+			@param[in]: Node name to search for
+			@param[out]: Returns NodeRecord or None
+		'''
+		return self.nodesByName.get(stripRootNamespace(name))
+
+	def nodeAt(self,name):
+		'''
+			Searches for a node by DAG path, or by name when the name is used by one node only.
+
+			@param[in]: DAG path "|group1|pCube1" or node name
+			@param[out]: Returns NodeRecord or None
+		'''
+		name = stripRootNamespace(name)
+		if "|" in name:
+			return self.nodesByPath.get("|"+name.lstrip("|"))
+		if self.nameCounts.get(name,0) != 1:
+			return None
+		return self.nodesByName.get(name)
+
+	def connectedNode(self,name):
+		'''
+			@param[in]: Node name or DAG path of a connection end
+			@param[out]: Returns NodeRecord, the first node of that name for a short name, or None
+		'''
+		if "|" in name:
+			return self.nodeAt(name)
+		return self.findNode(name)
+
+	def pathOf(self,node):
+		'''
+			@param[in]: NodeRecord
+			@param[out]: Returns the DAG path of the node ie "|group1|pCube1"
+		'''
+		return self.paths.get(id(node),"|"+node.name)
+
+	def parentOf(self,node):
+		'''
+			@param[in]: NodeRecord
+			@param[out]: Returns the NodeRecord of the -p parent or None
+		'''
+		if node.parent == "":
+			return None
+		return self.parents.get(id(node))
+
+	def childrenOf(self,node):
+		'''
+			@param[in]: NodeRecord
+			@param[out]: Returns Array of NodeRecords created with -p node
+		'''
+		return self.childrenByParent.get(self.pathOf(node),[])
+
+	def closure(self,patterns):
+		'''
+			Finds the nodes needed to rebuild the nodes matching the patterns: the matches and their DAG
+			descendants, every node feeding them through connections, the shading engines their shapes
+			are assigned to and the DAG ancestors of all of these.
+
+			@param[in]: Array of node names or glob patterns ie ["hero_rig","prop_*"]
+			@param[out]: Returns Array of NodeRecords in file order
+		'''
+		selected = set()
+		roots = [n for n in self.nodes if any(fnmatchcase(n.name,p) for p in patterns)]
+		# DAG descendants of the roots
+		pending = list(roots)
+		while pending:
+			node = pending.pop()
+			if id(node) in selected:
+				continue
+			selected.add(id(node))
+			pending.extend(self.childrenOf(node))
+		# upstream dependencies and shading engines, walked from every selected node
+		pending = [n for n in self.nodes if id(n) in selected]
+		expanded = set()
+		while pending:
+			node = pending.pop()
+			if id(node) in expanded:
+				continue
+			expanded.add(id(node))
+			selected.add(id(node))
+			isSet = node.nodeType in ('shadingEngine','objectSet')
+			# the connections are indexed by short name, keep the ones of this node and not of its namesakes
+			for connection in self.connectionsInto(node.name):
+				if isSet and connection.destinationPlug.split("[",1)[0] in _membershipPlugs:
+					continue
+				if self.connectedNode(connection.destinationNode) is not node:
+					continue
+				source = self.connectedNode(connection.sourceNode)
+				if source is not None:
+					pending.append(source)
+			for connection in self.connectionsFrom(node.name):
+				if connection.sourcePlug.startswith(('iog','instObjGroups')) and self.connectedNode(connection.sourceNode) is node:
+					destination = self.connectedNode(connection.destinationNode)
+					if destination is not None and destination.nodeType == 'shadingEngine':
+						pending.append(destination)
+		# DAG ancestors, only their hierarchy is needed
+		for node in [n for n in self.nodes if id(n) in selected]:
+			parent = self.parentOf(node)
+			while parent is not None and id(parent) not in selected:
+				selected.add(id(parent))
+				parent = self.parentOf(parent)
+		return [n for n in self.nodes if id(n) in selected]
+
+	def subset(self,nodes):
+		'''
+			Builds a scene model of some of the nodes. Connections are kept when both ends are in the
+			subset or are nodes the file does not create (shared nodes like ":initialShadingGroup").
+
+			@param[in]: Array of NodeRecords of this scene ie closure()
+			@param[out]: Returns SceneModel sharing the NodeRecords of this scene
+		'''
+		scene = SceneModel()
+		scene.requires = self.requires
+		scene.fileInfo = self.fileInfo
+		kept = set(id(n) for n in nodes)
+		for node in nodes:
+			scene.addNode(node)
+		for connection in self.connections:
+			source = self.connectedNode(connection.sourceNode)
+			destination = self.connectedNode(connection.destinationNode)
+			if (source is None or id(source) in kept) and (destination is None or id(destination) in kept):
+				scene.addConnection(connection)
+		return scene
+
+	def connectionsFrom(self,nodeName):
+		'''
+			Connections leaving a node.
+
+			@param[in]: Node name
+			@param[out]: Returns Array of ConnectionRecords
+		'''
+		return self.outgoing.get(nodeName,[])
+
+	def connectionsInto(self,nodeName):
+		'''
+			Connections arriving at a node.
+
+			@param[in]: Node name
+			@param[out]: Returns Array of ConnectionRecords
+		'''
+		return self.incoming.get(nodeName,[])
+
+	def sourcesOf(self,plug):
+		'''
+			Connections feeding a destination plug ie "lambert2SG.ss"
+
+			@param[in]: Plug path
+			@param[out]: Returns Array of ConnectionRecords
+		'''
+		return self.connectionsByDestination.get(stripRootNamespace(plug),[])
+
+	def destinationsOf(self,plug):
+		'''
+			Connections driven by a source plug ie "lambert2.oc"
+
+			@param[in]: Plug path
+			@param[out]: Returns Array of ConnectionRecords
+		'''
+		return self.connectionsBySource.get(stripRootNamespace(plug),[])
+
+
+def stripRootNamespace(plug):
+	'''
+		Removes the root namespace marker of shared nodes ie ":initialShadingGroup"
+
+		@param[in]: Node name
+		@param[out]: Returns a single string
+	'''
+	if plug.startswith(":"):
+		return plug[1:]
+	return plug
+
+
+def shortName(name):
+	'''
+		Last name of a DAG path ie "|group1|pCube1" -> "pCube1"
+
+		@param[in]: Node name or DAG path
+		@param[out]: Returns a single string
+	'''
+	return stripRootNamespace(name.rsplit("|",1)[-1])
+
+
+def parseCreateNode(arguments):
+	'''
+		Parses the arguments of a createNode statement.
+
+		@param[in]: Arguments of the createNode statement
+		@param[out]: Returns NodeRecord
+	'''
+	tokens = MayaAsciiTokenizer.splitArguments(arguments)
+	nodeType = tokens[0]
+	name = ""
+	parent = ""
+	flags = []
+	t = 1
+	while t < len(tokens):
+		token = tokens[t]
+		if token in ("-n","-name") and t+1 < len(tokens):
+			name = MayaAsciiTokenizer.unquote(tokens[t+1])
+			t += 2
+			continue
+		if token in ("-p","-parent") and t+1 < len(tokens):
+			parent = MayaAsciiTokenizer.unquote(tokens[t+1])
+			t += 2
+			continue
+		flags.append(token)
+		t += 1
+	return NodeRecord(nodeType,name,parent,tuple(flags))
+
+
+def isFlag(token):
+	'''
+		Tells a flag (-type, -k) apart from negative numbers (-0.5)
+	'''
+	return len(token) > 1 and token[0] == '-' and token[1].isalpha()
+
+
+def parseSetAttr(arguments):
+	'''
+		Parses the arguments of a setAttr statement. Only the flags and the attribute path are read,
+		the value payload is stored as is.
+
+		@param[in]: Arguments of the setAttr statement
+		@param[out]: Returns AttrRecord or None if the statement has no attribute path
+	'''
+	path,size,dataType,flags,start,scanned = parseSetAttrHead(arguments)
+	if path is None:
+		return None
+	payload = arguments[start:].strip() if start is not None else ""
+	return AttrRecord(path,size,dataType,flags,payload)
+
+
+def parseSetAttrBuffer(buffer,limit=256):
+	'''
+		Parses a setAttr statement of a memory mapped file. Only the head of the statement is decoded
+		to read the flags and the attribute path, the payload stays a memoryview of the map.
+
+		@param[in]: memoryview of the setAttr statement, including the command word
+		@param[in]: (Optional) Number of bytes decoded at first, doubled until the head fits
+		@param[out]: Returns AttrRecord or None if the statement has no attribute path
+	'''
+	length = len(buffer)
+	while True:
+		# latin-1 maps every byte to one character so offsets in the head are offsets in the buffer
+		head = str(buffer[:limit],'latin-1')
+		path,size,dataType,flags,start,scanned = parseSetAttrHead(head,len(MayaAsciiTokenizer.SET_ATTR))
+		if limit >= length or scanned < len(head):
+			break
+		limit *= 2
+	if path is None:
+		return None
+	if start is None:
+		return AttrRecord(path,size,dataType,flags)
+	# the head was decoded as latin-1, decode the text values again as utf-8
+	if not path.isascii():
+		path = path.encode('latin-1').decode('utf-8')
+	return AttrRecord(path,size,dataType,flags,buffer=buffer[start:])
+
+
+def parseSetAttrHead(arguments,index=0):
+	'''
+		Reads the flags and the attribute path of a setAttr statement.
+
+		@param[in]: Arguments of the setAttr statement
+		@param[in]: (Optional) Index to start reading from
+		@param[out]: Returns the attribute path (None when missing), size, data type and flags
+		@param[out]: Returns the index the payload starts on (None when there is no payload)
+		@param[out]: Returns the index following the last token read
+	'''
+	path = None
+	size = None
+	dataType = None
+	flags = []
+	payloadStart = None
+	token,index,start = MayaAsciiTokenizer.nextToken(arguments,index)
+	while token is not None:
+		if token in ("-s","-size"):
+			token,index,start = MayaAsciiTokenizer.nextToken(arguments,index)
+			if token is None:
+				break
+			size = int(token)
+		elif token == "-type":
+			token,index,start = MayaAsciiTokenizer.nextToken(arguments,index)
+			if token is None:
+				break
+			dataType = MayaAsciiTokenizer.unquote(token)
+		elif path is None and token[0] == '"':
+			path = MayaAsciiTokenizer.unquote(token)
+		elif isFlag(token) and (path is None or token[1:] in ("k","l","cb","keyable","lock","channelBox")):
+			value,valueIndex,valueStart = MayaAsciiTokenizer.nextToken(arguments,index)
+			if value is not None and value[0] != '"' and not isFlag(value):
+				flags.append(token+" "+value)
+				index = valueIndex
+			else:
+				flags.append(token)
+		else:
+			payloadStart = start
+			break
+		token,index,start = MayaAsciiTokenizer.nextToken(arguments,index)
+	return path,size,dataType,tuple(flags),payloadStart,index
+
+
+def parseConnectAttr(arguments):
+	'''
+		Parses the arguments of a connectAttr statement.
+
+		@param[in]: Arguments of the connectAttr statement
+		@param[out]: Returns ConnectionRecord or None if the statement is not a plug to plug connection
+	'''
+	plugs = []
+	nextAvailable = False
+	for token in MayaAsciiTokenizer.splitArguments(arguments):
+		if token in ("-na","-nextAvailable"):
+			nextAvailable = True
+		elif not isFlag(token):
+			plugs.append(MayaAsciiTokenizer.unquote(token))
+	if len(plugs) < 2:
+		return None
+	return ConnectionRecord(plugs[0],plugs[1],nextAvailable)
+
+
+def parseStatements(statements):
+	'''
+		Builds the scene model out of tokenized statements.
+
+		@param[in]: Iterable of MayaAsciiTokenizer.Statement
+		@param[out]: Returns SceneModel
+	'''
+	scene = SceneModel()
+	current = None
+	for statement in statements:
+		kind = statement.kind
+		if kind == MayaAsciiTokenizer.SET_ATTR:
+			if current is not None:
+				if isinstance(statement,MayaAsciiTokenizer.MappedStatement):
+					attr = parseSetAttrBuffer(statement.buffer)
+				else:
+					attr = parseSetAttr(statement.arguments())
+				if attr is not None:
+					current.attributes.append(attr)
+		elif kind == MayaAsciiTokenizer.CREATE_NODE:
+			current = parseCreateNode(statement.arguments())
+			scene.addNode(current)
+		elif kind == MayaAsciiTokenizer.CONNECT_ATTR:
+			current = None
+			connection = parseConnectAttr(statement.arguments())
+			if connection is not None:
+				scene.addConnection(connection)
+		elif kind == MayaAsciiTokenizer.ADD_ATTR:
+			if current is not None:
+				current.addAttributes.append(statement.text)
+		elif kind == MayaAsciiTokenizer.RENAME:
+			# rename -uid only stamps the node's uuid
+			continue
+		elif kind == MayaAsciiTokenizer.REQUIRES:
+			current = None
+			scene.requires.append([MayaAsciiTokenizer.unquote(t) for t in statement.tokens()])
+		elif kind == MayaAsciiTokenizer.FILE_INFO:
+			current = None
+			tokens = statement.tokens()
+			if len(tokens) >= 2:
+				scene.fileInfo[MayaAsciiTokenizer.unquote(tokens[-2])] = MayaAsciiTokenizer.unquote(tokens[-1])
+		else:
+			# select -ne and other commands end the attributes of the last created node
+			current = None
+	return scene
+
+
+def parseFile(asciipath):
+	'''
+		Parses a maya ascii file into a scene model.
+
+		@param[in]: File Path of maya.ma file
+		@param[out]: Returns SceneModel, setAttr payloads reference the memory mapped file until SceneModel.close()
+	'''
+	reader = MayaAsciiTokenizer.MayaAsciiMappedReader(asciipath)
+	scene = parseStatements(reader.statements())
+	scene.source = reader
+	return scene
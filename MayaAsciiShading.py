@@ -0,0 +1,224 @@
+# Maya Ascii Shading
+# Description: Gathers the shading networks of a parsed scene, a shading group with its shaders and
+# every node upstream of them, so each network is created, set up and connected in one pass.
+# Fingerprints a network by its content (node types, attribute values, connections) with out its
+# node names, so a network imported before under any name is found again in a NetworkRegistry.
+# Does not import maya.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiScene, MayaAsciiShading
+scene = MayaAsciiScene.parseFile('C:/scenes/lookdev.ma')
+pairs = []
+for node in scene.nodes:
+	if node.nodeType == 'shadingEngine':
+		for connection in scene.sourcesOf(node.name+".ss"):
+			pairs.append( (node,scene.findNode(connection.sourceNode)) )
+registry = MayaAsciiShading.NetworkRegistry()
+for network in MayaAsciiShading.collectNetworks(scene,pairs,scene.nodes):
+	print(network.shadingGroup.name,network.names(),len(network.connections))
+	existing = registry.find(network.fingerprint())
+	if existing is None:
+		registry.add(network.fingerprint(),network.canonicalNames())
+'''
+
+import hashlib
+from MayaAsciiParser import MayaAsciiScene
+
+# shading group inputs a network is gathered from, the members (dagSetMembers, groupNodes) are left out
+SHADING_GROUP_INPUTS = ('ss','surfaceShader','vs','volumeShader','ds','displacementShader',
+						'aiss','aiSurfaceShader','aivs','aiVolumeShader')
+# string attributes of an imported shading group holding its fingerprint and the names of its nodes in canonical order
+FINGERPRINT_ATTRIBUTE = 'maFingerprint'
+NODES_ATTRIBUTE = 'maNetworkNodes'
+_membershipPlugs = ('dsm','dagSetMembers','dnsm','dnSetMembers','gn','groupNodes')
+
+
+class ShadingNetwork():
+	'''
+		shadingGroup   NodeRecord of the shadingEngine
+		shader         NodeRecord of the surface shader
+		nodes          NodeRecords the network creates, the shaders and textures upstream then the shading group
+		connections    ConnectionRecords between the nodes of the network
+		inputs         ConnectionRecords from other nodes into the network, shading group members left out
+	'''
+	__slots__ = ('shadingGroup','shader','nodes','connections','inputs','_labels','_fingerprint')
+
+	def __init__(self,shadingGroup,shader):
+		self.shadingGroup = shadingGroup
+		self.shader = shader
+		self.nodes = []
+		self.connections = []
+		self.inputs = []
+		self._labels = None
+		self._fingerprint = None
+
+	def __repr__(self):
+		return "ShadingNetwork({0!r}, {1} nodes)".format(self.shadingGroup.name,len(self.nodes))
+
+	def names(self):
+		'''
+			@param[out]: Returns Array of the node names of the network
+		'''
+		return [node.name for node in self.nodes]
+
+	def labels(self):
+		'''
+			Labels every node by its type, its attribute values and, refined until they stop telling
+			nodes apart, the labels and plugs of the nodes it is connected to.
+
+			@param[out]: Returns Dictionary of node names to labels
+		'''
+		if self._labels is not None:
+			return self._labels
+		labels = dict((node.name,digest([node.nodeType]+sorted(attributeKeys(node)))) for node in self.nodes)
+		edges = [(MayaAsciiScene.shortName(c.sourceNode),c.sourcePlug,MayaAsciiScene.shortName(c.destinationNode),c.destinationPlug) for c in self.connections]
+		edges = [edge for edge in edges if edge[0] in labels and edge[2] in labels]
+		distinct = len(set(labels.values()))
+		for r in range(len(self.nodes)):
+			neighbours = dict((name,[]) for name in labels)
+			for source,sourcePlug,destination,destinationPlug in edges:
+				neighbours[destination].append( "<"+labels[source]+"."+sourcePlug+">"+destinationPlug )
+				neighbours[source].append( sourcePlug+"<"+labels[destination]+"."+destinationPlug+">" )
+			refined = dict((name,digest([labels[name]]+sorted(neighbours[name]))) for name in labels)
+			count = len(set(refined.values()))
+			labels = refined
+			if count == distinct:
+				break
+			distinct = count
+		self._labels = labels
+		return labels
+
+	def fingerprint(self):
+		'''
+			@param[out]: Returns hex digest of the node types, attribute values and connections of the network, the
+				node names left out. None when the network does not create its shader (shared with an earlier network)
+		'''
+		if self._fingerprint is not None or self.shader not in self.nodes:
+			return self._fingerprint
+		labels = self.labels()
+		entries = sorted(labels.values())
+		for c in self.connections:
+			source = MayaAsciiScene.shortName(c.sourceNode)
+			destination = MayaAsciiScene.shortName(c.destinationNode)
+			if source in labels and destination in labels:
+				entries.append( "edge "+labels[source]+"."+c.sourcePlug+" "+labels[destination]+"."+c.destinationPlug )
+		# inputs from outside keep the name of their source, a network only matches one fed by the same node
+		for c in self.inputs:
+			destination = MayaAsciiScene.shortName(c.destinationNode)
+			entries.append( "input "+c.source+" "+labels.get(destination,destination)+"."+c.destinationPlug )
+		self._fingerprint = digest(sorted(entries))
+		return self._fingerprint
+
+	def canonicalNames(self):
+		'''
+			@param[out]: Returns Array of the node names ordered by label, the same order for every network with the same fingerprint
+		'''
+		labels = self.labels()
+		return [node.name for node in sorted(self.nodes,key=lambda node: labels[node.name])]
+
+
+class NetworkRegistry():
+	'''
+		Fingerprints of the shading networks of a scene, with the names of their nodes in canonical
+		order so the nodes of an identical network map onto them.
+	'''
+
+	def __init__(self):
+		self.networks = dict() # fingerprint -> Array of node names
+
+	def add(self,fingerprint,names):
+		'''
+			@param[in]: Fingerprint of the network
+			@param[in]: Array of node names in canonical order
+		'''
+		if fingerprint is not None and fingerprint not in self.networks:
+			self.networks[fingerprint] = list(names)
+
+	def find(self,fingerprint):
+		'''
+			@param[in]: Fingerprint of the network
+			@param[out]: Returns Array of node names in canonical order, None when no network has the fingerprint
+		'''
+		return self.networks.get(fingerprint)
+
+	def remove(self,fingerprint):
+		self.networks.pop(fingerprint,None)
+
+
+def attributeKeys(node):
+	'''
+		@param[in]: NodeRecord
+		@param[out]: Returns Array of strings, one per addAttr and setAttr statement, with out the node name
+			and the set members, which depend on the meshes assigned and not on the network
+	'''
+	keys = ["addAttr "+" ".join(command.split()) for command in node.addAttributes]
+	for attr in node.attributes:
+		if attr.root in _membershipPlugs:
+			continue
+		keys.append( "{0} {1} {2} {3}".format(attr.path,attr.size,attr.dataType," ".join(attr.payload.split())) )
+	return keys
+
+
+def digest(entries):
+	'''
+		@param[in]: Array of strings
+		@param[out]: Returns sha1 hex digest of the strings
+	'''
+	return hashlib.sha1("\n".join(entries).encode('utf-8')).hexdigest()
+
+
+def collectNetworks(scene,pairs,candidates):
+	'''
+		Walks the connections upstream of every shading group. A node feeding several networks belongs
+		to the first one, the shader of a pair always belongs to its own network (the first when
+		several shading groups share it).
+
+		@param[in]: SceneModel of the parsed file
+		@param[in]: Array of (shadingEngine NodeRecord, shader NodeRecord) pairs
+		@param[in]: Array of NodeRecords a network may take in (ie the nodes left to createOtherNodes)
+		@param[out]: Returns Array of ShadingNetworks in the order of the pairs
+	'''
+	# child DAG nodes are left to be created after their parents
+	available = dict((node.name,node) for node in candidates if node.nodeType != 'shadingEngine' and node.parent == "")
+	shaders = set(shader.name for shadingGroup,shader in pairs)
+	owned = set()
+	networks = []
+	for shadingGroup,shader in pairs:
+		network = ShadingNetwork(shadingGroup,shader)
+		members = set([shadingGroup.name,shader.name])
+		pending = []
+		if shader.name not in owned:
+			owned.add(shader.name)
+			network.nodes.append(shader)
+		pending.append(shader.name)
+		for connection in scene.connectionsInto(shadingGroup.name):
+			if connection.destinationPlug.split("[",1)[0] in SHADING_GROUP_INPUTS:
+				pending.append(MayaAsciiScene.shortName(connection.sourceNode))
+		while pending:
+			name = pending.pop()
+			if name not in members:
+				# an input of the shading group
+				if name in owned or name in shaders or name not in available:
+					continue
+				owned.add(name)
+				members.add(name)
+				network.nodes.append(available[name])
+			for connection in scene.connectionsInto(name):
+				source = MayaAsciiScene.shortName(connection.sourceNode)
+				if source in members or source in owned or source in shaders or source not in available:
+					continue
+				owned.add(source)
+				members.add(source)
+				network.nodes.append(available[source])
+				pending.append(source)
+		network.nodes.append(shadingGroup)
+		# a shader shared with an earlier network still connects to this shading group
+		names = network.names() if shader in network.nodes else [shader.name]+network.names()
+		for name in names:
+			for connection in scene.connectionsInto(name):
+				if MayaAsciiScene.shortName(connection.sourceNode) in members:
+					network.connections.append(connection)
+				elif name != shadingGroup.name or connection.destinationPlug.split("[",1)[0] not in _membershipPlugs:
+					network.inputs.append(connection)
+		networks.append(network)
+	return networks
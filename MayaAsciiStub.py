@@ -0,0 +1,252 @@
+# Maya Ascii Stub
+# Description: Stand-in maya, maya.cmds, maya.mel and maya.api.OpenMaya modules for timing the import
+# stages that only look nodes and plugs up (filterNodes, ConnectionBatch) outside of maya. The nodes of a
+# scene model are registered by name, plugs are made up on request and connections are only recorded,
+# nothing is evaluated. install() does nothing when maya can be imported. Only for the benchmarks.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiStub
+MayaAsciiStub.install()
+from MayaAsciiParser import MayaAsciiScene, MayaAsciiNodes
+scene = MayaAsciiScene.parseFile('C:/scenes/rig.ma')
+MayaAsciiStub.register(scene)
+connections = MayaAsciiNodes.ConnectionBatch()
+for connection in scene.connections:
+	connections.add(connection.source,connection.destination,connection.nextAvailable,connection.command())
+connections.doIt()
+'''
+
+import sys
+import types
+
+_nodes = dict() # node name or DAG path -> MObject
+
+
+class MObject():
+	'''
+		A registered node. Keeps the elements and connections of its plugs by attribute path.
+	'''
+
+	def __init__(self,name=None,nodeType=None):
+		self.name = name
+		self.nodeType = nodeType
+		self.elements = dict() # array attribute path -> set of logical indices
+		self.sources = dict() # attribute path -> source MPlug
+		self.destinations = dict() # attribute path -> Array of destination MPlugs
+
+	def hasFn(self,fn):
+		return False
+
+	def isNull(self):
+		return self.name is None
+
+
+MObject.kNullObj = MObject()
+
+
+class MPlug():
+	'''
+		Attribute path of a node, plugs of the same node and path are equal.
+	'''
+
+	def __init__(self,node=None,attribute=None,path=None,index=None,parent=None):
+		self.node = node
+		self.path = path if path is not None else attribute
+		self.index = index
+		self.parent = parent
+
+	def __eq__(self,other):
+		return isinstance(other,MPlug) and self.node is other.node and self.path == other.path
+
+	def __ne__(self,other):
+		return not self.__eq__(other)
+
+	def __hash__(self):
+		return hash((id(self.node),self.path))
+
+	@property
+	def isArray(self):
+		# attribute types are unknown, any plug that is not an element takes elements
+		return self.index is None
+
+	@property
+	def isElement(self):
+		return self.index is not None
+
+	@property
+	def isCompound(self):
+		return False
+
+	@property
+	def isDynamic(self):
+		return False
+
+	@property
+	def isDestination(self):
+		return self.path in self.node.sources
+
+	def attribute(self):
+		return self.path
+
+	def array(self):
+		return self.parent
+
+	def child(self,attribute):
+		return MPlug(self.node,path=self.path+"."+attribute)
+
+	def elementByLogicalIndex(self,index):
+		return MPlug(self.node,path="{0}[{1}]".format(self.path,index),index=index,parent=self)
+
+	def getExistingArrayAttributeIndices(self):
+		return sorted(self.node.elements.get(self.path,()))
+
+	def source(self):
+		return self.node.sources.get(self.path,MPlug())
+
+	def destinations(self):
+		return list(self.node.destinations.get(self.path,()))
+
+
+class MFnDependencyNode():
+
+	def __init__(self,mobject=None):
+		self.mobject = mobject
+
+	@property
+	def typeName(self):
+		return self.mobject.nodeType
+
+	def name(self):
+		return self.mobject.name
+
+	def object(self):
+		return self.mobject
+
+	def attribute(self,name):
+		return name
+
+	def findPlug(self,name,wantNetworkedPlug=False):
+		return MPlug(self.mobject,name)
+
+
+class MSelectionList():
+
+	def __init__(self):
+		self.items = []
+
+	def add(self,name):
+		nodeName,dot,path = name.lstrip(":").partition(".")
+		node = _nodes.get(nodeName)
+		if node is None:
+			raise RuntimeError("No object matches name: "+name)
+		plug = None
+		for part in path.split(".") if path else ():
+			attribute,bracket,index = part.partition("[")
+			plug = MPlug(node,attribute) if plug is None else plug.child(attribute)
+			if bracket:
+				plug = plug.elementByLogicalIndex(int(index[:-1]))
+		self.items.append( (node,plug) )
+
+	def getDependNode(self,index):
+		return self.items[index][0]
+
+	def getPlug(self,index):
+		plug = self.items[index][1]
+		if plug is None:
+			raise TypeError("not a plug")
+		return plug
+
+
+class MDGModifier():
+
+	def __init__(self):
+		self.connections = []
+
+	def connect(self,source,destination):
+		self.connections.append( (source,destination) )
+
+	def doIt(self):
+		for source,destination in self.connections:
+			destination.node.sources[destination.path] = source
+			source.node.destinations.setdefault(source.path,[]).append(destination)
+			if destination.isElement:
+				destination.node.elements.setdefault(destination.parent.path,set()).add(destination.index)
+
+	def undoIt(self):
+		for source,destination in self.connections:
+			destination.node.sources.pop(destination.path,None)
+			if destination in source.node.destinations.get(source.path,()):
+				source.node.destinations[source.path].remove(destination)
+
+
+class MDagModifier(MDGModifier):
+	pass
+
+
+class _Constants():
+	'''
+		Enumerations of the function sets, only compared with each other.
+	'''
+
+	def __getattr__(self,name):
+		return name
+
+
+def register(scene):
+	'''
+		Registers the nodes of a scene model, and the nodes its connections name that the file does not
+		create (shared nodes like ":initialShadingGroup"), so they are found by name.
+
+		@param[in]: MayaAsciiScene.SceneModel
+		@param[out]: Returns the number of nodes registered
+	'''
+	_nodes.clear()
+	for node in scene.nodes:
+		mobject = MObject(node.name,node.nodeType)
+		_nodes[scene.pathOf(node)] = mobject
+		_nodes.setdefault(node.name,mobject)
+	for connection in scene.connections:
+		for name in (connection.sourceNode,connection.destinationNode):
+			if name not in _nodes:
+				_nodes[name] = MObject(name,'unknown')
+	return len(_nodes)
+
+
+def install():
+	'''
+		Puts the stand-in modules in sys.modules, unless maya can be imported.
+
+		@param[out]: Returns True when the stand-in modules are used
+	'''
+	if 'maya' in sys.modules:
+		return getattr(sys.modules['maya'],'isStub',False)
+	try:
+		import maya.api.OpenMaya
+		return False
+	except ImportError:
+		pass
+	openMaya = types.ModuleType('maya.api.OpenMaya')
+	for name in ('MObject','MPlug','MFnDependencyNode','MSelectionList','MDGModifier','MDagModifier'):
+		setattr(openMaya,name,globals()[name])
+	for name in ('MFn','MFnData','MFnMesh','MFnNumericData','MFnUnitAttribute'):
+		setattr(openMaya,name,_Constants())
+	openMayaAnim = types.ModuleType('maya.api.OpenMayaAnim')
+	cmds = types.ModuleType('maya.cmds')
+	cmds.ls = lambda *args,**kwargs: sorted(name for name in _nodes if "|" not in name)
+	cmds.objExists = lambda name: name in _nodes
+	cmds.nodeType = lambda name,**kwargs: _nodes[name].nodeType if name in _nodes else None
+	# MayaAsciiParser loads the importer plugin on import when it is not loaded yet
+	cmds.pluginInfo = lambda *args,**kwargs: True
+	mel = types.ModuleType('maya.mel')
+	mel.eval = lambda command: None
+	api = types.ModuleType('maya.api')
+	api.OpenMaya = openMaya
+	api.OpenMayaAnim = openMayaAnim
+	maya = types.ModuleType('maya')
+	maya.isStub = True
+	maya.api = api
+	maya.cmds = cmds
+	maya.mel = mel
+	sys.modules.update({'maya':maya,'maya.api':api,'maya.api.OpenMaya':openMaya,'maya.api.OpenMayaAnim':openMayaAnim,
+						'maya.cmds':cmds,'maya.mel':mel})
+	return True
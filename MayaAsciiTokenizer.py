@@ -0,0 +1,346 @@
+# Maya Ascii Tokenizer
+# Description: Streams the statements of a Maya ascii scene in a single pass. This module
+# does not import maya so scenes can be tokenized headless (farm machines, benchmarks).
+# MayaAsciiMappedReader memory maps the file and hands out statements as memoryview slices,
+# so payloads are only copied when they are decoded.
+'''
+Example code:
+from MayaAsciiParser import MayaAsciiTokenizer
+with open('C:/scenes/cube.ma', "r") as handle:
+	for statement in MayaAsciiTokenizer.MayaAsciiTokenizer(handle).statements():
+		print(statement.kind, statement.arguments())
+
+# or without reading the file into memory
+for statement in MayaAsciiTokenizer.MayaAsciiMappedReader('C:/scenes/cube.ma').statements():
+	print(statement.kind, len(statement.buffer))
+'''
+
+import re
+import os
+import mmap
+
+# Statement kinds the importer cares about
+CREATE_NODE = 'createNode'
+SET_ATTR = 'setAttr'
+ADD_ATTR = 'addAttr'
+CONNECT_ATTR = 'connectAttr'
+RENAME = 'rename'
+REQUIRES = 'requires'
+FILE_INFO = 'fileInfo'
+SELECT = 'select'
+
+# quotes, statement terminators and escaped characters (an escape is consumed as a pair)
+_special = re.compile(r'\\.|[";]',re.S)
+_whitespace = re.compile(r'\s+')
+# same as _special on the raw bytes, the special characters are skipped so their ; does not end a statement
+_mappedSpecial = re.compile(rb'\\.|&lf;|&cr;|[";]',re.S)
+# blank space and comments in between statements
+_mappedGap = re.compile(rb'(?:\s+|//[^\n]*)+')
+_mappedKind = re.compile(rb'\S+')
+_mappedNewline = re.compile(rb'\n')
+
+
+class Statement():
+	'''
+		A single command of a maya ascii file, terminated by a semicolon outside of quotes.
+	'''
+	__slots__ = ('kind','text','line')
+
+	def __init__(self,kind,text,line):
+		self.kind = kind
+		self.text = text
+		self.line = line
+
+	def __repr__(self):
+		return "Statement({0!r}, line {1})".format(self.kind,self.line)
+
+	def arguments(self):
+		'''
+			Returns everything after the command word.
+
+			@param[out]: Returns a single string
+		'''
+		return self.text[len(self.kind):].strip()
+
+	def tokens(self):
+		'''
+			Splits the arguments on whitespace while keeping quoted strings whole.
+
+			@param[out]: Returns Array of strings, quoted tokens keep their quotes
+		'''
+		return splitArguments(self.arguments())
+
+
+def nextToken(text,index=0):
+	'''
+		Reads the next whitespace separated token, keeping quoted strings whole.
+
+		@param[in]: Arguments of a maya ascii command
+		@param[in]: Index to start reading from
+		@param[out]: Returns the token (None when there are no tokens left)
+		@param[out]: Returns the index following the token
+		@param[out]: Returns the index the token starts on
+	'''
+	length = len(text)
+	match = _whitespace.match(text,index)
+	if match:
+		index = match.end()
+	if index >= length:
+		return None,length,length
+	if text[index] == '"':
+		end = index + 1
+		while end < length:
+			if text[end] == '\\':
+				end += 2
+				continue
+			if text[end] == '"':
+				break
+			end += 1
+		return text[index:end + 1],end + 1,index
+	match = _whitespace.search(text,index)
+	end = match.start() if match else length
+	return text[index:end],end,index
+
+
+def splitArguments(text):
+	'''
+		Quote aware whitespace split of a command's arguments.
+
+		@param[in]: Arguments of a maya ascii command
+		@param[out]: Returns Array of strings, quoted tokens keep their quotes
+	'''
+	results = []
+	token,index,start = nextToken(text)
+	while token is not None:
+		results.append(token)
+		token,index,start = nextToken(text,index)
+	return results
+
+
+def unquote(token):
+	'''
+		Strips the surrounding quotes of a token.
+
+		@param[in]: Token returned by splitArguments()
+		@param[out]: Returns a single string
+	'''
+	if len(token) > 1 and token[0] == '"' and token[-1] == '"':
+		return token[1:-1]
+	return token
+
+
+class MayaAsciiTokenizer():
+	'''
+		Quote aware statement reader. Reads the file handle line by line so only the statement
+		currently being assembled is held in memory.
+	'''
+
+	def __init__(self,handle):
+		self.handle = handle
+
+	def statements(self):
+		'''
+			Yields every statement of the file in order.
+
+			@param[out]: Generator of Statement
+		'''
+		parts = []
+		inQuote = False
+		lineNumber = 0
+		startLine = 0
+		for line in self.handle:
+			lineNumber += 1
+			if '&' in line:
+				# Remove special characters
+				line = line.replace('&lf;',"").replace('&cr;',"")
+			position = 0
+			length = len(line)
+			while position < length:
+				if not inQuote and not parts:
+					# in between statements, skip blank space and comments
+					rest = line[position:].lstrip()
+					if rest == "" or rest.startswith("//"):
+						break
+					position = length - len(rest)
+					startLine = lineNumber
+				if not inQuote and ';' not in line and '"' not in line:
+					# fast path for payload lines (vertex data etc.)
+					parts.append(line[position:])
+					break
+				match = _special.search(line,position)
+				if match is None:
+					parts.append(line[position:])
+					break
+				token = match.group()
+				if token == '"':
+					inQuote = not inQuote
+					parts.append(line[position:match.end()])
+					position = match.end()
+				elif token == ';' and not inQuote:
+					parts.append(line[position:match.start()])
+					position = match.end()
+					statement = self.makeStatement("".join(parts),startLine)
+					parts = []
+					if statement is not None:
+						yield statement
+				else:
+					parts.append(line[position:match.end()])
+					position = match.end()
+		if parts:
+			statement = self.makeStatement("".join(parts),startLine)
+			if statement is not None:
+				yield statement
+
+	def makeStatement(self,text,line):
+		'''
+			Builds the typed statement out of the raw text.
+
+			@param[in]: Statement text without the terminating semicolon
+			@param[in]: Line number the statement starts on
+			@param[out]: Returns Statement or None for empty statements
+		'''
+		text = text.strip()
+		if text == "":
+			return None
+		match = _whitespace.search(text)
+		kind = text[:match.start()] if match else text
+		return Statement(kind,text,line)
+
+
+class MappedStatement(Statement):
+	'''
+		A statement of a memory mapped file. buffer is a memoryview of the statement text, the text is
+		only decoded when asked for.
+	'''
+	__slots__ = ('buffer','offset','source')
+
+	def __init__(self,kind,buffer,offset,source):
+		self.kind = kind
+		self.buffer = buffer
+		self.offset = offset
+		self.source = source
+
+	@property
+	def text(self):
+		return str(self.buffer,'utf-8')
+
+	@property
+	def line(self):
+		# counted on request, statements do not track line numbers while scanning. mmap has no count(),
+		# the newlines are matched in place instead of slicing a copy of the map
+		return sum(1 for match in _mappedNewline.finditer(self.source,0,self.offset))+1
+
+
+class MayaAsciiMappedReader():
+	'''
+		Quote aware statement reader over a memory mapped file. Statement boundaries are located on
+		the mapped bytes and every statement is a memoryview slice of the map, nothing is copied
+		until a statement is decoded. Whoever keeps the statements owns the reader and calls close()
+		once it is done with them (MayaAsciiScene.parseFile hands it to the SceneModel), an open map
+		blocks overwriting the file on Windows.
+	'''
+
+	def __init__(self,asciipath):
+		self.asciipath = asciipath
+		self.buffer = None # mmap of the file, None before statements() and once closed
+
+	def close(self):
+		'''
+			Closes the map. The statements and the memoryviews taken from them must be released first.
+
+			@param[out]: Returns False when views of the map are still referenced, the map then closes with the last of them
+		'''
+		if self.buffer is None:
+			return True
+		try:
+			self.buffer.close()
+		except BufferError:
+			return False
+		self.buffer = None
+		return True
+
+	def statements(self):
+		'''
+			Yields every statement of the file in order.
+
+			@param[out]: Generator of MappedStatement
+		'''
+		with open(self.asciipath,"rb") as handle:
+			size = os.fstat(handle.fileno()).st_size
+			if size == 0:
+				return
+			buffer = mmap.mmap(handle.fileno(),0,access=mmap.ACCESS_READ)
+		self.buffer = buffer
+		view = memoryview(buffer)
+		position = 0
+		start = None
+		inQuote = False
+		while position < size:
+			if start is None:
+				# in between statements, skip blank space and comments
+				gap = _mappedGap.match(buffer,position)
+				if gap:
+					position = gap.end()
+				if position >= size:
+					break
+				start = position
+			match = _mappedSpecial.search(buffer,position)
+			if match is None:
+				break
+			position = match.end()
+			token = match.group()
+			if token == b'"':
+				inQuote = not inQuote
+			elif token == b';' and not inQuote:
+				statement = self.makeStatement(buffer,view,start,match.start())
+				start = None
+				if statement is not None:
+					yield statement
+		if start is not None:
+			statement = self.makeStatement(buffer,view,start,size)
+			if statement is not None:
+				yield statement
+
+	def makeStatement(self,buffer,view,start,end):
+		'''
+			Builds the typed statement out of a range of the map.
+
+			@param[in]: mmap of the file
+			@param[in]: memoryview of the map
+			@param[in]: Offset the statement starts on
+			@param[in]: Offset of the terminating semicolon
+			@param[out]: Returns MappedStatement or None for empty statements
+		'''
+		while end > start and buffer[end-1] in b' \t\r\n':
+			end -= 1
+		if end <= start:
+			return None
+		match = _mappedKind.match(buffer,start,end)
+		kind = str(match.group(),'utf-8')
+		if buffer.find(b'&',start,end) != -1:
+			# Remove special characters, the only case a statement is copied
+			text = buffer[start:end].replace(b'&lf;',b"").replace(b'&cr;',b"")
+			return MappedStatement(kind,memoryview(text),start,buffer)
+		return MappedStatement(kind,view[start:end],start,buffer)
+
+
+def tokenizeFile(asciipath):
+	'''
+		Convenience generator that opens and tokenizes a maya ascii file.
+
+		@param[in]: File Path of maya.ma file
+		@param[out]: Generator of Statement
+	'''
+	with open(asciipath,"r") as handle:
+		for statement in MayaAsciiTokenizer(handle).statements():
+			yield statement
+
+
+def mapFile(asciipath):
+	'''
+		Convenience generator that memory maps and tokenizes a maya ascii file.
+
+		@param[in]: File Path of maya.ma file
+		@param[out]: Generator of MappedStatement
+	'''
+	return MayaAsciiMappedReader(asciipath).statements()